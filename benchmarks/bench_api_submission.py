@@ -0,0 +1,64 @@
+"""
+Mede a vazão do caminho de submissão HTTP (SeedHttpClient) contra o
+stand-in local da API, com latência injetada.
+
+Uso:
+    python benchmarks/bench_api_submission.py [requisições] [latência_s]
+
+O servidor roda no mesmo processo (seed/core/fake_api.py); os payloads
+imitam entradas de estoque, que não dependem de ordem nem de saldo.
+Resultados reprodutíveis, sem depender de rede nem de cold start do Render.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from seed.core.fake_api import FakeSystockAPI
+from seed.core.http_client import SeedHttpClient
+
+CONCURRENCY_LEVELS = [1, 4, 8, 16, 32]
+
+
+def make_payloads(count):
+    rng = random.Random(42)
+    return [
+        {
+            "supplier_id": rng.randint(1, 10),
+            "entry_date": "2026-01-01T00:00:00",
+            "invoice_number": f"NF-{i}",
+            "status": "completed",
+            "items": [
+                {"product_id": rng.randint(1, 500), "quantity": rng.randint(5, 50)}
+                for _ in range(rng.randint(3, 10))
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def bench(url, payloads, concurrency):
+    start = time.perf_counter()
+    with SeedHttpClient(max_workers=concurrency) as client:
+        for payload in payloads:
+            client.submit(url, payload)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.02
+    payloads = make_payloads(count)
+
+    print(f"{count} requisições, latência injetada {latency * 1000:.0f} ms")
+    with FakeSystockAPI(latency=latency) as api:
+        url = f"{api.url}/entries"
+        for concurrency in CONCURRENCY_LEVELS:
+            elapsed = bench(url, payloads, concurrency)
+            print(f"concorrência {concurrency:>3}: {elapsed:.3f}s ({count / elapsed:,.0f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
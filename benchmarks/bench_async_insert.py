@@ -0,0 +1,86 @@
+"""
+Compara o fast_insert síncrono (psycopg2) com o async_fast_insert
+(psycopg 3 em pipeline mode) contra um PostgreSQL local.
+
+Uso:
+    BENCH_DATABASE_URL="dbname=postgres host=localhost user=postgres" \\
+        python benchmarks/bench_async_insert.py [linhas] [page_size]
+
+Em um banco local a latência por round-trip é desprezível; o ganho do
+pipeline aparece contra bancos remotos (e.g., Render), onde cada página
+síncrona espera a resposta anterior.
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+import psycopg2
+
+from seed.core.db_utils import fast_insert
+from seed.core.async_db_utils import async_fast_insert, require_psycopg
+
+DSN = os.getenv("BENCH_DATABASE_URL", "dbname=postgres host=localhost user=postgres")
+TABLE = "bench_async_insert"
+COLUMNS = ["quantity", "label", "price"]
+CREATE_TABLE = f"""
+    CREATE TEMP TABLE {TABLE} (
+        id serial PRIMARY KEY,
+        quantity int,
+        label text,
+        price numeric(10, 2)
+    )
+"""
+
+
+def make_rows(count):
+    return [(i, f"item-{i}", round(i * 0.37, 2)) for i in range(count)]
+
+
+def bench_sync(rows, page_size):
+    conn = psycopg2.connect(DSN)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(CREATE_TABLE)
+            start = time.perf_counter()
+            fast_insert(cur, TABLE, COLUMNS, rows, page_size=page_size)
+            conn.commit()
+            return time.perf_counter() - start
+    finally:
+        conn.close()
+
+
+async def bench_async(rows, page_size):
+    import psycopg
+
+    conn = await psycopg.AsyncConnection.connect(DSN)
+    try:
+        async with conn.cursor() as cur:
+            await cur.execute(CREATE_TABLE)
+            start = time.perf_counter()
+            await async_fast_insert(cur, TABLE, COLUMNS, rows, page_size=page_size)
+            await conn.commit()
+            return time.perf_counter() - start
+    finally:
+        await conn.close()
+
+
+def main():
+    require_psycopg()
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rows = make_rows(count)
+
+    sync_time = bench_sync(rows, page_size)
+    async_time = asyncio.run(bench_async(rows, page_size))
+
+    print(f"{count} linhas, page_size={page_size}")
+    print(f"sync  (psycopg2 execute_values): {sync_time:.3f}s ({count / sync_time:,.0f} linhas/s)")
+    print(f"async (psycopg 3 pipeline):      {async_time:.3f}s ({count / async_time:,.0f} linhas/s)")
+
+
+if __name__ == "__main__":
+    main()
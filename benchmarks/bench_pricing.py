@@ -0,0 +1,49 @@
+"""
+Compara generate_prices (um produto por chamada) com generate_prices_batch
+(lote inteiro em arrays NumPy).
+
+Uso:
+    python benchmarks/bench_pricing.py [produtos] [batch_size]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from pricing import PRICE_RANGES, generate_prices, generate_prices_batch
+
+
+def bench_scalar(categories, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(categories), batch_size):
+        [generate_prices(category) for category in categories[i:i + batch_size]]
+    return time.perf_counter() - start
+
+
+def bench_batch(categories, batch_size):
+    start = time.perf_counter()
+    for i in range(0, len(categories), batch_size):
+        generate_prices_batch(categories[i:i + batch_size])
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    rng = random.Random(42)
+    categories = [rng.choice(list(PRICE_RANGES)) for _ in range(count)]
+
+    scalar_time = bench_scalar(categories, batch_size)
+    batch_time = bench_batch(categories, batch_size)
+
+    print(f"{count} produtos, batch_size={batch_size}")
+    print(f"Por produto: {scalar_time:.3f}s ({count / scalar_time:,.0f} produtos/s)")
+    print(f"Em lote:     {batch_time:.3f}s ({count / batch_time:,.0f} produtos/s)")
+    print(f"Ganho:       {scalar_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compara a memória das linhas geradas como um dict por linha (copiado depois
+para uma tupla no seed) com os lotes colunares (ColumnBatch), nos volumes
+do perfil STRESS.
+
+Uso:
+    python benchmarks/bench_row_memory.py
+
+Para cada gerador mede o tamanho de um lote retido em memória, o pico do
+caminho completo até o COPY (sem banco) e o tempo total.
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from seed.config.seed_profiles import PROFILES, SeedSize
+from seed.core.column_batch import iter_rows
+from seed.core.db_utils import copy_insert
+from seed.generators.client_generator import ClientGenerator, CLIENT_COLUMNS
+from seed.generators.product_generator import ProductGenerator, PRODUCT_COLUMNS
+
+STRESS = PROFILES[SeedSize.STRESS]
+
+
+class DrainCursor:
+    """Cursor mínimo que consome o stream do COPY sem banco de dados."""
+
+    rowcount = -1
+
+    def copy_expert(self, sql, file, size=8192):
+        while file.read(size):
+            pass
+
+
+def batch_size_bytes(make_batch):
+    tracemalloc.start()
+    batch = make_batch()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del batch
+    return size
+
+
+def stream(values, table, columns):
+    tracemalloc.start()
+    start = time.perf_counter()
+    copy_insert(DrainCursor(), table, columns, values)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def dict_rows(batches, columns):
+    # Caminho antigo: um dict por linha, copiado para uma tupla no seed
+    return (tuple(row[c] for c in columns) for batch in batches for row in batch)
+
+
+def compare(label, generator, count, table, columns):
+    batch_size = STRESS.batch_size
+    dict_batch = batch_size_bytes(lambda: next(generator.iter_batches(batch_size, batch_size)))
+    column_batch = batch_size_bytes(lambda: next(generator.iter_column_batches(batch_size, batch_size)))
+
+    dict_peak, dict_time = stream(dict_rows(generator.iter_batches(count, batch_size), columns), table, columns)
+    column_peak, column_time = stream(iter_rows(generator.iter_column_batches(count, batch_size), columns), table, columns)
+
+    print(f"{label}: {count} linhas, batch_size={batch_size}")
+    print(f"  lote retido:  dicts {dict_batch / 1024:8.0f} KiB | colunas {column_batch / 1024:8.0f} KiB")
+    print(f"  pico no COPY: dicts {dict_peak / 1024:8.0f} KiB | colunas {column_peak / 1024:8.0f} KiB")
+    print(f"  tempo:        dicts {dict_time:8.2f} s   | colunas {column_time:8.2f} s")
+
+
+def main():
+    compare("produtos", ProductGenerator(), STRESS.products_count, "products", PRODUCT_COLUMNS)
+    compare("clientes", ClientGenerator(), STRESS.clients_count, "clients", CLIENT_COLUMNS)
+
+
+if __name__ == "__main__":
+    main()
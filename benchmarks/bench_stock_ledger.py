@@ -0,0 +1,87 @@
+"""
+Compara o StockLedger com a varredura antiga do SeedSalesAPI (reconstruir
+lojas válidas e produtos disponíveis a cada venda) para catálogos de
+1k a 100k produtos.
+
+Uso:
+    python benchmarks/bench_stock_ledger.py [vendas]
+
+O custo por venda do ledger deve ficar constante com o tamanho do catálogo
+(escala linear no número de vendas); o da varredura cresce com ele.
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from seed.core.stock_ledger import StockLedger
+
+CATALOG_SIZES = [1_000, 10_000, 100_000]
+STORES = [2, 3, 4, 5, 6]
+# A varredura fica proibitiva em catálogos grandes: mede menos vendas
+SCAN_SALES_LIMIT = 200
+
+
+def make_stock(product_count, rng):
+    return {
+        store_id: {pid: rng.randint(0, 20) for pid in range(1, product_count + 1)}
+        for store_id in STORES
+    }
+
+
+def sell_scan(stock_map, sales, rng):
+    for done in range(sales):
+        valid_stores = [
+            sid for sid, products in stock_map.items()
+            if any(qty > 0 for qty in products.values())
+        ]
+        if not valid_stores:
+            return done
+        store_id = rng.choice(valid_stores)
+        available = [(pid, qty) for pid, qty in stock_map[store_id].items() if qty > 0]
+        for pid, qty in rng.sample(available, rng.randint(1, min(5, len(available)))):
+            stock_map[store_id][pid] -= rng.randint(1, qty)
+    return sales
+
+
+def sell_ledger(ledger, sales, rng):
+    for done in range(sales):
+        if not ledger.stores:
+            return done
+        store_id = rng.choice(ledger.stores)
+        k = rng.randint(1, min(5, ledger.available(store_id)))
+        for pid, qty in ledger.sample(store_id, k, rng):
+            ledger.remove(store_id, pid, rng.randint(1, qty))
+    return sales
+
+
+def per_sale(fn, *args):
+    # Estoques pequenos podem acabar antes: divide pelas vendas realizadas
+    start = time.perf_counter()
+    done = fn(*args)
+    return (time.perf_counter() - start) / max(done, 1)
+
+
+def main():
+    sales = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{'produtos':>9} | {'ledger µs/venda':>15} | {'varredura µs/venda':>18}")
+
+    for product_count in CATALOG_SIZES:
+        rng = random.Random(42)
+        stock_map = make_stock(product_count, rng)
+
+        ledger = StockLedger()
+        for store_id, products in stock_map.items():
+            for pid, qty in products.items():
+                ledger.add(store_id, pid, qty)
+
+        ledger_time = per_sale(sell_ledger, ledger, sales, random.Random(1))
+        scan_time = per_sale(sell_scan, stock_map, min(sales, SCAN_SALES_LIMIT), random.Random(1))
+
+        print(f"{product_count:>9} | {ledger_time * 1e6:>15.1f} | {scan_time * 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
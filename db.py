@@ -10,13 +10,16 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Carrega explicitamente o .env
 load_dotenv(BASE_DIR / ".env")
 
+def get_connection_params():
+    return {
+        "host": os.getenv("DB_HOST"),
+        "database": os.getenv("DB_NAME"),
+        "user": os.getenv("DB_USER"),
+        "password": os.getenv("DB_PASSWORD"),
+        "port": os.getenv("DB_PORT", 5432),
+        "cursor_factory": RealDictCursor,
+        "sslmode": "require",
+    }
+
 def get_connection():
-    return psycopg2.connect(
-        host=os.getenv("DB_HOST"),
-        database=os.getenv("DB_NAME"),
-        user=os.getenv("DB_USER"),
-        password=os.getenv("DB_PASSWORD"),
-        port=os.getenv("DB_PORT", 5432),
-        cursor_factory=RealDictCursor,
-        sslmode="require"
-    )
+    return psycopg2.connect(**get_connection_params())
@@ -1,5 +1,12 @@
 import random
 
+from seed.core.random_streams import draw_integers
+
+try:
+    import numpy as np
+except ImportError:  # precificação vetorizada é opcional
+    np = None
+
 PRICE_RANGES = {
     "Eletrônicos": (1200, 4000),
     "Informática": (80, 5000),
@@ -11,8 +18,43 @@ PRICE_RANGES = {
     "Acessórios": (15, 200)
 }
 
-def generate_prices(category):
+# Margem: custo entre 60% e 80% do preço de venda
+COST_RATIO_RANGE = (0.6, 0.8)
+
+# Mesmas faixas em centavos (venda) e em milésimos (margem) para os lotes:
+# inteiros sorteados igual com e sem o NumPy
+_SALE_CENTS = {category: (low * 100, high * 100 + 1) for category, (low, high) in PRICE_RANGES.items()}
+_COST_PERMILLE = (round(COST_RATIO_RANGE[0] * 1000), round(COST_RATIO_RANGE[1] * 1000) + 1)
+
+def generate_prices(category, rng=random):
     min_price, max_price = PRICE_RANGES[category]
-    sale_price = round(random.uniform(min_price, max_price), 2)
-    cost_price = round(sale_price * random.uniform(0.6, 0.8), 2)
+    sale_price = round(rng.uniform(min_price, max_price), 2)
+    cost_price = round(sale_price * rng.uniform(*COST_RATIO_RANGE), 2)
     return cost_price, sale_price
+
+def generate_prices_batch(categories, rng=None, vectorized=None):
+    """
+    Preços de um lote inteiro de produtos em uma passada.
+
+    `categories` é uma sequência de nomes de categoria (chaves de
+    PRICE_RANGES). Retorna (cost_prices, sale_prices) como listas de float,
+    na mesma ordem. O preço de venda é sorteado em centavos dentro da faixa
+    da categoria e o custo é uma fração em milésimos dele, com os sorteios
+    de draw_integers: o resultado é o mesmo com e sem o NumPy, que apenas
+    faz as contas em arrays. `rng` é um random.Random (padrão: o `random`
+    global); `vectorized` usa o NumPy quando estiver instalado.
+    """
+    rng = rng or random
+    vectorized = np is not None if vectorized is None else vectorized
+    bounds = [_SALE_CENTS[category] for category in categories]
+    lows = [low for low, _ in bounds]
+    highs = [high for _, high in bounds]
+
+    sale_cents = draw_integers(rng, len(bounds), lows, highs, vectorized)
+    permille = draw_integers(rng, len(bounds), *_COST_PERMILLE, vectorized)
+    if vectorized:
+        cost_cents = sale_cents * permille // 1000
+        return (cost_cents / 100).tolist(), (sale_cents / 100).tolist()
+
+    cost_cents = [sale * ratio // 1000 for sale, ratio in zip(sale_cents, permille)]
+    return [cost / 100 for cost in cost_cents], [sale / 100 for sale in sale_cents]
@@ -2,9 +2,10 @@ import json
 import random
 from itertools import product, islice
 from datetime import datetime, timedelta
-from typing import Dict, List, Iterator
+from typing import Dict, List, Iterator, Tuple
 
-from pricing import generate_prices
+from pricing import generate_prices, generate_prices_batch
+from seed.generators.product_catalog import ProductCatalog
 
 
 # =========================
@@ -45,9 +46,11 @@ def format_product_name(base_name: str, attributes: Dict[str, str]) -> str:
 def build_product(
     base_name: str,
     attributes: Dict[str, str],
-    category: str
+    category: str,
+    prices: Tuple[float, float] | None = None
 ) -> Dict:
-    cost_price, sale_price = generate_prices(category)
+    # prices = (custo, venda) já sorteados em lote; sem eles, sorteia aqui
+    cost_price, sale_price = prices or generate_prices(category)
     date_added = datetime.now() - timedelta(days=random.randint(0, 180))
 
     name = format_product_name(base_name, attributes)
@@ -75,39 +78,21 @@ def generate_products(
     """
     Gera produtos respeitando limite global e evitando processamento desnecessário.
     """
-    with open(base_file, encoding="utf-8") as f:
-        base_data = json.load(f)
+    # Catálogo indexado: os primeiros `limit` produtos das combinações base
+    catalog = ProductCatalog.load(base_file, max_variations_per_product)
+    specs = [catalog[index] for index in range(min(limit, catalog.base_size))]
 
-    products: List[Dict] = []
+    return _build_products(specs)
 
-    for category, category_data in base_data.items():
-        for subcategory_data in category_data.values():
-
-            base_products = subcategory_data.get("base_products", [])
-            variations = subcategory_data.get("variations", {})
-
-            variation_combinations = list(
-                generate_variation_combinations(
-                    variations,
-                    max_variations_per_product
-                )
-            )
-
-            for base_name in base_products:
-                for attrs in variation_combinations:
-
-                    products.append(
-                        build_product(
-                            base_name=base_name,
-                            attributes=attrs,
-                            category=category
-                        )
-                    )
-
-                    if len(products) >= limit:
-                        random.shuffle(products)
-                        return products
 
+def _build_products(specs: List[Tuple[str, Dict[str, str], str]]) -> List[Dict]:
+    # Preços de todos os produtos em uma única passada vetorizada
+    cost_prices, sale_prices = generate_prices_batch([category for _, _, category in specs])
+    products = [
+        build_product(base_name, attrs, category, prices=(cost_price, sale_price))
+        for (base_name, attrs, category), cost_price, sale_price
+        in zip(specs, cost_prices, sale_prices)
+    ]
     random.shuffle(products)
     return products
 
@@ -41,6 +41,25 @@ def load_settings():
 
     force_seed = os.getenv("FORCE_SEED", "false").lower() == "true"
     dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
+    sink = os.getenv("SEED_SINK", "postgres").lower()
+    sink_path = os.getenv("SEED_SINK_PATH", "")
+    copy_format = os.getenv("SEED_COPY_FORMAT", "text").lower()
+    parallel_stages = int(os.getenv("SEED_PARALLEL_STAGES", 3))
+    workers = int(os.getenv("SEED_WORKERS", 1))
+    pipeline_depth = int(os.getenv("SEED_PIPELINE_DEPTH", 0))
+    db_backend = os.getenv("SEED_DB_BACKEND", "psycopg2").lower()
+    api_base_url = os.getenv("SEED_API_URL", "https://systock-api.onrender.com").rstrip("/")
+    simulate_stock = os.getenv("SEED_SIMULATE_STOCK", "false").lower() == "true"
+    materialize_stock = os.getenv("SEED_MATERIALIZE_STOCK", "false").lower() == "true"
+    http_concurrency = int(os.getenv("SEED_HTTP_CONCURRENCY", 8))
+    http_rate_limit = float(os.getenv("SEED_HTTP_RATE_LIMIT", 0))
+    http_retries = int(os.getenv("SEED_HTTP_RETRIES", 3))
+    metrics_report = os.getenv("SEED_METRICS_REPORT", "seed_metrics.json")
+    adaptive_batch = os.getenv("SEED_ADAPTIVE_BATCH", "true").lower() == "true"
+    batch_size_max = int(os.getenv("SEED_BATCH_SIZE_MAX", 10000))
+    memory_limit_mb = int(os.getenv("SEED_MEMORY_LIMIT_MB", 1024))
+    random_seed = os.getenv("SEED_RANDOM_SEED")
+    random_seed = int(random_seed) if random_seed else None
 
     return {
         "ENV": env,
@@ -48,4 +67,22 @@ def load_settings():
         "CURRENT_PROFILE": profile,
         "FORCE_SEED": force_seed,
         "DRY_RUN": dry_run,
+        "SINK": sink,
+        "SINK_PATH": sink_path,
+        "COPY_FORMAT": copy_format,
+        "PARALLEL_STAGES": parallel_stages,
+        "WORKERS": workers,
+        "PIPELINE_DEPTH": pipeline_depth,
+        "DB_BACKEND": db_backend,
+        "API_BASE_URL": api_base_url,
+        "SIMULATE_STOCK": simulate_stock,
+        "MATERIALIZE_STOCK": materialize_stock,
+        "HTTP_CONCURRENCY": http_concurrency,
+        "HTTP_RATE_LIMIT": http_rate_limit,
+        "HTTP_RETRIES": http_retries,
+        "METRICS_REPORT": metrics_report,
+        "ADAPTIVE_BATCH": adaptive_batch,
+        "BATCH_SIZE_MAX": batch_size_max,
+        "MEMORY_LIMIT_MB": memory_limit_mb,
+        "RANDOM_SEED": random_seed,
     }
\ No newline at end of file
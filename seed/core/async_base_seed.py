@@ -0,0 +1,56 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from ..config.seed_settings import load_settings
+from .metrics import AsyncMeteredCursor, StageMetrics, peak_rss
+from .random_streams import RandomStreams
+
+logger = logging.getLogger(__name__)
+
+class AsyncBaseSeed(ABC):
+    """
+    Async variant of BaseSeed for the psycopg 3 backend.
+
+    `conn` is a psycopg.AsyncConnection (see async_get_connection). Stages
+    implement `async def execute(self, cur)` and use the helpers from
+    async_db_utils, which pipeline statements instead of waiting for each
+    reply. The stage still commits once, at the end of run(), and fills a
+    StageMetrics like BaseSeed. SeedRunner uses the async variant of a
+    stage (ASYNC_STAGES) when SEED_DB_BACKEND=async.
+    """
+
+    partitionable = False
+
+    def __init__(self, conn, profile, settings=None, rng=None, streams=None):
+        self.conn = conn
+        self.profile = profile
+        self.settings = settings or load_settings()
+        self.streams = streams or RandomStreams.from_seed(
+            self.settings["RANDOM_SEED"]
+        ).child(self.__class__.__name__)
+        # Mesmo stream do BaseSeed sem partição: as duas variantes sorteiam igual
+        self.rng = rng or self.streams.stream("partition", 0, 1)
+        self.name = self.__class__.__name__
+        self.metrics = StageMetrics(self.name)
+
+    async def run(self):
+        start_time = time.time()
+        logger.info(f"Starting {self.name}...")
+        try:
+            async with self.conn.cursor() as raw_cursor:
+                cur = AsyncMeteredCursor(raw_cursor, self.metrics)
+                result = await self.execute(cur)
+                await self.conn.commit()
+                duration = time.time() - start_time
+                self.metrics.run_time = duration
+                self.metrics.process_peak_rss = peak_rss()
+                logger.info(f"Finished {self.name} in {duration:.2f}s")
+                return result
+        except Exception as e:
+            await self.conn.rollback()
+            logger.error(f"Error in {self.name}: {str(e)}")
+            raise e
+
+    @abstractmethod
+    async def execute(self, cur):
+        pass
@@ -0,0 +1,81 @@
+import logging
+from itertools import islice
+from .db_utils import _record_rows
+
+try:
+    import psycopg
+except ImportError:  # backend assíncrono é opcional
+    psycopg = None
+
+logger = logging.getLogger(__name__)
+
+# Parâmetros do psycopg2 que não existem no psycopg 3
+_PSYCOPG2_ONLY_PARAMS = {"cursor_factory"}
+
+# Limite de parâmetros ($1..$65535) de um comando no protocolo do PostgreSQL
+PG_MAX_PARAMS = 65535
+
+
+def require_psycopg():
+    if psycopg is None:
+        raise RuntimeError(
+            "O backend assíncrono requer o psycopg 3: pip install 'psycopg[binary]'"
+        )
+
+
+async def async_get_connection(conn_params):
+    """
+    Open a psycopg 3 AsyncConnection from the same params used by psycopg2.
+    """
+    require_psycopg()
+    params = {k: v for k, v in conn_params.items() if k not in _PSYCOPG2_ONLY_PARAMS}
+    if "database" in params:
+        params["dbname"] = params.pop("database")
+    return await psycopg.AsyncConnection.connect(params.pop("dsn", ""), **params)
+
+
+async def async_fast_insert(cur, table, columns, values, on_conflict=None, page_size=100):
+    """
+    Async counterpart of fast_insert using psycopg 3 pipeline mode.
+
+    Each page becomes one multi-row INSERT. Full pages go through a single
+    executemany, which pipelines them without waiting for each reply, and
+    the last, shorter page follows as its own statement. Pages are capped
+    so no statement exceeds PG_MAX_PARAMS parameters. Returns the number of
+    rows inserted (rows dropped by ON CONFLICT are not counted).
+    """
+    page_size = max(1, min(page_size, PG_MAX_PARAMS // len(columns)))
+    generated = [0]
+    last_page = []
+    rows = iter(values)
+
+    def full_pages():
+        while True:
+            page = list(islice(rows, page_size))
+            generated[0] += len(page)
+            if len(page) < page_size:
+                last_page.extend(page)
+                return
+            yield [value for row in page for value in row]
+
+    async with cur.connection.pipeline():
+        await cur.executemany(_insert_query(table, columns, page_size, on_conflict), full_pages())
+    # rowcount do executemany é a soma das linhas gravadas por todos os comandos
+    inserted = max(cur.rowcount, 0)
+    if last_page:
+        await cur.execute(
+            _insert_query(table, columns, len(last_page), on_conflict),
+            [value for row in last_page for value in row]
+        )
+        inserted += max(cur.rowcount, 0)
+
+    _record_rows(cur, table, generated[0], inserted)
+    return inserted
+
+
+def _insert_query(table, columns, rows, on_conflict=None):
+    row_template = "(" + ",".join(["%s"] * len(columns)) + ")"
+    query = f"INSERT INTO {table} ({','.join(columns)}) VALUES " + ",".join([row_template] * rows)
+    if on_conflict:
+        query += f" ON CONFLICT {on_conflict}"
+    return query
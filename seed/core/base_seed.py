@@ -1,24 +1,117 @@
 import logging
 import time
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from ..config.seed_settings import load_settings
+from .pipeline import BatchPipeline
+from .http_client import SeedHttpClient
+from .metrics import MeteredCursor, StageMetrics, peak_rss
+from .batch_sizer import BatchSizer
+from .random_streams import RandomStreams
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class BaseSeed(ABC):
-    def __init__(self, conn, profile):
+    # Estágios que podem dividir seu volume entre vários processos
+    partitionable = False
+
+    def __init__(self, conn, profile, settings=None, partition=(0, 1), rng=None, streams=None):
         self.conn = conn
         self.profile = profile
+        self.settings = settings or load_settings()
+        self.partition = partition
+        # Streams do estágio (o runner passa um por estágio); fora do runner,
+        # derivados de SEED_RANDOM_SEED
+        self.streams = streams or RandomStreams.from_seed(
+            self.settings["RANDOM_SEED"]
+        ).child(self.__class__.__name__)
+        self.rng = rng or self.streams.stream("partition", *partition)
         self.name = self.__class__.__name__
+        if partition[1] > 1:
+            self.name += f"[{partition[0] + 1}/{partition[1]}]"
+        self.metrics = StageMetrics(self.name)
+        memory_limit = self.settings["MEMORY_LIMIT_MB"] * 1024 * 1024
+        self.batch_sizer = BatchSizer(
+            profile.batch_size,
+            # Sem banco no DRY_RUN, a vazão não diz nada sobre o lote
+            adaptive=self.settings["ADAPTIVE_BATCH"] and not self.settings["DRY_RUN"],
+            maximum=self.settings["BATCH_SIZE_MAX"],
+            memory_limit=memory_limit or None,
+            metrics=self.metrics
+        )
+
+    def partition_share(self, total):
+        """
+        Number of rows of `total` that belong to this partition.
+        """
+        index, count = self.partition
+        return total // count + (1 if index < total % count else 0)
+
+    def partition_offset(self, total):
+        """
+        Index of the first row of `total` that belongs to this partition.
+        """
+        index, count = self.partition
+        return index * (total // count) + min(index, total % count)
+
+    def batch_sizes(self, total):
+        """
+        Split `total` rows into batches sized by batch_sizer.
+
+        The size is read when each batch starts, so a stage that records its
+        writes in batch_sizer follows the adaptive size as it changes.
+        """
+        remaining = total
+        while remaining > 0:
+            size = min(self.batch_sizer.size, remaining)
+            remaining -= size
+            yield size
+
+    def pipeline(self, batches):
+        """
+        Wrap a batch generator so generation overlaps the writes.
+
+        Use as `with self.pipeline(batches) as stream: for batch in stream`.
+        With PIPELINE_DEPTH = 0 the batches are consumed inline.
+        """
+        depth = self.settings["PIPELINE_DEPTH"]
+        if depth > 0:
+            return BatchPipeline(batches, max_pending=depth)
+        return nullcontext(batches)
+
+    def api_url(self, path):
+        """
+        Absolute URL of a systock API endpoint (SEED_API_URL + path).
+        """
+        return self.settings["API_BASE_URL"] + path
+
+    def http_client(self):
+        """
+        Shared HTTP client for the *API stages, configured from settings.
+
+        Use as `with self.http_client() as client`; the block only exits
+        after every submitted request finished.
+        """
+        return SeedHttpClient(
+            max_workers=self.settings["HTTP_CONCURRENCY"],
+            rate_limit=self.settings["HTTP_RATE_LIMIT"],
+            retries=self.settings["HTTP_RETRIES"],
+            metrics=self.metrics,
+            dry_run=self.settings["DRY_RUN"]
+        )
 
     def run(self):
         start_time = time.time()
         logger.info(f"Starting {self.name}...")
         try:
-            with self.conn.cursor() as cur:
+            with self.conn.cursor() as raw_cursor:
+                cur = MeteredCursor(raw_cursor, self.metrics)
                 result = self.execute(cur)
                 self.conn.commit()
                 duration = time.time() - start_time
+                self.metrics.run_time = duration
+                self.metrics.process_peak_rss = peak_rss()
                 logger.info(f"Finished {self.name} in {duration:.2f}s")
                 return result
         except Exception as e:
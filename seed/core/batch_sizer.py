@@ -0,0 +1,83 @@
+from .metrics import current_rss
+
+# Tamanho inicial e mínimo dos lotes adaptativos
+MIN_BATCH_SIZE = 100
+# Comandos mais lentos que isso (s) reduzem o lote, mesmo com vazão maior
+MAX_STATEMENT_SECONDS = 2.0
+# Ganho mínimo de vazão (linhas/s) para continuar dobrando o lote
+GROWTH_TOLERANCE = 0.05
+# Depois de estabilizar, tenta crescer de novo a cada N lotes
+PROBE_INTERVAL = 20
+
+
+class BatchSizer:
+    """
+    Batch size of one stage's inserts, fixed or adapted while it runs.
+
+    Callers read `size` before building a batch and call `record(rows,
+    seconds)` with the time the database took to write it. In adaptive mode
+    the size starts at MIN_BATCH_SIZE and doubles while rows/sec keeps
+    improving, falls back to the best size when it stops improving (and
+    probes again every PROBE_INTERVAL batches), and is halved whenever a
+    statement exceeds MAX_STATEMENT_SECONDS or the process RSS goes over
+    `memory_limit`. The last of these also caps further growth.
+
+    Every recorded batch size is counted in `metrics` for the run report.
+    """
+
+    def __init__(self, size, adaptive=False, maximum=None, memory_limit=None, metrics=None):
+        self.adaptive = adaptive
+        self.maximum = max(size, maximum or size)
+        self.memory_limit = memory_limit
+        self.metrics = metrics
+        self._size = min(MIN_BATCH_SIZE, size) if adaptive else size
+        self._growing = True
+        self._best_size = self._size
+        self._best_rate = 0.0
+        self._since_probe = 0
+
+    @property
+    def size(self):
+        return self._size
+
+    def record(self, rows, seconds):
+        if self.metrics is not None:
+            self.metrics.record_batch(rows)
+        # Lotes parciais (o último de um estágio) não dizem nada sobre o tamanho
+        if not self.adaptive or rows < self._size:
+            return
+
+        rss = current_rss() if self.memory_limit else None
+        if seconds > MAX_STATEMENT_SECONDS or (rss is not None and rss > self.memory_limit):
+            self._shrink(cap=rss is not None and rss > self.memory_limit)
+            return
+
+        rate = rows / seconds if seconds > 0 else float("inf")
+        if self._growing:
+            if rate > self._best_rate * (1 + GROWTH_TOLERANCE):
+                self._best_size, self._best_rate = self._size, rate
+                self._size = min(self._size * 2, self.maximum)
+                self._growing = self._size > self._best_size
+            else:
+                # Dobrar não compensou: volta ao melhor tamanho medido
+                self._size = self._best_size
+                self._growing = False
+            return
+
+        if self._size == self._best_size:
+            # O banco pode mudar de ritmo: acompanha a vazão do tamanho atual
+            self._best_rate = rate
+        self._since_probe += 1
+        if self._since_probe >= PROBE_INTERVAL and self._size < self.maximum:
+            self._since_probe = 0
+            self._growing = True
+            self._size = min(self._size * 2, self.maximum)
+
+    def _shrink(self, cap):
+        floor = min(MIN_BATCH_SIZE, self.maximum)
+        self._size = max(floor, self._size // 2)
+        if cap:
+            self.maximum = self._size
+        self._best_size, self._best_rate = self._size, 0.0
+        self._growing = False
+        self._since_probe = 0
@@ -0,0 +1,76 @@
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+
+class ColumnBatch:
+    """
+    A batch of generated rows stored column by column.
+
+    Generators fill one list per column instead of one dict per row, and the
+    insert/COPY path reads the rows straight from the columns with `rows()`
+    (a zip, so each row tuple is built only when it is consumed). `batch[c]`
+    returns the list of column `c`.
+    """
+
+    __slots__ = ("columns", "_data", "_length")
+
+    def __init__(self, columns: Sequence[str], data: Dict[str, List]):
+        self.columns = tuple(columns)
+        self._data = data
+        lengths = {len(data[c]) for c in self.columns}
+        if len(lengths) > 1:
+            raise ValueError(f"Colunas com tamanhos diferentes: {lengths}")
+        self._length = lengths.pop() if lengths else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, column: str) -> List:
+        return self._data[column]
+
+    def rows(self, columns: Sequence[str] | None = None) -> Iterator[Tuple]:
+        """Row tuples in `columns` order (default: all columns)."""
+        return zip(*(self._data[c] for c in (columns or self.columns)))
+
+    def to_dicts(self) -> List[Dict]:
+        return [dict(zip(self.columns, row)) for row in self.rows()]
+
+    def slice(self, start: int, stop: int) -> "ColumnBatch":
+        return ColumnBatch(self.columns, {c: self._data[c][start:stop] for c in self.columns})
+
+    @classmethod
+    def concat(cls, batches: Sequence["ColumnBatch"]) -> "ColumnBatch":
+        columns = batches[0].columns
+        data = {c: [] for c in columns}
+        for batch in batches:
+            for c in columns:
+                data[c].extend(batch[c])
+        return cls(columns, data)
+
+
+def iter_rows(batches: Iterable[ColumnBatch], columns: Sequence[str] | None = None) -> Iterator[Tuple]:
+    """
+    Row tuples of a stream of ColumnBatches, ready for bulk_insert.
+    """
+    return chain.from_iterable(batch.rows(columns) for batch in batches)
+
+
+def rebatch(batches: Iterable[ColumnBatch], size: int) -> Iterator[ColumnBatch]:
+    """
+    Regroup a stream of ColumnBatches into batches of `size` rows (the last
+    one may be smaller).
+    """
+    pending: List[ColumnBatch] = []
+    pending_rows = 0
+    for batch in batches:
+        offset = 0
+        while offset < len(batch):
+            take = min(size - pending_rows, len(batch) - offset)
+            pending.append(batch if take == len(batch) else batch.slice(offset, offset + take))
+            pending_rows += take
+            offset += take
+            if pending_rows == size:
+                yield pending[0] if len(pending) == 1 else ColumnBatch.concat(pending)
+                pending, pending_rows = [], 0
+    if pending:
+        yield pending[0] if len(pending) == 1 else ColumnBatch.concat(pending)
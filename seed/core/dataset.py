@@ -0,0 +1,126 @@
+import json
+import logging
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from psycopg2.extensions import cursor as tuple_cursor
+from ..config.seed_settings import load_settings
+from .db_utils import COPY_READ_SIZE
+from .sinks import CopyFileSink, open_copy_file, zstandard
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o layout do diretório ou do manifesto mudar
+DATASET_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+
+def materialize(directory, settings=None, compression=None):
+    """
+    Generate the DB stages' data into a dataset directory, without a database.
+
+    Every table becomes a compressed COPY file (zstd when zstandard is
+    installed, gzip otherwise) and `manifest.json` records the format
+    version, the profile, the master random seed, the fixtures the rows
+    reference and the row count of each table. The directory must not hold a dataset already. Returns
+    the manifest.
+    """
+    # Import tardio: o runner importa os estágios, que não são necessários no load
+    from .seed_runner import SeedRunner
+
+    settings = settings or load_settings()
+    directory = Path(directory)
+    if (directory / MANIFEST_FILE).exists():
+        raise FileExistsError(f"Já existe um dataset em {directory}")
+
+    profile = settings["CURRENT_PROFILE"]
+    sink = CopyFileSink(
+        directory,
+        compression=compression or ("zstd" if zstandard is not None else "gzip"),
+        metadata={
+            "version": DATASET_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "profile": asdict(profile),
+        },
+    )
+    runner = SeedRunner(None, settings=settings, sink=sink)
+    # Com a mesma semente (SEED_RANDOM_SEED), materialize gera o mesmo dataset
+    sink.metadata["seed"] = runner.random_seed
+    runner.run_all()
+    return read_manifest(directory)
+
+
+def read_manifest(directory):
+    """
+    Manifest of a dataset directory, checked against DATASET_FORMAT_VERSION.
+    """
+    path = Path(directory) / MANIFEST_FILE
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != DATASET_FORMAT_VERSION:
+        raise ValueError(
+            f"Dataset {directory} na versão {manifest.get('version')}; "
+            f"esperada {DATASET_FORMAT_VERSION}"
+        )
+    return manifest
+
+
+def load(conn, directory):
+    """
+    Stream a materialized dataset into PostgreSQL with COPY.
+
+    Tables are loaded in manifest order (parents before children), keeping
+    the ids from the files, in a single transaction; the id sequences are
+    moved past the loaded ids afterwards. The target tables must be empty
+    and the fixture tables (stores, suppliers) must already hold the rows
+    the dataset references. Returns the rows loaded per table.
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    tables = manifest["tables"]
+
+    loaded = {}
+    start = time.perf_counter()
+    try:
+        # A conexão pode usar RealDictCursor (db.get_connection)
+        with conn.cursor(cursor_factory=tuple_cursor) as cur:
+            _check_target(cur, tables, manifest.get("fixtures", {}))
+            for table, entry in tables.items():
+                table_start = time.perf_counter()
+                cols_str = ",".join(entry["columns"])
+                with open_copy_file(directory / entry["file"], "rb", manifest["compression"]) as f:
+                    cur.copy_expert(f"COPY {table} ({cols_str}) FROM STDIN", f, size=COPY_READ_SIZE)
+                loaded[table] = cur.rowcount
+                if cur.rowcount != entry["rows"]:
+                    raise ValueError(
+                        f"{table}: {cur.rowcount} linhas carregadas, manifesto indica {entry['rows']}"
+                    )
+                cur.execute(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT COALESCE(max(id), 0) + 1 FROM {table}), false)"
+                )
+                elapsed = time.perf_counter() - table_start
+                logger.info(f"Loaded {loaded[table]:,} rows into {table} in {elapsed:.2f}s")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    elapsed = time.perf_counter() - start
+    total = sum(loaded.values())
+    rate = total / elapsed if elapsed > 0 else 0
+    logger.info(f"Dataset {directory} loaded: {total} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    return loaded
+
+
+def _check_target(cur, tables, fixtures):
+    # Os ids dos arquivos são gravados como estão: tabelas com dados colidiriam
+    for table in tables:
+        cur.execute(f"SELECT EXISTS (SELECT 1 FROM {table})")
+        if cur.fetchone()[0]:
+            raise ValueError(f"A tabela {table} não está vazia; o load exige tabelas vazias")
+    for table, count in fixtures.items():
+        cur.execute(f"SELECT count(*) FROM {table} WHERE id <= %s", (count,))
+        if cur.fetchone()[0] < count:
+            raise ValueError(f"O dataset referencia {count} linhas de {table}, que não existem no banco")
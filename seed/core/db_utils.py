@@ -1,18 +1,214 @@
 import logging
+import struct
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import islice
 from psycopg2.extras import execute_values
+from .batch_sizer import BatchSizer
 
 logger = logging.getLogger(__name__)
 
-def fast_insert(cur, table, columns, values, on_conflict=None):
+# A partir deste volume o COPY compensa o custo do staging/parse
+COPY_THRESHOLD = 5000
+COPY_READ_SIZE = 64 * 1024
+
+_PG_EPOCH_DATE = date(2000, 1, 1)
+_PG_EPOCH_DATETIME = datetime(2000, 1, 1)
+_PG_EPOCH_DATETIME_UTC = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_BINARY_TRAILER = struct.pack("!h", -1)
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def fast_insert(cur, table, columns, values, on_conflict=None, page_size=100):
     """
     Optimized batch insert using execute_values.
+
+    `values` may be any iterable (including a generator); it is consumed
+    `page_size` rows at a time, so only one page is held in memory.
+    `page_size` may also be a BatchSizer, read before every page and fed
+    with the time each page took. Returns the number of rows inserted.
     """
+    if _sink(cur) is not None:
+        return _sink_insert(cur, table, columns, values, on_conflict)
+
+    sizer = page_size if isinstance(page_size, BatchSizer) else None
     cols_str = ",".join(columns)
     query = f"INSERT INTO {table} ({cols_str}) VALUES %s"
     if on_conflict:
         query += f" ON CONFLICT {on_conflict}"
-    
-    execute_values(cur, query, values)
+
+    inserted = 0
+    generated = 0
+    rows = iter(values)
+    while True:
+        page = list(islice(rows, sizer.size if sizer else page_size))
+        if not page:
+            _record_rows(cur, table, generated, inserted)
+            return inserted
+        started = time.perf_counter()
+        execute_values(cur, query, page, page_size=len(page))
+        if sizer:
+            sizer.record(len(page), time.perf_counter() - started)
+        generated += len(page)
+        inserted += max(cur.rowcount, 0)
+
+def copy_insert(cur, table, columns, rows, on_conflict=None, fmt="text"):
+    """
+    Bulk insert streaming rows through COPY ... FROM STDIN.
+
+    `fmt` is "text" or "binary". When `on_conflict` is given, rows are
+    copied into a temporary staging table and moved with
+    INSERT ... SELECT ... ON CONFLICT, keeping the same semantics as
+    fast_insert. Returns the number of rows that landed in `table`.
+    """
+    if fmt not in ("text", "binary"):
+        raise ValueError(f"Unsupported COPY format: {fmt}")
+    if _sink(cur) is not None:
+        return _sink_insert(cur, table, columns, rows, on_conflict)
+
+    cols_str = ",".join(columns)
+    target = table
+    if on_conflict:
+        target = f"_copy_stage_{table}"
+        cur.execute(
+            f"CREATE TEMP TABLE {target} AS "
+            f"SELECT {cols_str} FROM {table} WITH NO DATA"
+        )
+
+    generated = [0]
+    rows = _counted(rows, generated)
+    if fmt == "binary":
+        encoders = _binary_encoders(cur, target, columns)
+        chunks = _binary_chunks(rows, encoders)
+        query = f"COPY {target} ({cols_str}) FROM STDIN WITH (FORMAT binary)"
+    else:
+        chunks = (_text_row(row) for row in rows)
+        query = f"COPY {target} ({cols_str}) FROM STDIN"
+
+    cur.copy_expert(query, _CopyStream(chunks), size=COPY_READ_SIZE)
+    if not on_conflict:
+        _record_rows(cur, table, generated[0], cur.rowcount)
+        return cur.rowcount
+
+    cur.execute(
+        f"INSERT INTO {table} ({cols_str}) SELECT {cols_str} FROM {target} "
+        f"ON CONFLICT {on_conflict}"
+    )
+    inserted = cur.rowcount
+    cur.execute(f"DROP TABLE {target}")
+    _record_rows(cur, table, generated[0], inserted)
+    return inserted
+
+def bulk_insert(
+    cur,
+    table,
+    columns,
+    rows,
+    on_conflict=None,
+    fmt="text",
+    row_count=None,
+    page_size=100
+):
+    """
+    Pick COPY for large loads and execute_values for small ones.
+
+    Pass `row_count` when `rows` is an iterator, so the choice can be made
+    without materializing it.
+    """
+    if _sink(cur) is not None:
+        return _sink_insert(cur, table, columns, rows, on_conflict)
+    if row_count is None:
+        row_count = len(rows)
+
+    if row_count >= COPY_THRESHOLD:
+        logger.info(f"COPY ({fmt}) of {row_count} rows into {table}")
+        return copy_insert(cur, table, columns, rows, on_conflict=on_conflict, fmt=fmt)
+
+    return fast_insert(cur, table, columns, rows, on_conflict=on_conflict, page_size=page_size)
+
+def insert_parent_children(
+    cur,
+    parent_table,
+    parent_columns,
+    parents,
+    child_table,
+    child_columns,
+    children,
+    fk_column,
+    fmt="text",
+    batch_sizer=None
+):
+    """
+    Insert a batch of header rows and all of their child rows.
+
+    `children[i]` holds the rows (without the FK column) that belong to
+    `parents[i]`. Headers go out in a single INSERT that returns each
+    row's ordinal with its id (see _insert_with_ordinals) and the
+    children in a single bulk_insert, so a batch always costs two round
+    trips. The time of both is recorded in `batch_sizer`, if given.
+    Returns the header ids in input order.
+    """
+    if not parents:
+        return []
+    started = time.perf_counter()
+
+    sink = _sink(cur)
+    if sink is not None:
+        parent_ids = sink.write_returning(parent_table, parent_columns, parents)
+    else:
+        parent_ids = _insert_with_ordinals(cur, parent_table, parent_columns, parents)
+    _record_rows(cur, parent_table, len(parents), len(parent_ids))
+
+    child_rows = [
+        (parent_id, *row)
+        for parent_id, rows in zip(parent_ids, children)
+        for row in rows
+    ]
+    if child_rows:
+        bulk_insert(
+            cur, child_table, [fk_column, *child_columns], child_rows,
+            fmt=fmt, page_size=len(child_rows)
+        )
+
+    if batch_sizer is not None:
+        batch_sizer.record(len(parents), time.perf_counter() - started)
+    return parent_ids
+
+def _insert_with_ordinals(cur, table, columns, rows):
+    """
+    Insert `rows` into `table` in one statement and return their ids in
+    input order.
+
+    Each row travels with its client-side ordinal; the ids are drawn from
+    the table's sequence next to it and inserted explicitly, and the
+    statement returns (ordinal, id) pairs. The match does not depend on the
+    order of RETURNING nor on the ids growing with the input.
+    """
+    cols_str = ",".join(columns)
+    # Linha de NULLs tipados pela tabela: dá aos literais do VALUES os tipos
+    # das colunas (sem ela, datas em texto não entram em colunas timestamp)
+    typed_nulls = ", ".join(f"(NULL::{table}).{col}" for col in columns)
+    query = (
+        f"WITH input AS ("
+        f"SELECT v.*, nextval(pg_get_serial_sequence('{table}', 'id')) AS new_id "
+        f"FROM (VALUES (NULL::int, {typed_nulls}), %s) AS v(ordinal, {cols_str}) "
+        f"WHERE v.ordinal IS NOT NULL"
+        f"), inserted AS ("
+        f"INSERT INTO {table} (id, {cols_str}) SELECT new_id, {cols_str} FROM input"
+        f") SELECT ordinal, new_id FROM input"
+    )
+    # input é lido duas vezes e chama nextval: o PostgreSQL o materializa,
+    # então cada linha recebe um único id
+    returned = execute_values(
+        cur, query, [(i, *row) for i, row in enumerate(rows)],
+        page_size=len(rows), fetch=True
+    )
+    ids = [None] * len(rows)
+    for ordinal, row_id in returned:
+        ids[ordinal] = row_id
+    return ids
 
 def get_existing_ids(cur, table, column="id"):
     """
@@ -21,9 +217,201 @@ def get_existing_ids(cur, table, column="id"):
     cur.execute(f"SELECT {column} FROM {table}")
     return [row[column] for row in cur.fetchall()]
 
+def select_ids(cur, table, limit=None):
+    """
+    Ids of `table` in id order (at most `limit`). On a sink they come from
+    the sink's own ids(), not from SQL.
+    """
+    sink = _sink(cur)
+    if sink is not None:
+        return list(sink.ids(table, limit))
+    query = f"SELECT id FROM {table} ORDER BY id"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    cur.execute(query)
+    return [row[0] for row in cur.fetchall()]
+
+def count_rows(cur, table):
+    """
+    Number of rows in `table` (the sink's count() on a sink).
+    """
+    sink = _sink(cur)
+    if sink is not None:
+        return sink.count(table)
+    cur.execute(f"SELECT count(*) FROM {table}")
+    return cur.fetchone()[0]
+
 def toggle_constraints(cur, table, enable=True):
     """
     Disable/Enable triggers for performance. Use with caution.
     """
     action = "ENABLE" if enable else "DISABLE"
     cur.execute(f"ALTER TABLE {table} {action} TRIGGER ALL")
+
+def _record_rows(cur, table, generated, written):
+    # Cursores sem métricas (scripts, benchmarks) seguem funcionando
+    metrics = getattr(cur, "metrics", None)
+    if metrics is not None:
+        metrics.record_rows(table, generated, written)
+
+def _sink(cur):
+    # Cursores de um sink (DRY_RUN, SEED_SINK) gravam nele em vez do PostgreSQL
+    return getattr(cur, "sink", None)
+
+def _sink_insert(cur, table, columns, rows, on_conflict=None):
+    generated = [0]
+    written = _sink(cur).write(table, columns, _counted(rows, generated), on_conflict)
+    _record_rows(cur, table, generated[0], written)
+    return written
+
+def _counted(rows, counter):
+    for row in rows:
+        counter[0] += 1
+        yield row
+
+# =========================
+# COPY - helpers internos
+# =========================
+class _CopyStream:
+    """
+    File-like adapter that lets copy_expert pull encoded rows lazily.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+def _text_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value).translate(_TEXT_ESCAPES)
+
+def _text_row(row):
+    return ("\t".join(_text_value(v) for v in row) + "\n").encode("utf-8")
+
+def _encode_numeric(value):
+    value = Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+    sign = 0x4000 if value.is_signed() else 0x0000
+    exponent = value.as_tuple().exponent
+    dscale = max(0, -exponent)
+
+    int_part, _, frac_part = format(abs(value), "f").partition(".")
+    int_part = int_part.zfill((len(int_part) + 3) // 4 * 4)
+    frac_part = frac_part.ljust((len(frac_part) + 3) // 4 * 4, "0")
+
+    groups = [int(int_part[i:i + 4]) for i in range(0, len(int_part), 4)]
+    weight = len(groups) - 1
+    groups += [int(frac_part[i:i + 4]) for i in range(0, len(frac_part), 4)]
+
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    return struct.pack(f"!hhHH{len(groups)}H", len(groups), weight, sign, dscale, *groups)
+
+def _encode_date(value):
+    if isinstance(value, str):
+        # Aceita também timestamps ISO (ex.: datas dos payloads do simulador)
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        value = value.date()
+    return struct.pack("!i", (value - _PG_EPOCH_DATE).days)
+
+def _encode_timestamp(value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _PG_EPOCH_DATETIME
+    return struct.pack("!q", (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+def _encode_timestamptz(value):
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _PG_EPOCH_DATETIME_UTC
+    return struct.pack("!q", (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds)
+
+def _encode_text(value):
+    return str(value).encode("utf-8")
+
+_BINARY_ENCODERS = {
+    "int2": lambda v: struct.pack("!h", int(v)),
+    "int4": lambda v: struct.pack("!i", int(v)),
+    "int8": lambda v: struct.pack("!q", int(v)),
+    "float4": lambda v: struct.pack("!f", float(v)),
+    "float8": lambda v: struct.pack("!d", float(v)),
+    "bool": lambda v: b"\x01" if v else b"\x00",
+    "numeric": _encode_numeric,
+    "date": _encode_date,
+    "timestamp": _encode_timestamp,
+    "timestamptz": _encode_timestamptz,
+    "text": _encode_text,
+    "varchar": _encode_text,
+    "bpchar": _encode_text,
+}
+
+def _binary_encoders(cur, table, columns):
+    """
+    Resolve one binary encoder per column from the table's catalog types.
+    """
+    cur.execute(
+        """
+        SELECT a.attname, t.typname
+        FROM pg_attribute a
+        JOIN pg_type t ON t.oid = a.atttypid
+        WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        """,
+        (table,)
+    )
+    types = {name: typname for name, typname in cur.fetchall()}
+
+    encoders = []
+    for column in columns:
+        typname = types.get(column)
+        if typname not in _BINARY_ENCODERS:
+            raise ValueError(f"Binary COPY not supported for {table}.{column} ({typname})")
+        encoders.append(_BINARY_ENCODERS[typname])
+    return encoders
+
+def _binary_chunks(rows, encoders):
+    field_count = struct.pack("!h", len(encoders))
+    yield _BINARY_HEADER
+    for row in rows:
+        parts = [field_count]
+        for encode, value in zip(encoders, row):
+            if value is None:
+                parts.append(b"\xff\xff\xff\xff")
+            else:
+                data = encode(value)
+                parts.append(struct.pack("!i", len(data)))
+                parts.append(data)
+        yield b"".join(parts)
+    yield _BINARY_TRAILER
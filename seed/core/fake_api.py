@@ -0,0 +1,206 @@
+"""
+Local stand-in for the systock API used by the *API seed stages.
+
+Serves POST /entries, /internal-distributions and /sales plus GET /stock/all
+over an in-memory stock ledger, with optional latency and error injection,
+so the API stages can be benchmarked and tested offline:
+
+    python -m seed.core.fake_api --port 8000 --latency 0.05
+    SEED_API_URL=http://127.0.0.1:8000 python seed_database_v2.py
+
+Business rules mirror the real API closely enough for the seed: entries add
+stock to the central store (id 1), distributions move stock between stores
+and sales remove it; a movement without enough stock is rejected with 400.
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+CENTRAL_STORE_ID = 1
+
+
+class StockLedgerError(Exception):
+    pass
+
+
+class FakeSystockAPI:
+    """
+    In-process server; use as a context manager or call start()/stop().
+
+    `latency` seconds (plus up to `jitter`) are slept before each request is
+    handled and `error_rate` of the POSTs fail with 503 before touching the
+    ledger, which exercises the client retries.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, jitter=0.0, error_rate=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stock = defaultdict(int)  # (store_id, product_id) -> quantity
+        self.counts = defaultdict(int)  # path -> documentos aceitos
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-api", daemon=True)
+        self._thread.start()
+        logger.info(f"Fake systock API listening on {self.url}")
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def serve_forever(self):
+        logger.info(f"Fake systock API listening on {self.url}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    # =========================
+    # LEDGER
+    # =========================
+    def stock_rows(self):
+        with self._lock:
+            return [
+                {"store_id": store_id, "product_id": product_id, "quantity": quantity}
+                for (store_id, product_id), quantity in sorted(self.stock.items())
+            ]
+
+    def post_entry(self, payload):
+        with self._lock:
+            for item in payload["items"]:
+                self.stock[(CENTRAL_STORE_ID, item["product_id"])] += item["quantity"]
+            self.counts["/entries"] += 1
+
+    def post_distribution(self, payload):
+        from_store, to_store = payload["from_store_id"], payload["to_store_id"]
+        with self._lock:
+            self._check_available(from_store, payload["items"])
+            for item in payload["items"]:
+                self.stock[(from_store, item["product_id"])] -= item["quantity"]
+                self.stock[(to_store, item["product_id"])] += item["quantity"]
+            self.counts["/internal-distributions"] += 1
+
+    def post_sale(self, payload):
+        store_id = payload["store_id"]
+        with self._lock:
+            self._check_available(store_id, payload["items"])
+            for item in payload["items"]:
+                self.stock[(store_id, item["product_id"])] -= item["quantity"]
+            self.counts["/sales"] += 1
+
+    def _check_available(self, store_id, items):
+        # Valida todos os itens antes de mover qualquer um (tudo ou nada)
+        needed = defaultdict(int)
+        for item in items:
+            needed[item["product_id"]] += item["quantity"]
+        for product_id, quantity in needed.items():
+            available = self.stock.get((store_id, product_id), 0)
+            if available < quantity:
+                raise StockLedgerError(
+                    f"Estoque insuficiente do produto {product_id} na loja {store_id}: "
+                    f"{available} < {quantity}"
+                )
+
+    # =========================
+    # HTTP
+    # =========================
+    def _make_handler(self):
+        api = self
+        routes = {
+            "/entries": api.post_entry,
+            "/internal-distributions": api.post_distribution,
+            "/sales": api.post_sale,
+        }
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            # Cabeçalho e corpo saem em writes separados: sem isso o Nagle +
+            # delayed ACK somam ~40 ms por resposta
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+            def do_GET(self):
+                api._delay()
+                if self.path.split("?")[0] == "/stock/all":
+                    self._reply(200, api.stock_rows())
+                else:
+                    self._reply(404, {"detail": "Not Found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                api._delay()
+
+                handler = routes.get(self.path)
+                if handler is None:
+                    return self._reply(404, {"detail": "Not Found"})
+                if api.error_rate and random.random() < api.error_rate:
+                    return self._reply(503, {"detail": "Injected failure"})
+
+                try:
+                    handler(json.loads(body))
+                except StockLedgerError as e:
+                    return self._reply(400, {"detail": str(e)})
+                except (ValueError, KeyError, TypeError) as e:
+                    return self._reply(422, {"detail": f"Payload inválido: {e}"})
+                self._reply(201, {"status": "created"})
+
+            def _reply(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def _delay(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in local da API do systock")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="segundos por requisição")
+    parser.add_argument("--jitter", type=float, default=0.0, help="latência extra aleatória (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de POSTs com 503")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    FakeSystockAPI(args.host, args.port, args.latency, args.jitter, args.error_rate).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS = range(500, 600)
+# Requisições na fila ou em andamento por worker antes de submit() bloquear
+PENDING_PER_WORKER = 4
+
+
+class RateLimiter:
+    """
+    Token bucket: at most `rate` requests per second, bursts up to `burst`.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class SeedHttpClient:
+    """
+    Shared HTTP layer for the *API seed stages.
+
+    - one keep-alive `requests.Session` with a connection pool sized to the
+      concurrency;
+    - `submit()` posts on a thread pool with bounded concurrency, and
+      blocks once `max_pending` requests are queued or in flight, so a
+      stage never generates far ahead of what the API accepts;
+    - optional per-host rate limit (requests/second);
+    - retry with exponential backoff on 5xx, timeouts and connection errors.
+
+    Requests that share an `order_keys` entry (e.g. the same store/product
+    stock being decremented) are sent in submission order; the others run
+    in parallel. Finished requests are forgotten right away (their
+    responses are not kept). Use as a context manager: leaving the block
+    waits for every pending request and re-raises the first failure.
+
+    With `dry_run`, requests are serialized but never sent: POSTs answer 201
+    and GETs an empty JSON list.
+    """
+
+    def __init__(
+        self,
+        max_workers=8,
+        rate_limit=0,
+        retries=3,
+        backoff=0.5,
+        timeout=30,
+        metrics=None,
+        dry_run=False,
+        max_pending=None
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * PENDING_PER_WORKER
+        self.rate_limit = rate_limit
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.metrics = metrics
+        self.dry_run = dry_run
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="seed-http")
+        self._limiters = {}
+        self._last_by_key = {}
+        self._pending = {}  # future -> order_keys, só os ainda não concluídos
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._error = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.wait_all()
+        finally:
+            self.close()
+        return False
+
+    def close(self):
+        # Em caso de erro, o que ainda está na fila é descartado
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+    # =========================
+    # API SÍNCRONA
+    # =========================
+    def get_json(self, url, **params):
+        response = self.request("GET", url, params=params or None)
+        response.raise_for_status()
+        return response.json()
+
+    def request(self, method, url, **kwargs):
+        """
+        Send one request with rate limiting and retry/backoff.
+        """
+        limiter = self._limiter_for(url)
+        for attempt in range(self.retries + 1):
+            if limiter:
+                limiter.acquire()
+            try:
+                response = self._send(method, url, kwargs)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"{method} {url} failed ({e.__class__.__name__}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUS or attempt == self.retries:
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+
+            time.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    def _send(self, method, url, kwargs):
+        if self.dry_run:
+            return self._null_response(method, url, kwargs)
+        if self.metrics is None:
+            return self.session.request(method, url, timeout=self.timeout, **kwargs)
+
+        response = None
+        self.metrics.http_started()
+        try:
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            return response
+        finally:
+            body = response.request.body if response is not None else None
+            self.metrics.http_finished(len(body or b""))
+
+    def _null_response(self, method, url, kwargs):
+        # Serializa o corpo como o requests faria: é custo de geração
+        body = json.dumps(kwargs["json"]).encode() if "json" in kwargs else b""
+        if self.metrics is not None:
+            self.metrics.http_started()
+            self.metrics.http_finished(len(body))
+
+        response = requests.Response()
+        response.status_code = 201 if method == "POST" else 200
+        response._content = b"[]" if method == "GET" else b"{}"
+        response.url = url
+        return response
+
+    # =========================
+    # API CONCORRENTE
+    # =========================
+    def submit(self, url, payload, order_keys=(), error_prefix="Erro na requisição", table=None):
+        """
+        Queue a POST of `payload`. Raises immediately if a previous request
+        already failed, so stages stop generating work.
+
+        `table` names the document in the metrics (one row per payload).
+        """
+        if self._error is not None:
+            raise self._error
+        # Contrapressão: espera uma vaga antes de enfileirar mais trabalho
+        self._slots.acquire()
+        if self.metrics is not None and table:
+            self.metrics.record_rows(table, 1, 0)
+
+        order_keys = tuple(order_keys)
+        with self._lock:
+            after = {self._last_by_key[key] for key in order_keys if key in self._last_by_key}
+            future = self._executor.submit(
+                self._post_after, after, url, payload, error_prefix, table
+            )
+            for key in order_keys:
+                self._last_by_key[key] = future
+            self._pending[future] = order_keys
+        # Fora do lock: se a requisição já terminou, o callback roda aqui
+        future.add_done_callback(self._finished)
+        return future
+
+    def wait_all(self):
+        """
+        Wait for every submitted request; re-raise the first failure.
+        """
+        with self._lock:
+            pending = list(self._pending)
+
+        for future in pending:
+            future.exception()
+        if self._error is not None:
+            raise self._error
+
+    def _finished(self, future):
+        # Concluída (ou cancelada): libera a vaga e esquece o future, a não
+        # ser que uma requisição posterior da mesma chave já o substituiu
+        with self._lock:
+            for key in self._pending.pop(future, ()):
+                if self._last_by_key.get(key) is future:
+                    del self._last_by_key[key]
+        self._slots.release()
+
+    def _post_after(self, after, url, payload, error_prefix, table):
+        # Os predecessores foram enviados antes ao pool (FIFO), então já
+        # estão rodando ou concluídos: esperar por eles não trava o pool.
+        for future in after:
+            future.exception()
+        if self._error is not None:
+            raise RuntimeError("Requisição cancelada após falha anterior")
+
+        try:
+            response = self.request("POST", url, json=payload)
+            if response.status_code not in (200, 201):
+                raise RuntimeError(f"{error_prefix}: {response.status_code} - {response.text}")
+            if self.metrics is not None and table:
+                self.metrics.record_rows(table, 0, 1)
+            return response
+        except Exception as e:
+            with self._lock:
+                if self._error is None:
+                    self._error = e
+            raise
+
+    def _limiter_for(self, url):
+        if not self.rate_limit:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = RateLimiter(self.rate_limit)
+            return self._limiters[host]
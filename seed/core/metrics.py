@@ -0,0 +1,325 @@
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import psutil
+except ImportError:  # RSS via /proc quando o psutil não está instalado
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows: pico de RSS só com o psutil
+    resource = None
+
+
+def current_rss():
+    """
+    Resident set size of this process in bytes, or None when unknown.
+    """
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def peak_rss():
+    """
+    Highest resident set size this process reached so far, in bytes.
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss vem em bytes no macOS e em KiB no Linux
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return current_rss()
+
+
+class StageMetrics:
+    """
+    Counters for one seed stage, filled while it runs.
+
+    - rows generated/written per table (db_utils and the HTTP client), and
+      the difference as rows rejected by the database;
+    - SQL statements and bytes sent, with the time spent waiting on the
+      database (MeteredCursor);
+    - HTTP requests and bytes sent, with the wall time during which at least
+      one request was in flight (concurrent requests are not double counted);
+    - the size of every batch written through the stage's BatchSizer;
+    - documents of the profile the stage could not produce (shortfall);
+    - the process peak RSS when the stage finished (`process_peak_rss`):
+      the highest RSS of the whole process so far, which includes every
+      earlier stage, not a per-stage figure.
+
+    Whatever is left of the run time is reported as generation. Partitions
+    of the same stage are combined with merge().
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.rows_generated = defaultdict(int)
+        self.rows_written = defaultdict(int)
+        self.sql_statements = 0
+        self.sql_bytes = 0
+        self.db_time = 0.0
+        self.http_requests = 0
+        self.http_bytes = 0
+        self.http_time = 0.0
+        self.run_time = 0.0
+        self.elapsed = None
+        self.partitions = 1
+        self.batch_sizes = defaultdict(int)
+        self.shortfall = defaultdict(int)
+        self.process_peak_rss = None
+        self._in_flight = 0
+        self._http_since = 0.0
+        self._lock = threading.Lock()
+
+    # O lock não é serializável: partições voltam do processo filho via pickle
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def record_rows(self, table, generated, written):
+        with self._lock:
+            self.rows_generated[table] += generated
+            self.rows_written[table] += written
+
+    def record_sql(self, statements, sent, seconds):
+        with self._lock:
+            self.sql_statements += statements
+            self.sql_bytes += sent
+            self.db_time += seconds
+
+    def http_started(self):
+        with self._lock:
+            if self._in_flight == 0:
+                self._http_since = time.perf_counter()
+            self._in_flight += 1
+
+    def http_finished(self, sent):
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self.http_time += time.perf_counter() - self._http_since
+            self.http_requests += 1
+            self.http_bytes += sent
+
+    def record_batch(self, rows):
+        with self._lock:
+            self.batch_sizes[rows] += 1
+
+    def record_shortfall(self, table, missing):
+        with self._lock:
+            self.shortfall[table] += missing
+
+    def rows_rejected(self):
+        """
+        Rows generated but not written, per table (e.g. dropped by ON CONFLICT).
+        """
+        return {
+            table: generated - self.rows_written.get(table, 0)
+            for table, generated in self.rows_generated.items()
+            if generated > self.rows_written.get(table, 0)
+        }
+
+    def merge(self, other):
+        with self._lock:
+            for table, count in other.rows_generated.items():
+                self.rows_generated[table] += count
+            for table, count in other.rows_written.items():
+                self.rows_written[table] += count
+            self.sql_statements += other.sql_statements
+            self.sql_bytes += other.sql_bytes
+            self.db_time += other.db_time
+            self.http_requests += other.http_requests
+            self.http_bytes += other.http_bytes
+            self.http_time += other.http_time
+            self.run_time += other.run_time
+            for size, count in other.batch_sizes.items():
+                self.batch_sizes[size] += count
+            for table, missing in other.shortfall.items():
+                self.shortfall[table] += missing
+            # Partições rodam em processos próprios: vale o maior pico
+            if other.process_peak_rss is not None:
+                self.process_peak_rss = max(self.process_peak_rss or 0, other.process_peak_rss)
+
+    def to_dict(self):
+        # Estágios particionados somam os tempos de todas as partições
+        elapsed = self.elapsed if self.elapsed is not None else self.run_time
+        written = sum(self.rows_written.values())
+        return {
+            "stage": self.stage,
+            "partitions": self.partitions,
+            "wall_time": round(elapsed, 4),
+            "rows_generated": dict(self.rows_generated),
+            "rows_written": dict(self.rows_written),
+            "rows_rejected": self.rows_rejected(),
+            "shortfall": {table: missing for table, missing in self.shortfall.items() if missing},
+            "rows_per_sec": round(written / elapsed, 1) if elapsed > 0 else None,
+            "batch_sizes": self._batch_summary(),
+            "process_peak_rss_mb": (
+                round(self.process_peak_rss / 2 ** 20, 1) if self.process_peak_rss else None
+            ),
+            "sql_statements": self.sql_statements,
+            "http_requests": self.http_requests,
+            "bytes_sent": {"sql": self.sql_bytes, "http": self.http_bytes},
+            "time": {
+                "generation": round(max(0.0, self.run_time - self.db_time - self.http_time), 4),
+                "db": round(self.db_time, 4),
+                "http": round(self.http_time, 4),
+            },
+        }
+
+    def _batch_summary(self):
+        if not self.batch_sizes:
+            return {}
+        batches = sum(self.batch_sizes.values())
+        rows = sum(size * count for size, count in self.batch_sizes.items())
+        return {
+            "batches": batches,
+            "min": min(self.batch_sizes),
+            "max": max(self.batch_sizes),
+            "mean": round(rows / batches, 1),
+            "histogram": {size: self.batch_sizes[size] for size in sorted(self.batch_sizes)},
+        }
+
+
+class MeteredCursor:
+    """
+    Cursor proxy that feeds StageMetrics with statements, bytes and DB time.
+
+    Everything else is delegated to the wrapped psycopg2 cursor, so it can
+    be handed to execute_values and the db_utils helpers unchanged; they
+    find the metrics through `cur.metrics`.
+    """
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, query, vars=None):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(query, vars)
+        finally:
+            self.metrics.record_sql(1, len(self._cursor.query or b""), time.perf_counter() - start)
+
+    def copy_expert(self, sql, file, size=8192):
+        # O stream gera as linhas sob demanda: esse tempo é geração, não banco
+        stream = _MeteredStream(file)
+        start = time.perf_counter()
+        try:
+            return self._cursor.copy_expert(sql, stream, size)
+        finally:
+            seconds = time.perf_counter() - start - stream.read_time
+            self.metrics.record_sql(1, len(sql) + stream.bytes_read, seconds)
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone)
+
+    def fetchmany(self, size=None):
+        if size is None:
+            return self._timed(self._cursor.fetchmany)
+        return self._timed(self._cursor.fetchmany, size)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall)
+
+    def _timed(self, fetch, *args):
+        start = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self.metrics.record_sql(0, 0, time.perf_counter() - start)
+
+
+class AsyncMeteredCursor:
+    """
+    MeteredCursor for psycopg 3 async cursors (the async backend).
+
+    Bytes sent are approximated by the statement text; parameter values
+    are not measured.
+    """
+
+    def __init__(self, cursor, metrics):
+        self._cursor = cursor
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    async def execute(self, query, params=None):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.execute(query, params)
+        finally:
+            self.metrics.record_sql(1, len(query), time.perf_counter() - start)
+
+    async def executemany(self, query, params_seq):
+        # Os parâmetros podem ser gerados sob demanda: esse tempo é geração
+        counted = [0]
+        generation = [0.0]
+
+        def metered(params):
+            params = iter(params)
+            while True:
+                start = time.perf_counter()
+                item = next(params, None)
+                generation[0] += time.perf_counter() - start
+                if item is None:
+                    return
+                counted[0] += 1
+                yield item
+
+        start = time.perf_counter()
+        try:
+            return await self._cursor.executemany(query, metered(params_seq))
+        finally:
+            seconds = time.perf_counter() - start - generation[0]
+            self.metrics.record_sql(counted[0], len(query) * counted[0], seconds)
+
+    async def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return await self._cursor.fetchall()
+        finally:
+            self.metrics.record_sql(0, 0, time.perf_counter() - start)
+
+
+class _MeteredStream:
+    def __init__(self, file):
+        self._file = file
+        self.bytes_read = 0
+        self.read_time = 0.0
+
+    def read(self, size=-1):
+        return self._metered(self._file.read, size)
+
+    def readline(self, size=-1):
+        return self._metered(self._file.readline, size)
+
+    def _metered(self, read, size):
+        start = time.perf_counter()
+        data = read(size)
+        self.read_time += time.perf_counter() - start
+        self.bytes_read += len(data)
+        return data
@@ -0,0 +1,59 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+
+def run_partitioned(stage_class, profile, settings, conn_params, workers, streams):
+    """
+    Split one stage into `workers` partitions running in separate processes.
+
+    Each partition generates its share of the stage's row count from the
+    stage's RandomStreams and writes through its own connection; indexed
+    generators draw per chunk, so the partitions produce the same rows as a
+    single-worker run. Every partition commits on its own: a failure rolls
+    back only that partition. Returns the StageMetrics of each partition.
+    """
+    logger.info(f"Running {stage_class.__name__} in {workers} partitions")
+
+    # spawn evita herdar locks de threads (o runner pode rodar estágios em paralelo)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                _run_partition,
+                stage_class,
+                profile,
+                settings,
+                conn_params,
+                (index, workers),
+                streams
+            )
+            for index in range(workers)
+        ]
+        # Propaga o primeiro erro depois que todas as partições terminarem
+        errors = [future.exception() for future in futures]
+
+    for error in errors:
+        if error is not None:
+            raise error
+    return [future.result() for future in futures]
+
+
+def _run_partition(stage_class, profile, settings, conn_params, partition, streams):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    conn = psycopg2.connect(**conn_params)
+    try:
+        stage = stage_class(
+            conn,
+            profile,
+            settings=settings,
+            partition=partition,
+            streams=streams
+        )
+        stage.run()
+        return stage.metrics
+    finally:
+        conn.close()
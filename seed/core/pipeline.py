@@ -0,0 +1,71 @@
+import logging
+import threading
+from queue import Queue, Full
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+_POLL_INTERVAL = 0.1
+
+
+class _ProducerError:
+    def __init__(self, error):
+        self.error = error
+
+
+class BatchPipeline:
+    """
+    Producer/consumer pipeline for stage batches.
+
+    A background thread pulls from `batches` (row generation) and keeps at
+    most `max_pending` ready batches in a bounded queue, while the caller
+    iterates the pipeline and writes them (database I/O). A full queue
+    blocks the producer (backpressure); a producer error is re-raised in the
+    consumer; leaving the `with` block early stops the producer.
+
+    The producer must not touch the stage's cursor: only the consumer
+    thread talks to the database, so BaseSeed.run keeps its single commit.
+    """
+
+    def __init__(self, batches, max_pending=4):
+        self._batches = batches
+        self._queue = Queue(maxsize=max_pending)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name="seed-producer", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+
+    def _produce(self):
+        try:
+            for batch in self._batches:
+                if not self._put(batch):
+                    return
+            self._put(_DONE)
+        except Exception as e:
+            logger.error(f"Batch producer failed: {str(e)}")
+            self._put(_ProducerError(e))
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
@@ -0,0 +1,66 @@
+import logging
+from .db_utils import count_rows
+
+logger = logging.getLogger(__name__)
+
+# Acima disso o catálogo é lido em lotes por um cursor nomeado (server-side)
+SERVER_SIDE_THRESHOLD = 50_000
+SERVER_SIDE_ITERSIZE = 10_000
+
+# Colunas na ordem de _add; os sinks guardam as mesmas (LOOKUP_COLUMNS)
+_PRODUCT_COLUMNS = ("sale_price", "cost_price", "category_id")
+_PRODUCTS_QUERY = f"SELECT id, {', '.join(_PRODUCT_COLUMNS)} FROM products ORDER BY id"
+
+
+class ProductCache:
+    """
+    Product attributes loaded once per stage, so pricing is a dict lookup
+    instead of one SELECT per item.
+
+    `ids` keeps catalog order (for sampling); `sale_price`, `cost_price` and
+    `category_id` map product id -> value, with prices as float.
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.sale_price = {}
+        self.cost_price = {}
+        self.category_id = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, product_id):
+        return product_id in self.sale_price
+
+    @classmethod
+    def load(cls, cur):
+        """
+        Load the catalog through `cur`; big catalogs stream through a named
+        server-side cursor instead of one fetchall. On a sink, the catalog
+        comes from the sink's lookup().
+        """
+        cache = cls()
+        sink = getattr(cur, "sink", None)
+        if sink is not None:
+            cache._add(sink.lookup("products", _PRODUCT_COLUMNS))
+            return cache
+
+        total = count_rows(cur, "products")
+        if total > SERVER_SIDE_THRESHOLD:
+            logger.info(f"Loading {total} products through a server-side cursor")
+            with cur.connection.cursor(name="seed_product_cache") as server_cur:
+                server_cur.itersize = SERVER_SIDE_ITERSIZE
+                server_cur.execute(_PRODUCTS_QUERY)
+                cache._add(server_cur)
+        else:
+            cur.execute(_PRODUCTS_QUERY)
+            cache._add(cur.fetchall())
+        return cache
+
+    def _add(self, rows):
+        for product_id, sale_price, cost_price, category_id in rows:
+            self.ids.append(product_id)
+            self.sale_price[product_id] = float(sale_price or 0)
+            self.cost_price[product_id] = float(cost_price or 0)
+            self.category_id[product_id] = category_id
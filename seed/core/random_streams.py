@@ -0,0 +1,96 @@
+import hashlib
+import random
+import struct
+from typing import Iterator, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # sorteios vetorizados são opcionais
+    np = None
+
+# Linhas por bloco de sorteios dos geradores indexados (produtos, clientes)
+CHUNK_ROWS = 1024
+
+
+class RandomStreams:
+    """
+    Independent, reproducible random streams derived from one master seed.
+
+    `seed_for(*path)` hashes the master seed with a path of names and
+    indexes (BLAKE2b, so the result is the same in every process and
+    Python version), `stream(*path)` is a random.Random seeded with it and
+    `child(*path)` is a RandomStreams rooted at that path. The runner hands
+    each stage `child(stage_name)`, so adding draws to one stage never
+    shifts another.
+
+    `chunk(k)` is the stream for rows [k * CHUNK_ROWS, (k + 1) * CHUNK_ROWS)
+    of an indexed generator: a row's values depend only on the seed and its
+    index, not on the batch size or on how the rows were split between
+    workers, and any chunk can be regenerated on its own.
+    """
+
+    __slots__ = ("master_seed",)
+
+    def __init__(self, master_seed: int):
+        self.master_seed = master_seed
+
+    @classmethod
+    def from_seed(cls, seed: int | None = None) -> "RandomStreams":
+        """Streams for `seed`, or for a fresh random master seed when None."""
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        return cls(seed)
+
+    def seed_for(self, *path) -> int:
+        key = ":".join(str(part) for part in (self.master_seed, *path))
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def stream(self, *path) -> random.Random:
+        return random.Random(self.seed_for(*path))
+
+    def child(self, *path) -> "RandomStreams":
+        return RandomStreams(self.seed_for(*path))
+
+    def chunk(self, index: int) -> random.Random:
+        return self.stream("chunk", index)
+
+    def __repr__(self):
+        return f"RandomStreams({self.master_seed})"
+
+
+def chunk_spans(start: int, count: int, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[int, int, int]]:
+    """
+    (chunk, lo, hi) pieces of the rows [start, start + count): rows lo..hi-1
+    (offsets inside the chunk) of chunk `chunk`.
+    """
+    end = start + count
+    while start < end:
+        chunk, lo = divmod(start, chunk_rows)
+        hi = min(chunk_rows, lo + end - start)
+        yield chunk, lo, hi
+        start += hi - lo
+
+
+def draw_integers(rng: random.Random, count: int, low, high, vectorized: bool = False):
+    """
+    `count` integers in [low, high) drawn from `rng`, the same with and
+    without NumPy.
+
+    Both modes read the same 32 * count bits from `rng` and scale each
+    32-bit word with integer arithmetic (low + word * (high - low) >> 32),
+    so a generator's output does not depend on whether NumPy is installed.
+    `low` and `high` are ints or per-row sequences (high - low <= 2 ** 32).
+    Returns an int64 array when `vectorized`, a list of ints otherwise.
+    """
+    raw = rng.getrandbits(32 * count).to_bytes(4 * count, "little") if count else b""
+    if vectorized:
+        words = np.frombuffer(raw, dtype="<u4").astype(np.uint64)
+        span = np.asarray(high, dtype=np.int64) - np.asarray(low, dtype=np.int64)
+        scaled = (words * span.astype(np.uint64)) >> np.uint64(32)
+        return np.asarray(low, dtype=np.int64) + scaled.astype(np.int64)
+
+    words = struct.unpack(f"<{count}I", raw)
+    if isinstance(low, int) and isinstance(high, int):
+        span = high - low
+        return [low + (word * span >> 32) for word in words]
+    return [lo + (word * (hi - lo) >> 32) for word, lo, hi in zip(words, low, high)]
@@ -1,28 +1,138 @@
+import asyncio
+import json
 import logging
+import time
+from dataclasses import asdict
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from psycopg2.pool import ThreadedConnectionPool
 # from ..config.seed_settings import CURRENT_PROFILE, ENV, IS_PRODUCTION_LIKE, FORCE_SEED
 from ..config.seed_settings import load_settings
+from .async_db_utils import async_get_connection
+from .metrics import StageMetrics
+from .parallel import run_partitioned
+from .random_streams import RandomStreams
+from .sinks import SinkConnection, create_sink
 from ..seeds.seed_products import SeedProducts
-from ..seeds.seed_clients import SeedClients
+from ..seeds.seed_clients import SeedClients, AsyncSeedClients
 from ..seeds.seed_entries import SeedEntries, SeedEntriesAPI
 from ..seeds.seed_distributions import SeedDistributions, SeedDistributionsAPI
 from ..seeds.seed_sales import SeedSales, SeedSalesAPI
+from ..seeds.seed_inventory import SeedInventory, SeedInventoryAPI
+from ..seeds.seed_stock import SeedStock
 
 logger = logging.getLogger(__name__)
 
+# Dependências entre estágios (integridade referencial)
+STAGE_DEPENDENCIES = {
+    "products": [],
+    "clients": [],
+    "entries": ["products"],
+    "distributions": ["products"],
+    "sales": ["products", "clients"],
+}
+
+# Via API o estoque flui entradas -> distribuições -> vendas
+API_STAGE_DEPENDENCIES = {
+    **STAGE_DEPENDENCIES,
+    "distributions": ["products", "entries"],
+    "sales": ["clients", "distributions"],
+}
+
+# Com o estoque simulado, entradas/distribuições/vendas viram um só estágio
+SIMULATED_API_STAGE_DEPENDENCIES = {
+    "products": [],
+    "clients": [],
+    "inventory": ["products", "clients"],
+}
+SIMULATED_STAGE_DEPENDENCIES = SIMULATED_API_STAGE_DEPENDENCIES
+
+# SEED_MATERIALIZE_STOCK: o estoque sai dos itens do estágio simulado
+STOCK_STAGE_DEPENDENCIES = {
+    **SIMULATED_STAGE_DEPENDENCIES,
+    "stock": ["inventory"],
+}
+INVENTORY_STAGE_NAMES = {"entries", "distributions", "sales"}
+
+DB_STAGES = {
+    "products": SeedProducts,
+    "clients": SeedClients,
+    "entries": SeedEntries,
+    "distributions": SeedDistributions,
+    "sales": SeedSales,
+}
+
+SIMULATED_DB_STAGES = {
+    "products": SeedProducts,
+    "clients": SeedClients,
+    "inventory": SeedInventory,
+}
+
+STOCK_DB_STAGES = {
+    **SIMULATED_DB_STAGES,
+    "stock": SeedStock,
+}
+
+API_STAGES = {
+    "products": SeedProducts,
+    "clients": SeedClients,
+    "entries": SeedEntriesAPI,
+    "distributions": SeedDistributionsAPI,
+    "sales": SeedSalesAPI,
+}
+
+# Variantes no backend assíncrono (SEED_DB_BACKEND=async)
+ASYNC_STAGES = {
+    "clients": AsyncSeedClients,
+}
+DB_BACKENDS = ("psycopg2", "async")
+
+SIMULATED_API_STAGES = {
+    "products": SeedProducts,
+    "clients": SeedClients,
+    "inventory": SeedInventoryAPI,
+}
+
 class SeedRunner:
-    def __init__(self, conn, settings=None):
+    def __init__(self, conn, settings=None, conn_params=None, sink=None):
         self.conn = conn
         self.settings = settings
         self.profile = load_settings()["CURRENT_PROFILE"]
         self.force = settings["FORCE_SEED"] if settings else False
 
-        self.stages = {
-            "products": SeedProducts,
-            "clients": SeedClients,
-            "entries": SeedEntriesAPI,
-            "distributions": SeedDistributionsAPI,
-            "sales": SeedSalesAPI,
-        }
+        # Com conn_params, estágios independentes rodam em paralelo,
+        # cada um com sua conexão do pool
+        self.conn_params = conn_params
+        self.max_parallel_stages = load_settings()["PARALLEL_STAGES"]
+        # Estágios particionáveis dividem o volume entre processos
+        self.workers = load_settings()["WORKERS"]
+        self.last_run = None
+        self.stage_metrics = {}
+
+        # Semente mestre: cada estágio recebe seus próprios streams dela.
+        # Sem SEED_RANDOM_SEED, sorteia uma e registra no log e no relatório
+        self.streams = RandomStreams.from_seed(load_settings()["RANDOM_SEED"])
+        self.random_seed = self.streams.master_seed
+
+        # DRY_RUN e SEED_SINK: gera tudo pelo caminho normal, mas grava em um
+        # sink (nulo, arquivos COPY ou SQLite), em sequência e em um só
+        # processo (o sink responde às leituras)
+        self.dry_run = load_settings()["DRY_RUN"]
+        self.sink = sink if sink is not None else create_sink(load_settings())
+        if self.sink is not None:
+            self.conn = SinkConnection(self.sink)
+            self.conn_params = None
+
+        # Backend assíncrono: os estágios com variante em ASYNC_STAGES abrem
+        # sua própria conexão psycopg 3 a partir de conn_params
+        backend = load_settings()["DB_BACKEND"]
+        if backend not in DB_BACKENDS:
+            raise ValueError(f"SEED_DB_BACKEND inválido: {backend} (use {', '.join(DB_BACKENDS)})")
+        self.async_backend = backend == "async" and self.sink is None
+        if self.async_backend and not self.conn_params:
+            raise ValueError("SEED_DB_BACKEND=async requer os parâmetros de conexão (conn_params)")
+
+        self.stages = API_STAGES
 
     def run(self, only: list[str] | None = None):
         logger.info(f"Starting seed runner in environment: {load_settings()['ENV']}")
@@ -32,23 +142,26 @@ class SeedRunner:
             logger.warning("Targeting a production-like environment without FORCE_SEED=true. Aborting.")
             return
 
+        stage_map, dependencies = self.stages, API_STAGE_DEPENDENCIES
+        if self.sink is not None and not self.dry_run:
+            # Sink local (SEED_SINK): os ids vêm do arquivo do sink, não do
+            # banco por trás da API; roda os estágios diretos
+            logger.info("Local sink: running the direct stages instead of the API stages")
+            stage_map, dependencies = self._db_stages()
+            if stage_map is not DB_STAGES:
+                only = self._with_inventory(only)
+        elif load_settings()["SIMULATE_STOCK"] or self.dry_run:
+            # No DRY_RUN a API não responde /stock/all: o estoque vem do simulador
+            stage_map, dependencies = SIMULATED_API_STAGES, SIMULATED_API_STAGE_DEPENDENCIES
+            only = self._with_inventory(only)
+
         stages_to_run = (
-            self.stages
+            list(stage_map)
             if not only
-            else {k: v for k, v in self.stages.items() if k in only}
+            else [k for k in stage_map if k in only]
         )
 
-        # for name, stage in stages_to_run.items():
-        #     logging.info(f"Executando seed: {name}")
-        #     stage()
-
-        for stage_name in stages_to_run:
-            stage_class = self.stages.get(stage_name)
-            if stage_class:
-                stage = stage_class(self.conn, self.profile)
-                stage.run()
-            else:
-                logger.warning(f"Unknown seed stage: {stage_name}")
+        self._run_dag(stage_map, stages_to_run, dependencies)
 
     def run_all(self):
         logger.info(f"Starting seed runner in environment: {load_settings()['ENV']}")
@@ -59,17 +172,8 @@ class SeedRunner:
             return
 
         # Ordem de execução respeitando integridade referencial
-        stages = [
-            SeedProducts,
-            SeedClients,
-            SeedEntries,
-            SeedDistributions,
-            SeedSales
-        ]
-
-        for stage_class in stages:
-            stage = stage_class(self.conn, self.profile)
-            stage.run()
+        stage_map, dependencies = self._db_stages()
+        self._run_dag(stage_map, list(stage_map), dependencies)
 
         logger.info("All seed stages completed successfully.")
 
@@ -81,20 +185,261 @@ class SeedRunner:
             logger.warning("Targeting a production-like environment without FORCE_SEED=true. Aborting.")
             return
 
-        stage_map = {
-            "products": SeedProducts,
-            "clients": SeedClients,
-            "entries": SeedEntries,
-            "distributions": SeedDistributions,
-            "sales": SeedSales
-        }
+        stage_map, dependencies = self._db_stages()
+        if stage_map is not DB_STAGES:
+            stages = self._with_inventory(stages)
+        self._run_dag(stage_map, stages, dependencies)
 
-        for stage_name in stages:
-            stage_class = stage_map.get(stage_name)
-            if stage_class:
-                stage = stage_class(self.conn, self.profile)
-                stage.run()
-            else:
+        logger.info("Selected seed stages completed successfully.")
+
+    def _db_stages(self):
+        """
+        Stage map and dependencies of the direct path for the current settings.
+
+        With SEED_SIMULATE_STOCK (or SEED_MATERIALIZE_STOCK, which needs
+        stock-consistent items) entries, distributions and sales come from
+        the InventorySimulator in a single stage; SEED_MATERIALIZE_STOCK
+        adds SeedStock after it.
+        """
+        settings = load_settings()
+        if settings["MATERIALIZE_STOCK"]:
+            return STOCK_DB_STAGES, STOCK_STAGE_DEPENDENCIES
+        if settings["SIMULATE_STOCK"]:
+            return SIMULATED_DB_STAGES, SIMULATED_STAGE_DEPENDENCIES
+        return DB_STAGES, STAGE_DEPENDENCIES
+
+    @staticmethod
+    def _with_inventory(only):
+        # O simulador só é consistente com a cadeia inteira de movimentos;
+        # o estágio "inventory" substitui entries, distributions e sales
+        if only and INVENTORY_STAGE_NAMES.intersection(only):
+            logger.info("Simulated stock: entries, distributions and sales run together")
+            return [name for name in only if name not in INVENTORY_STAGE_NAMES] + ["inventory"]
+        return only
+
+    # =========================
+    # AGENDAMENTO (DAG)
+    # =========================
+    def _run_dag(self, stage_map, selected, dependencies):
+        """
+        Run the selected stages respecting `dependencies`.
+
+        Dependencies that were not selected are considered satisfied. Stages
+        whose dependencies are done run at the same time, each on its own
+        pooled connection, when conn_params was given; otherwise they run
+        one after another on self.conn.
+        """
+        for stage_name in selected:
+            if stage_name not in stage_map:
                 logger.warning(f"Unknown seed stage: {stage_name}")
+        selected = [name for name in stage_map if name in selected]
+        graph = {
+            name: [dep for dep in dependencies.get(name, []) if dep in selected]
+            for name in selected
+        }
 
-        logger.info("Selected seed stages completed successfully.")
+        self.stage_metrics = {}
+        logger.info(f"Random seed: {self.random_seed} (SEED_RANDOM_SEED reproduces this run)")
+        start_time = time.time()
+        if self.conn_params and self.max_parallel_stages > 1:
+            durations = self._run_parallel(stage_map, graph)
+        else:
+            durations = self._run_sequential(stage_map, graph)
+        if self.sink is not None:
+            # Fecha arquivos/banco do sink: a saída fica completa no disco
+            self.sink.close()
+        wall_time = time.time() - start_time
+
+        path, path_time = self._critical_path(graph, durations)
+        self.last_run = {
+            "stages": durations,
+            "critical_path": path,
+            "critical_path_time": path_time,
+            "wall_time": wall_time,
+            "metrics": {
+                name: self.stage_metrics[name].to_dict() for name in durations
+            },
+        }
+
+        if path:
+            logger.info(f"Critical path: {' -> '.join(path)} ({path_time:.2f}s)")
+        logger.info(f"Total wall time: {wall_time:.2f}s")
+        if self.dry_run:
+            self._log_dry_run()
+        self._write_report()
+
+    def _log_dry_run(self):
+        for stage_name, metrics in self.last_run["metrics"].items():
+            generated = sum(metrics["rows_generated"].values())
+            logger.info(
+                f"Dry run {stage_name}: {generated} rows generated "
+                f"({metrics['rows_per_sec'] or 0:,.0f} rows/s), "
+                f"process peak RSS so far {metrics['process_peak_rss_mb']} MiB"
+            )
+
+    def _run_sequential(self, stage_map, graph):
+        durations = {}
+        pending = dict(graph)
+
+        while pending:
+            stage_name = next(
+                name for name, deps in pending.items()
+                if all(dep in durations for dep in deps)
+            )
+            del pending[stage_name]
+            durations[stage_name] = self._run_stage(stage_name, stage_map[stage_name], self.conn)
+
+        return durations
+
+    def _run_parallel(self, stage_map, graph):
+        durations = {}
+        pending = dict(graph)
+        running = {}
+        error = None
+
+        pool = ThreadedConnectionPool(1, self.max_parallel_stages, **self.conn_params)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_parallel_stages) as executor:
+                while pending or running:
+                    if error is None:
+                        ready = [
+                            name for name, deps in pending.items()
+                            if all(dep in durations for dep in deps)
+                        ]
+                        for stage_name in ready:
+                            del pending[stage_name]
+                            future = executor.submit(
+                                self._run_pooled_stage, stage_name, stage_map[stage_name], pool
+                            )
+                            running[future] = stage_name
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage_name = running.pop(future)
+                        try:
+                            durations[stage_name] = future.result()
+                        except Exception as e:
+                            # Não agenda mais nada, mas espera os que já rodam
+                            error = error or e
+        finally:
+            pool.closeall()
+
+        if error is not None:
+            raise error
+        return durations
+
+    def _run_pooled_stage(self, stage_name, stage_class, pool):
+        conn = pool.getconn()
+        try:
+            return self._run_stage(stage_name, stage_class, conn)
+        finally:
+            pool.putconn(conn)
+
+    def _run_stage(self, stage_name, stage_class, conn):
+        start_time = time.time()
+        async_class = ASYNC_STAGES.get(stage_name) if self.async_backend else None
+        if async_class is not None:
+            # Cada estágio assíncrono roda no seu próprio event loop (e thread)
+            metrics = asyncio.run(self._run_async_stage(stage_name, async_class))
+        elif stage_class.partitionable and self.workers > 1 and self.conn_params:
+            metrics = StageMetrics(stage_class.__name__)
+            metrics.partitions = self.workers
+            for partition_metrics in run_partitioned(
+                stage_class, self.profile, load_settings(), self.conn_params, self.workers,
+                self.streams.child(stage_name)
+            ):
+                metrics.merge(partition_metrics)
+        else:
+            stage = stage_class(conn, self.profile, streams=self.streams.child(stage_name))
+            stage.run()
+            metrics = stage.metrics
+
+        duration = time.time() - start_time
+        metrics.elapsed = duration
+        self.stage_metrics[stage_name] = metrics
+
+        # Geradores produzem chaves únicas: rejeição indica dados já existentes
+        rejected = metrics.rows_rejected()
+        if rejected:
+            logger.warning(f"Rows rejected by the database in {stage_name}: {rejected}")
+        shortfall = {table: missing for table, missing in metrics.shortfall.items() if missing}
+        if shortfall:
+            logger.warning(f"Documents short of the profile in {stage_name}: {shortfall}")
+        return duration
+
+    async def _run_async_stage(self, stage_name, stage_class):
+        conn = await async_get_connection(self.conn_params)
+        try:
+            stage = stage_class(conn, self.profile, streams=self.streams.child(stage_name))
+            await stage.run()
+            return stage.metrics
+        finally:
+            await conn.close()
+
+    def _write_report(self):
+        """
+        Write last_run as a JSON report to SEED_METRICS_REPORT (empty disables).
+        """
+        path = load_settings()["METRICS_REPORT"]
+        if not path:
+            return
+
+        settings = load_settings()
+        stages = self.last_run["metrics"]
+        rows_written = sum(sum(m["rows_written"].values()) for m in stages.values())
+        rows_rejected = sum(sum(m["rows_rejected"].values()) for m in stages.values())
+        shortfall = sum(sum(m["shortfall"].values()) for m in stages.values())
+        wall_time = self.last_run["wall_time"]
+        report = {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "environment": settings["ENV"],
+            "profile": asdict(self.profile),
+            "random_seed": self.random_seed,
+            "settings": {
+                key: settings[key]
+                for key in (
+                    "COPY_FORMAT", "DB_BACKEND", "PARALLEL_STAGES", "WORKERS",
+                    "DRY_RUN", "SINK", "PIPELINE_DEPTH", "HTTP_CONCURRENCY", "ADAPTIVE_BATCH",
+                    "BATCH_SIZE_MAX", "MEMORY_LIMIT_MB"
+                )
+            },
+            "wall_time": round(wall_time, 4),
+            "critical_path": self.last_run["critical_path"],
+            "critical_path_time": round(self.last_run["critical_path_time"], 4),
+            "rows_written": rows_written,
+            "rows_rejected": rows_rejected,
+            "shortfall": shortfall,
+            "rows_per_sec": round(rows_written / wall_time, 1) if wall_time > 0 else None,
+            "stages": stages,
+        }
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Metrics report written to {path}")
+
+    @staticmethod
+    def _critical_path(graph, durations):
+        """
+        Longest chain of dependent stages by accumulated duration.
+        """
+        finish = {}
+        previous = {}
+        for stage_name in durations:
+            deps = graph[stage_name]
+            before = max(deps, key=lambda dep: finish[dep], default=None)
+            previous[stage_name] = before
+            finish[stage_name] = durations[stage_name] + (finish[before] if before else 0.0)
+
+        if not finish:
+            return [], 0.0
+
+        last = max(finish, key=finish.get)
+        path = []
+        while last:
+            path.append(last)
+            last = previous[last]
+        path.reverse()
+        return path, finish[path[-1]]
@@ -0,0 +1,390 @@
+import gzip
+import json
+import logging
+import re
+import sqlite3
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from .db_utils import _text_row
+
+try:
+    import zstandard
+except ImportError:  # compressão zstd é opcional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# SEED_SINK: onde os estágios diretos gravam (postgres = conexão psycopg2)
+SINK_KINDS = ("postgres", "copy", "sqlite", "null")
+DEFAULT_SINK_PATHS = {"copy": "seed_output", "sqlite": "seed.sqlite3"}
+
+# Tabelas que os estágios leem mas não semeiam: o DRY_RUN finge que existem
+DRY_RUN_FIXTURES = {"stores": 5, "suppliers": 10}
+
+# Colunas guardadas para as leituras de volta (ProductCache)
+LOOKUP_COLUMNS = {"products": ("sale_price", "cost_price", "category_id")}
+
+# Arquivos COPY: linhas por escrita no gzip e nível de compressão (o texto
+# repetitivo já encolhe bem no nível 1, e a geração é o gargalo)
+COPY_FILE_CHUNK = 5000
+COPY_FILE_COMPRESSLEVEL = 1
+ZSTD_LEVEL = 3
+COPY_FILE_SUFFIXES = {"gzip": ".copy.gz", "zstd": ".copy.zst"}
+# Cache de páginas do SQLite (KiB)
+SQLITE_CACHE_KIB = 64 * 1024
+
+
+
+class NullSink:
+    """
+    Write target that consumes every row and keeps only counters.
+
+    Rows get sequential ids per table, as a fresh database would assign
+    them, so the reads the stages make between writes are answered from
+    what was written in this run. Stages read through `ids()`, `count()`
+    and `lookup()` (via db_utils.select_ids / count_rows and ProductCache);
+    only the LOOKUP_COLUMNS are kept, and any other read raises.
+    """
+
+    def __init__(self, fixtures=None):
+        self.row_counts = defaultdict(int)
+        self.row_counts.update(DRY_RUN_FIXTURES if fixtures is None else fixtures)
+        self.lookups = defaultdict(list)
+
+    def write(self, table, columns, rows, on_conflict=None):
+        """Consume `rows`; returns how many were written."""
+        return len(self.write_returning(table, columns, rows))
+
+    def write_returning(self, table, columns, rows):
+        """Consume `rows`; returns their ids in input order."""
+        first_id = self.row_counts[table] + 1
+        lookup = LOOKUP_COLUMNS.get(table)
+        if lookup:
+            positions = [columns.index(c) for c in lookup]
+            retained = self.lookups[table]
+            count = 0
+            for count, row in enumerate(rows, 1):
+                retained.append((first_id + count - 1, *(row[p] for p in positions)))
+        else:
+            count = sum(1 for _ in rows)
+        self.row_counts[table] += count
+        return range(first_id, first_id + count)
+
+    def ids(self, table, limit=None):
+        """Ids of `table` in id order, at most `limit`."""
+        count = self.row_counts[table]
+        if limit is not None:
+            count = min(count, limit)
+        return list(range(1, count + 1))
+
+    def count(self, table):
+        """Number of rows in `table`."""
+        return self.row_counts[table]
+
+    def lookup(self, table, columns):
+        """(id, *columns) rows of `table` in id order; only LOOKUP_COLUMNS are kept."""
+        if tuple(columns) != LOOKUP_COLUMNS.get(table):
+            raise ValueError(f"O sink não guarda as colunas {list(columns)} de {table}")
+        return list(self.lookups[table])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class CopyFileSink(NullSink):
+    """
+    Writes each table to `<directory>/<table>.copy.gz`, in COPY text format.
+
+    Rows go through the same encoder as copy_insert, prefixed with the id
+    the sink assigned them (so the foreign keys between files hold), and
+    are compressed in chunks of COPY_FILE_CHUNK rows, with gzip or, when
+    `compression="zstd"`, zstandard (`.copy.zst`). Reads are answered
+    like NullSink. `close()` flushes the files and writes `manifest.json`
+    with the columns and row count of each file, which is what
+    `COPY <table> (<columns>) FROM` needs to load them, plus the fixtures
+    the rows reference and any `metadata` given.
+    """
+
+    def __init__(self, directory, fixtures=None, compression="gzip", metadata=None):
+        if compression not in COPY_FILE_SUFFIXES:
+            raise ValueError(f"Compressão não suportada: {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("Compressão zstd requer o pacote zstandard")
+        super().__init__(fixtures)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.fixtures = dict(DRY_RUN_FIXTURES if fixtures is None else fixtures)
+        self.metadata = metadata or {}
+        self.tables = {}
+        self._files = {}
+
+    def write_returning(self, table, columns, rows):
+        file = self._open(table, ["id", *columns])
+        first_id = self.row_counts[table] + 1
+        return super().write_returning(table, columns, self._encoded(file, first_id, rows))
+
+    def close(self):
+        for file in self._files.values():
+            file.close()
+        self._files.clear()
+        for table, entry in self.tables.items():
+            entry["rows"] = self.row_counts[table]
+        manifest = {
+            **self.metadata,
+            "format": "copy-text",
+            "compression": self.compression,
+            "fixtures": self.fixtures,
+            "tables": self.tables,
+        }
+        with open(self.directory / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        logger.info(f"Wrote {len(self.tables)} tables to {self.directory}")
+
+    def _open(self, table, columns):
+        entry = self.tables.get(table)
+        if entry is None:
+            entry = self.tables[table] = {
+                "file": table + COPY_FILE_SUFFIXES[self.compression],
+                "columns": columns,
+                "rows": 0,
+            }
+        elif entry["columns"] != columns:
+            raise ValueError(f"Colunas diferentes para {table}: {entry['columns']} x {columns}")
+        if table not in self._files:
+            # Depois de um close() a tabela continua no mesmo arquivo: gzip e
+            # zstd aceitam membros/frames concatenados
+            mode = "ab" if entry["rows"] else "wb"
+            self._files[table] = open_copy_file(self.directory / entry["file"], mode, self.compression)
+        return self._files[table]
+
+    @staticmethod
+    def _encoded(file, first_id, rows):
+        chunk = []
+        for row_id, row in enumerate(rows, first_id):
+            chunk.append(_text_row((row_id, *row)))
+            if len(chunk) >= COPY_FILE_CHUNK:
+                file.write(b"".join(chunk))
+                chunk.clear()
+            yield row
+        if chunk:
+            file.write(b"".join(chunk))
+
+
+class SQLiteSink:
+    """
+    Writes to a local SQLite database, for quick runs without PostgreSQL.
+
+    Tables are created on first write with an INTEGER PRIMARY KEY id plus
+    untyped columns (new columns are added as they show up), and an
+    `on_conflict` target gets a unique index so the same ON CONFLICT clause
+    the PostgreSQL path uses keeps its meaning. Each write is one
+    executemany over a prepared INSERT, inside the stage's transaction,
+    with synchronous writes off. `ids()`, `count()` and `lookup()` run as
+    SQL against the database.
+    """
+
+    def __init__(self, path, fixtures=None):
+        self.path = Path(path)
+        self.fixtures = DRY_RUN_FIXTURES if fixtures is None else fixtures
+        self._db = None
+        self._columns = {}
+
+    @property
+    def db(self):
+        if self._db is None:
+            _register_sqlite_adapters()
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode = WAL")
+            self._db.execute("PRAGMA synchronous = OFF")
+            self._db.execute(f"PRAGMA cache_size = {-SQLITE_CACHE_KIB}")
+            for table, count in self.fixtures.items():
+                self._ensure_table(table, [])
+                existing = self._db.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+                self._db.executemany(
+                    f"INSERT INTO {table} (id) VALUES (?)",
+                    ((row_id,) for row_id in range(existing + 1, count + 1))
+                )
+            self._db.commit()
+        return self._db
+
+    def write(self, table, columns, rows, on_conflict=None):
+        """Insert `rows`; returns how many landed in `table`."""
+        self._ensure_table(table, columns)
+        query = self._insert_query(table, columns)
+        if on_conflict:
+            self._ensure_unique(table, on_conflict)
+            query += f" ON CONFLICT {on_conflict}"
+        before = self.db.total_changes
+        self.db.executemany(query, rows)
+        return self.db.total_changes - before
+
+    def write_returning(self, table, columns, rows):
+        """Insert `rows`; returns their ids in input order."""
+        self._ensure_table(table, columns)
+        # Sem conflitos e com um só escritor, o rowid segue max(id) + 1
+        first_id = self.db.execute(f"SELECT coalesce(max(id), 0) + 1 FROM {table}").fetchone()[0]
+        cursor = self.db.executemany(self._insert_query(table, columns), rows)
+        return range(first_id, first_id + cursor.rowcount)
+
+    def ids(self, table, limit=None):
+        """Ids of `table` in id order, at most `limit`."""
+        self._ensure_table(table, [])
+        query = f"SELECT id FROM {table} ORDER BY id"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        return [row[0] for row in self.db.execute(query)]
+
+    def count(self, table):
+        """Number of rows in `table`."""
+        self._ensure_table(table, [])
+        return self.db.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+    def lookup(self, table, columns):
+        """(id, *columns) rows of `table` in id order."""
+        self._ensure_table(table, columns)
+        return self.db.execute(f"SELECT id, {', '.join(columns)} FROM {table} ORDER BY id").fetchall()
+
+    def commit(self):
+        if self._db is not None:
+            self._db.commit()
+
+    def rollback(self):
+        if self._db is not None:
+            self._db.rollback()
+
+    def close(self):
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+            logger.info(f"SQLite database written to {self.path}")
+
+    def _insert_query(self, table, columns):
+        placeholders = ",".join("?" * len(columns))
+        return f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
+
+    def _ensure_table(self, table, columns):
+        known = self._columns.get(table)
+        if known is None:
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY)")
+            known = self._columns[table] = {
+                row[1] for row in self.db.execute(f"PRAGMA table_info({table})")
+            }
+        for column in columns:
+            if column not in known:
+                self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column}")
+                known.add(column)
+
+    def _ensure_unique(self, table, on_conflict):
+        match = re.match(r"\s*\(([^)]*)\)", on_conflict)
+        if not match:
+            return
+        columns = [c.strip() for c in match.group(1).split(",")]
+        self.db.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS uq_{table}_{'_'.join(columns)} "
+            f"ON {table} ({', '.join(columns)})"
+        )
+
+
+def create_sink(settings):
+    """
+    Sink selected by SEED_SINK / DRY_RUN, or None to write to PostgreSQL.
+    """
+    kind = "null" if settings["DRY_RUN"] else settings["SINK"]
+    if kind not in SINK_KINDS:
+        raise ValueError(f"SEED_SINK inválido: {kind} (use {', '.join(SINK_KINDS)})")
+    path = settings["SINK_PATH"] or DEFAULT_SINK_PATHS.get(kind)
+    if kind == "copy":
+        return CopyFileSink(path)
+    if kind == "sqlite":
+        return SQLiteSink(path)
+    if kind == "null":
+        return NullSink()
+    return None
+
+
+def uses_database(settings):
+    """Whether the run writes to PostgreSQL and needs a connection."""
+    return not settings["DRY_RUN"] and settings["SINK"] == "postgres"
+
+
+def open_copy_file(path, mode, compression):
+    """
+    Binary file object over a compressed COPY file (`mode` "rb", "wb" or "ab").
+    """
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=COPY_FILE_COMPRESSLEVEL)
+    if compression != "zstd":
+        raise ValueError(f"Compressão não suportada: {compression}")
+    if zstandard is None:
+        raise RuntimeError("Arquivos .zst requerem o pacote zstandard")
+    raw = open(path, mode)
+    if mode == "rb":
+        return zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw)
+
+
+def _register_sqlite_adapters():
+    # Os adaptadores padrão de data do sqlite3 estão obsoletos (3.12+)
+    sqlite3.register_adapter(date, date.isoformat)
+    sqlite3.register_adapter(datetime, datetime.isoformat)
+    sqlite3.register_adapter(Decimal, str)
+
+
+class SinkConnection:
+    """
+    Connection stand-in handed to the stages when writing to a sink.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+
+    def cursor(self, name=None):
+        return SinkCursor(self)
+
+    def commit(self):
+        self.sink.commit()
+
+    def rollback(self):
+        self.sink.rollback()
+
+    def close(self):
+        self.sink.close()
+
+
+class SinkCursor:
+    """
+    Cursor stand-in: db_utils writes and reads through `sink`. Sinks do not
+    accept SQL, so execute() raises TypeError for every statement instead
+    of guessing an answer.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.sink = connection.sink
+        self.query = b""
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, query, vars=None):
+        raise TypeError(
+            f"Sinks não aceitam SQL ({type(self.sink).__name__}); use select_ids, "
+            f"count_rows ou ProductCache: {' '.join(query.split())[:80]}"
+        )
+
+    def close(self):
+        pass
@@ -0,0 +1,92 @@
+class StockLedger:
+    """
+    In-memory stock per (store, product) for the stock-aware API stages.
+
+    Each store keeps its in-stock products in an array plus an index map, so
+    picking k random products and dropping a product that ran out are O(k)
+    and O(1) (swap-remove); stores with any stock are kept the same way.
+    This replaces the per-transaction scans over the whole stock map.
+    """
+
+    def __init__(self):
+        self._quantity = {}  # store_id -> {product_id: quantity}
+        self._products = {}  # store_id -> [product_id] com quantidade > 0
+        self._positions = {}  # store_id -> {product_id: índice em _products}
+        self._stores = []
+        self._store_positions = {}
+
+    def __len__(self):
+        return sum(len(products) for products in self._products.values())
+
+    @property
+    def stores(self):
+        """
+        Stores that still have any product in stock (do not mutate).
+        """
+        return self._stores
+
+    def quantity(self, store_id, product_id):
+        return self._quantity.get(store_id, {}).get(product_id, 0)
+
+    def available(self, store_id):
+        """
+        Number of distinct in-stock products at `store_id`.
+        """
+        return len(self._products.get(store_id, ()))
+
+    def add(self, store_id, product_id, quantity):
+        if quantity <= 0:
+            return
+        quantities = self._quantity.setdefault(store_id, {})
+        current = quantities.get(product_id, 0)
+        quantities[product_id] = current + quantity
+        if current <= 0:
+            self._insert(store_id, product_id)
+
+    def remove(self, store_id, product_id, quantity):
+        quantities = self._quantity[store_id]
+        quantities[product_id] -= quantity
+        if quantities[product_id] <= 0:
+            self._discard(store_id, product_id)
+
+    def sample(self, store_id, k, rng):
+        """
+        Pick `k` distinct in-stock products at `store_id` as (product_id, quantity).
+        """
+        products = self._products.get(store_id, [])
+        k = min(k, len(products))
+        if k * 2 > len(products):
+            picked = rng.sample(range(len(products)), k)
+        else:
+            # Poucos itens de um estoque grande: sorteia índices sem copiar a lista
+            picked = []
+            seen = set()
+            while len(picked) < k:
+                index = rng.randrange(len(products))
+                if index not in seen:
+                    seen.add(index)
+                    picked.append(index)
+
+        quantities = self._quantity.get(store_id, {})
+        return [(products[i], quantities[products[i]]) for i in picked]
+
+    def _insert(self, store_id, product_id):
+        products = self._products.setdefault(store_id, [])
+        if not products:
+            self._store_positions[store_id] = len(self._stores)
+            self._stores.append(store_id)
+        self._positions.setdefault(store_id, {})[product_id] = len(products)
+        products.append(product_id)
+
+    def _discard(self, store_id, product_id):
+        _swap_remove(self._products[store_id], self._positions[store_id], product_id)
+        if not self._products[store_id]:
+            _swap_remove(self._stores, self._store_positions, store_id)
+
+
+def _swap_remove(items, positions, item):
+    index = positions.pop(item)
+    last = items.pop()
+    if last != item:
+        items[index] = last
+        positions[last] = index
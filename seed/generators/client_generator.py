@@ -1,47 +1,244 @@
 import random
 import hashlib
-from typing import List, Dict
+from typing import List, Dict, Iterator
 # from ..config.seed_settings import CURRENT_PROFILE
 from ..config.seed_settings import load_settings
+from ..core.column_batch import ColumnBatch, rebatch
+from ..core.random_streams import CHUNK_ROWS, RandomStreams, chunk_spans, draw_integers
+from .permutation import FeistelPermutation
+
+try:
+    import numpy as np
+except ImportError:  # modo vetorizado é opcional
+    np = None
+
+CLIENT_COLUMNS = ["name", "cpf_cnpj", "email", "phone", "address"]
+
+# Pesos dos dígitos verificadores do CPF
+_CPF_WEIGHTS_1 = [10, 9, 8, 7, 6, 5, 4, 3, 2]
+_CPF_WEIGHTS_2 = [11, 10, 9, 8, 7, 6, 5, 4, 3, 2]
+
+# Os 9 dígitos-base do CPF: o cliente i recebe a base permutation(i)
+CPF_SPACE = 10 ** 9
+DEFAULT_CPF_KEY = 0x5E3D_C0FF_EE15_CAFE
+
 class ClientGenerator:
-    def __init__(self):
+    def __init__(
+        self,
+        rng: random.Random | None = None,
+        vectorized: bool | None = None,
+        cpf_key: int = DEFAULT_CPF_KEY,
+        streams: RandomStreams | None = None
+    ):
+        self.rng = rng or random.Random()
+        # Sorteios por bloco de índices (ver RandomStreams); sem streams,
+        # derivados do rng
+        self.streams = streams or RandomStreams(self.rng.getrandbits(64))
+        # Mesma chave em todas as partições: CPFs únicos por construção
+        self.cpf_permutation = FeistelPermutation(CPF_SPACE, cpf_key)
+        # Por padrão usa NumPy quando estiver instalado
+        self.vectorized = np is not None if vectorized is None else vectorized
+        if self.vectorized and np is None:
+            raise RuntimeError("O modo vetorizado requer o NumPy: pip install numpy")
         self.first_names = ["João", "Maria", "José", "Ana", "Pedro", "Paula", "Lucas", "Julia", "Carlos", "Beatriz", "Rafael", "Mariana", "Gabriel", "Larissa", "Felipe", "Camila"]
         self.last_names = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes", "Ribeiro", "Carvalho", "Martins", "Rocha", "Dias", "Nunes"]
         self.domains = ["gmail.com", "outlook.com", "hotmail.com", "empresa.com.br", "yahoo.com.br", "uol.com.br"]
+        self._tables = None
 
     def generate_cpf(self) -> str:
         """Gera um CPF fictício formatado."""
-        cpf = [random.randint(0, 9) for _ in range(9)]
+        cpf = [self.rng.randint(0, 9) for _ in range(9)]
         for _ in range(2):
             val = sum([(len(cpf) + 1 - i) * v for i, v in enumerate(cpf)]) % 11
             cpf.append(11 - val if val > 1 else 0)
         return "{}{}{}.{}{}{}.{}{}{}-{}{}".format(*cpf)
 
+    def cpf_for_index(self, i: int) -> str:
+        """CPF do cliente de índice `i`: índices distintos, CPFs distintos."""
+        base = self.cpf_permutation(i)
+        cpf = [base // 10 ** power % 10 for power in range(8, -1, -1)]
+        for weights in (_CPF_WEIGHTS_1, _CPF_WEIGHTS_2):
+            val = sum(w * v for w, v in zip(weights, cpf)) % 11
+            cpf.append(11 - val if val > 1 else 0)
+        return "{}{}{}.{}{}{}.{}{}{}-{}{}".format(*cpf)
+
     def generate(self, count: int = None) -> List[Dict]:
         count = count or getattr(load_settings()["CURRENT_PROFILE"], 'clients_count', 100)
-        clients = []
-        
-        for i in range(count):
-            first = random.choice(self.first_names)
-            last = random.choice(self.last_names)
-            segundo_last = random.choice(self.last_names)
-
-            if last == segundo_last:
-                name = f"{first} {last}"
-            else:
-                name = f"{first} {last} {segundo_last}"
-
-            
-            email = f"{first.lower()}.{last.lower()}{i}@{random.choice(self.domains)}"
-            cpf = self.generate_cpf()
-            phone = f"(11) 9{random.randint(7000, 9999)}-{random.randint(1000, 9999)}"
-            address = f"Rua {random.choice(self.last_names)}, {random.randint(1, 2000)} - Bairro {random.choice(self.first_names)}"
-            
-            clients.append({
-                "name": name,
-                "cpf_cnpj": cpf,
-                "email": email,
-                "phone": phone,
-                "address": address
-            })
-        return clients
+        return [client for batch in self.iter_batches(count, count) for client in batch]
+
+    def iter_batches(self, count: int = None, batch_size: int = 500, start: int = 0) -> Iterator[List[Dict]]:
+        """
+        Gera os clientes em lotes de `batch_size`, sem manter todos em memória.
+        `start` é o índice do primeiro cliente (partições paralelas): o
+        cliente `i` é o mesmo qualquer que seja a faixa pedida.
+        """
+        for batch in self.iter_column_batches(count, batch_size, start):
+            yield batch.to_dicts()
+
+    def iter_column_batches(self, count: int = None, batch_size: int = 500, start: int = 0) -> Iterator[ColumnBatch]:
+        """
+        Mesmo que iter_batches, mas cada lote é um ColumnBatch (CLIENT_COLUMNS),
+        pronto para o bulk_insert via batch.rows().
+        """
+        if count is None:
+            count = getattr(load_settings()["CURRENT_PROFILE"], 'clients_count', 100)
+        if start + count > CPF_SPACE:
+            raise ValueError(f"No máximo {CPF_SPACE} clientes com CPFs únicos")
+
+        pieces = (
+            self._build_chunk(chunk).slice(lo, hi)
+            for chunk, lo, hi in chunk_spans(start, count)
+        )
+        return rebatch(pieces, batch_size)
+
+    def _build_chunk(self, chunk: int) -> ColumnBatch:
+        # O bloco inteiro sai do seu próprio stream: o recorte não muda os sorteios
+        rng = self.streams.chunk(chunk)
+        chunk_start = chunk * CHUNK_ROWS
+        chunk_end = min(chunk_start + CHUNK_ROWS, CPF_SPACE)
+        draws = self._draw_columns(rng, chunk_end - chunk_start)
+        if self.vectorized:
+            data = self._build_columns(chunk_start, chunk_end, draws)
+        else:
+            data = self._format_columns(chunk_start, chunk_end, draws)
+        return ColumnBatch(CLIENT_COLUMNS, data)
+
+    def _draw_columns(self, rng: random.Random, n: int) -> Dict[str, List]:
+        """
+        Sorteios do bloco, coluna a coluna e sempre na mesma ordem, pelo
+        draw_integers: os dois modos consomem o stream igual e geram os
+        mesmos clientes.
+        """
+        n_first, n_last, n_domains = len(self.first_names), len(self.last_names), len(self.domains)
+        columns = [
+            ("first", 0, n_first),
+            ("last", 0, n_last),
+            ("second_last", 0, n_last),
+            ("domain", 0, n_domains),
+            ("street", 0, n_last),
+            ("number", 1, 2001),
+            ("district", 0, n_first),
+            ("phone_prefix", 7000, 10000),
+            ("phone_suffix", 1000, 10000),
+        ]
+        return {
+            name: draw_integers(rng, n, low, high, self.vectorized)
+            for name, low, high in columns
+        }
+
+    def _format_columns(self, batch_start: int, batch_end: int, draws: Dict[str, List]) -> Dict[str, List]:
+        # Modo sem NumPy: as mesmas colunas montadas em Python puro
+        first_names, last_names, domains = self.first_names, self.last_names, self.domains
+        names = []
+        emails = []
+        for i, first, last, second_last, domain in zip(
+            range(batch_start, batch_end),
+            draws["first"], draws["last"], draws["second_last"], draws["domain"]
+        ):
+            first, last, second_last = first_names[first], last_names[last], last_names[second_last]
+            names.append(f"{first} {last}" if last == second_last else f"{first} {last} {second_last}")
+            emails.append(f"{first.lower()}.{last.lower()}{i}@{domains[domain]}")
+
+        return {
+            "name": names,
+            "cpf_cnpj": [self.cpf_for_index(i) for i in range(batch_start, batch_end)],
+            "email": emails,
+            "phone": [
+                f"(11) 9{prefix}-{suffix}"
+                for prefix, suffix in zip(draws["phone_prefix"], draws["phone_suffix"])
+            ],
+            "address": [
+                f"Rua {last_names[street]}, {number} - Bairro {first_names[district]}"
+                for street, number, district in zip(draws["street"], draws["number"], draws["district"])
+            ],
+        }
+
+    # =========================
+    # MODO VETORIZADO (NumPy)
+    # =========================
+    def _build_columns(self, batch_start: int, batch_end: int, draws: Dict) -> Dict[str, List]:
+        """
+        Gera um lote inteiro coluna a coluna: sorteios em arrays, CPFs pela
+        permutação dos índices, dígitos verificadores em álgebra de matrizes e CPF/telefone montados
+        como arrays de bytes de largura fixa.
+        """
+        if self._tables is None:
+            self._tables = self._lookup_tables()
+        names, email_prefixes, first_names, last_names, domains = self._tables
+        n_last = len(self.last_names)
+
+        first, last = draws["first"], draws["last"]
+        name = names[(first * n_last + last) * n_last + draws["second_last"]]
+
+        prefixes = email_prefixes[first * n_last + last].tolist()
+        domain = domains[draws["domain"]].tolist()
+        email = [
+            f"{prefix}{i}@{d}"
+            for prefix, i, d in zip(prefixes, range(batch_start, batch_end), domain)
+        ]
+
+        street = last_names[draws["street"]].tolist()
+        number = draws["number"].tolist()
+        district = first_names[draws["district"]].tolist()
+        address = [
+            f"Rua {s}, {num} - Bairro {d}"
+            for s, num, d in zip(street, number, district)
+        ]
+
+        return {
+            "name": name.tolist(),
+            "cpf_cnpj": _vector_cpfs(self.cpf_permutation.apply(np.arange(batch_start, batch_end))),
+            "email": email,
+            "phone": _vector_phones(draws["phone_prefix"], draws["phone_suffix"]),
+            "address": address,
+        }
+
+    def _lookup_tables(self):
+        # Todas as combinações de nome (16 x 16 x 16) e prefixo de e-mail
+        names = [
+            f"{first} {last}" if last == second else f"{first} {last} {second}"
+            for first in self.first_names
+            for last in self.last_names
+            for second in self.last_names
+        ]
+        email_prefixes = [
+            f"{first.lower()}.{last.lower()}"
+            for first in self.first_names
+            for last in self.last_names
+        ]
+        return (
+            np.array(names, dtype=object),
+            np.array(email_prefixes, dtype=object),
+            np.array(self.first_names, dtype=object),
+            np.array(self.last_names, dtype=object),
+            np.array(self.domains, dtype=object),
+        )
+
+def _vector_cpfs(bases) -> List[str]:
+    n = len(bases)
+    digits = np.empty((n, 11), dtype=np.int64)
+    digits[:, :9] = bases.astype(np.int64)[:, None] // 10 ** np.arange(8, -1, -1) % 10
+    for position, weights in ((9, _CPF_WEIGHTS_1), (10, _CPF_WEIGHTS_2)):
+        remainder = (digits[:, :position] @ np.array(weights)) % 11
+        digits[:, position] = np.where(remainder > 1, 11 - remainder, 0)
+
+    # "XXX.XXX.XXX-XX" como 14 bytes ASCII por linha
+    chars = np.empty((n, 14), dtype=np.uint8)
+    chars[:, [0, 1, 2, 4, 5, 6, 8, 9, 10, 12, 13]] = digits + ord("0")
+    chars[:, [3, 7]] = ord(".")
+    chars[:, 11] = ord("-")
+    return _ascii_rows(chars)
+
+def _vector_phones(prefixes, suffixes) -> List[str]:
+    # "(11) 9XXXX-XXXX" com XXXX em 7000-9999 e 1000-9999
+    chars = np.empty((len(prefixes), 15), dtype=np.uint8)
+    chars[:, :6] = np.frombuffer(b"(11) 9", dtype=np.uint8)
+    chars[:, 10] = ord("-")
+    for offset, block in ((6, prefixes), (11, suffixes)):
+        for k, power in enumerate((1000, 100, 10, 1)):
+            chars[:, offset + k] = block // power % 10 + ord("0")
+    return _ascii_rows(chars)
+
+def _ascii_rows(chars) -> List[str]:
+    width = chars.shape[1]
+    return np.ascontiguousarray(chars).view(f"S{width}").ravel().astype(f"U{width}").tolist()
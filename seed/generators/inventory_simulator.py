@@ -0,0 +1,190 @@
+import heapq
+from datetime import datetime, timedelta
+
+from ..core.stock_ledger import StockLedger
+
+CENTRAL_STORE_ID = 1
+HISTORY_DAYS = 180
+SALE_MAX_QUANTITY = 5
+
+# Documento que abastece -> documento que consome o que ele abasteceu
+RESTOCKS = {"entry": "distribution", "distribution": "sale"}
+
+
+class InventorySimulator:
+    """
+    Replays entries, distributions and sales as one chronological stream.
+
+    Entries stock the central store, distributions move stock from it to the
+    other stores and sales consume the stores' stock, all tracked in
+    StockLedgers while the documents are generated. Every document is
+    therefore consistent with the ones before it, and no stock snapshot has
+    to be read from the API or the database.
+
+    `events()` yields ("entry" | "distribution" | "sale", payload) with the
+    same payloads the *API stages send. A document that finds no stock to
+    move is deferred and retried right after the next document that
+    supplies it (an entry for distributions, a distribution for sales),
+    dated at that document, so the profile counts are met whenever there is
+    stock left to meet them. Whatever is still deferred at the end is left
+    in `shortfall`.
+    """
+
+    def __init__(
+        self,
+        products,
+        supplier_ids,
+        store_ids,
+        client_ids,
+        rng,
+        expiration_categories=frozenset()
+    ):
+        self.products = products
+        self.supplier_ids = supplier_ids
+        self.target_stores = [sid for sid in store_ids if sid != CENTRAL_STORE_ID]
+        self.client_ids = client_ids
+        self.rng = rng
+        self.expiration_categories = expiration_categories
+        self.central = StockLedger()
+        self.stores = StockLedger()
+        self.shortfall = {"distribution": 0, "sale": 0}
+        self._builders = {
+            "entry": self._entry,
+            "distribution": self._distribution,
+            "sale": self._sale,
+        }
+
+    def events(self, entries_count, distributions_count, sales_count):
+        now = datetime.utcnow()
+        start = now - timedelta(days=HISTORY_DAYS)
+        timeline = heapq.merge(
+            self._timeline("entry", entries_count),
+            self._timeline("distribution", distributions_count),
+            self._timeline("sale", sales_count),
+        )
+        pending = {"distribution": 0, "sale": 0}
+
+        for offset, kind in timeline:
+            yield from self._emit(kind, start + timedelta(days=offset * HISTORY_DAYS), now, pending)
+        self.shortfall = pending
+
+    def _emit(self, kind, date, now, pending):
+        payload = self._builders[kind](date, now)
+        if payload is None:
+            pending[kind] += 1
+            return False
+        yield kind, payload
+
+        # O estoque acabou de chegar: refaz os documentos que ficaram sem ele
+        consumer = RESTOCKS.get(kind)
+        while consumer and pending[consumer]:
+            pending[consumer] -= 1
+            if not (yield from self._emit(consumer, date, now, pending)):
+                break
+        return True
+
+    def _timeline(self, kind, count):
+        # Instantes uniformes no período, já ordenados para o merge
+        return ((offset, kind) for offset in sorted(self.rng.random() for _ in range(count)))
+
+    # =========================
+    # DOCUMENTOS
+    # =========================
+    def _entry(self, entry_date, now):
+        rng = self.rng
+        selected = rng.sample(self.products.ids, min(rng.randint(3, 10), len(self.products)))
+
+        items = []
+        total_value = 0.0
+        for product_id in selected:
+            quantity = rng.randint(5, 50)
+            unit_price = self.products.sale_price[product_id]
+            total_price = round(quantity * unit_price, 2)
+            total_value += total_price
+
+            expiration_date = None
+            if self.products.category_id[product_id] in self.expiration_categories:
+                expiration_date = now + timedelta(days=rng.randint(90, 720))
+
+            items.append({
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "total_price": total_price,
+                "lot_number": f"LOT-{rng.randint(1000, 9999)}",
+                "expiration_date": expiration_date.isoformat() if expiration_date else None,
+                "received_at": entry_date.isoformat(),
+            })
+            self.central.add(CENTRAL_STORE_ID, product_id, quantity)
+
+        return {
+            "supplier_id": rng.choice(self.supplier_ids),
+            "entry_date": entry_date.isoformat(),
+            "invoice_number": f"NF-{rng.randint(100000, 999999)}",
+            "total_value": round(total_value, 2),
+            "status": "completed",
+            "items": items,
+        }
+
+    def _distribution(self, distribution_date, now):
+        rng = self.rng
+        to_store_id = rng.choice(self.target_stores)
+
+        items = []
+        for product_id, available_qty in self.central.sample(CENTRAL_STORE_ID, rng.randint(3, 8), rng):
+            quantity = rng.randint(1, available_qty)
+            items.append({
+                "product_id": product_id,
+                "quantity": quantity,
+                "registered_at": distribution_date.isoformat(),
+            })
+            self.central.remove(CENTRAL_STORE_ID, product_id, quantity)
+            self.stores.add(to_store_id, product_id, quantity)
+
+        if not items:
+            return None
+        return {
+            "from_store_id": CENTRAL_STORE_ID,
+            "to_store_id": to_store_id,
+            "distribution_date": distribution_date.isoformat(),
+            "status": "completed",
+            "items": items,
+        }
+
+    def _sale(self, sale_date, now):
+        rng = self.rng
+        if not self.stores.stores:
+            return None
+        store_id = rng.choice(self.stores.stores)
+        num_items = rng.randint(1, min(5, self.stores.available(store_id)))
+
+        items = []
+        total_value = 0.0
+        for product_id, available_qty in self.stores.sample(store_id, num_items, rng):
+            quantity = rng.randint(1, min(SALE_MAX_QUANTITY, available_qty))
+            unit_price = self.products.sale_price[product_id]
+            total_price = round(unit_price * quantity, 2)
+            total_value += total_price
+            items.append({
+                "product_id": product_id,
+                "quantity": quantity,
+                "unit_price": unit_price,
+                "total_price": total_price,
+                "removed_at": sale_date.isoformat(),
+            })
+            self.stores.remove(store_id, product_id, quantity)
+
+        if not items:
+            return None
+        return {
+            "client_id": rng.choice(self.client_ids),
+            "store_id": store_id,
+            "sale_date": sale_date.isoformat(),
+            "delivery_type": rng.choice(["pickup", "delivery"]),
+            "tracking_code": f"TRK-{rng.randint(100000, 999999)}",
+            "status": "completed",
+            "predicted_delivery": sale_date.isoformat(),
+            "delivered_at": sale_date.isoformat(),
+            "total_value": round(total_value, 2),
+            "items": items,
+        }
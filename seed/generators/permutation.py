@@ -0,0 +1,81 @@
+try:
+    import numpy as np
+except ImportError:  # modo vetorizado é opcional
+    np = None
+
+_MASK64 = (1 << 64) - 1
+_MIX = 0x9E3779B97F4A7C15
+
+
+class FeistelPermutation:
+    """
+    Keyed bijection of [0, size) onto itself.
+
+    A balanced Feistel network over the smallest even number of bits that
+    covers `size`, with cycle walking for outputs >= size: distinct inputs
+    always give distinct outputs, so index -> permutation(index) hands out
+    unique, random-looking keys without tracking the ones already used.
+    The same key gives the same permutation in every process.
+    """
+
+    def __init__(self, size: int, key: int, rounds: int = 4):
+        if size < 2:
+            raise ValueError("O domínio da permutação precisa de ao menos 2 valores")
+        self.size = size
+        half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        self._round_keys = _round_keys(key, rounds)
+
+    def __call__(self, value: int) -> int:
+        if not 0 <= value < self.size:
+            raise ValueError(f"Valor fora do domínio da permutação: {value}")
+        value = self._encrypt(value)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def apply(self, values):
+        """Vectorized __call__ over a NumPy integer array (requires NumPy)."""
+        values = np.asarray(values, dtype=np.uint64)
+        if values.size and int(values.max()) >= self.size:
+            raise ValueError("Valores fora do domínio da permutação")
+        result = self._encrypt_array(values)
+        pending = np.flatnonzero(result >= self.size)
+        while pending.size:
+            result[pending] = self._encrypt_array(result[pending])
+            pending = pending[result[pending] >= self.size]
+        return result
+
+    def _encrypt(self, value: int) -> int:
+        bits, mask = self._half_bits, self._half_mask
+        left, right = value >> bits, value & mask
+        for round_key in self._round_keys:
+            mixed = (((right ^ round_key) * _MIX) & _MASK64) >> (64 - bits)
+            left, right = right, left ^ mixed
+        return (left << bits) | right
+
+    def _encrypt_array(self, values):
+        bits = np.uint64(self._half_bits)
+        mask = np.uint64(self._half_mask)
+        shift = np.uint64(64 - self._half_bits)
+        mix = np.uint64(_MIX)
+        left, right = values >> bits, values & mask
+        for round_key in self._round_keys:
+            # Multiplicação em uint64 com overflow modular, como no escalar
+            mixed = ((right ^ np.uint64(round_key)) * mix) >> shift
+            left, right = right, left ^ mixed
+        return (left << bits) | right
+
+
+def _round_keys(key: int, rounds: int):
+    # splitmix64: chaves de rodada independentes a partir de uma chave só
+    keys = []
+    state = key & _MASK64
+    for _ in range(rounds):
+        state = (state + _MIX) & _MASK64
+        z = state
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        keys.append(z ^ (z >> 31))
+    return keys
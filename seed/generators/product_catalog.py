@@ -0,0 +1,109 @@
+import json
+from array import array
+from math import prod
+from typing import Dict, List, Tuple
+
+# Atributos sintéticos que estendem o catálogo além das combinações do
+# products_base.json (ordem = ordem no nome do produto)
+SYNTHETIC_VARIATIONS = {
+    "linha": ["Essencial", "Plus", "Pro", "Max", "Premium", "Ultra"],
+    "acabamento": ["Fosco", "Brilhante", "Texturizado", "Metálico"],
+}
+SERIES_ATTRIBUTE = "serie"
+
+
+class ProductCatalog:
+    """
+    Indexed view of every product derivable from the base catalog.
+
+    The catalog is a mixed-radix number system: the lowest digit is the
+    category (so any index range is spread evenly across categories), then
+    the position inside the category's base combinations, i.e. (subcategory,
+    base product, variation combo), and the remaining quotient selects a tier
+    of synthetic attributes (SYNTHETIC_VARIATIONS, then an open-ended
+    "Série N"). Tier 0 is the base catalog itself.
+
+    `catalog[i]` maps any non-negative index to (base_name, attributes,
+    category) in O(1) and distinct indexes map to distinct product names,
+    so a range of indexes can be generated by any worker without
+    coordination and without materializing the catalog.
+    """
+
+    def __init__(self, base_data: Dict, max_variations_per_product: int = 40):
+        self.categories = list(base_data)
+        # Por categoria: bases (nome, chaves, radices, offset) e, para cada
+        # posição da categoria, o índice da base que a contém
+        self._bases: List[List[Tuple[str, List[str], List[List[str]], int]]] = []
+        self._owners: List[array] = []
+
+        for category_data in base_data.values():
+            bases = []
+            owners = array("I")
+            for subcategory_data in category_data.values():
+                variations = subcategory_data.get("variations", {})
+                keys = list(variations)
+                values = [variations[k] for k in keys]
+                combos = min(prod(len(v) for v in values), max_variations_per_product)
+                for base_name in subcategory_data.get("base_products", []):
+                    owners.extend([len(bases)] * combos)
+                    bases.append((base_name, keys, values, len(owners) - combos))
+            if not bases:
+                raise ValueError("Categoria sem produtos base no catálogo")
+            self._bases.append(bases)
+            self._owners.append(owners)
+
+        self._synthetic_keys = list(SYNTHETIC_VARIATIONS)
+        self._synthetic_values = [SYNTHETIC_VARIATIONS[k] for k in self._synthetic_keys]
+
+    @classmethod
+    def load(cls, base_file, max_variations_per_product: int = 40) -> "ProductCatalog":
+        """
+        Catalog for the JSON at `base_file`.
+
+        Building it only walks the base catalog once (well under a
+        millisecond for products_base.json), so it is not cached.
+        """
+        with open(base_file, "r", encoding="utf-8") as f:
+            return cls(json.load(f), max_variations_per_product)
+
+    @property
+    def base_size(self) -> int:
+        """Number of products in tier 0 (the base catalog combinations)."""
+        return sum(len(owners) for owners in self._owners)
+
+    def category(self, index: int) -> str:
+        """Category of `catalog[index]`, without decoding the product."""
+        return self.categories[index % len(self.categories)]
+
+    def __getitem__(self, index: int) -> Tuple[str, Dict[str, str], str]:
+        if index < 0:
+            raise IndexError("Índice de produto negativo")
+
+        index, category_index = divmod(index, len(self.categories))
+        owners = self._owners[category_index]
+        tier, position = divmod(index, len(owners))
+
+        base_name, keys, values, offset = self._bases[category_index][owners[position]]
+        attributes = _decode(position - offset, keys, values)
+        if tier:
+            attributes.update(self._synthetic(tier - 1))
+        return base_name, attributes, self.categories[category_index]
+
+    def _synthetic(self, value: int) -> Dict[str, str]:
+        attributes = {}
+        for key, options in zip(self._synthetic_keys, self._synthetic_values):
+            value, digit = divmod(value, len(options))
+            attributes[key] = options[digit]
+        if value:
+            attributes[SERIES_ATTRIBUTE] = f"Série {value}"
+        return attributes
+
+
+def _decode(value: int, keys: List[str], values: List[List[str]]) -> Dict[str, str]:
+    # Mesma ordem do itertools.product: a última variação varia mais rápido
+    digits = {}
+    for key, options in zip(reversed(keys), reversed(values)):
+        value, digit = divmod(value, len(options))
+        digits[key] = options[digit]
+    return {key: digits[key] for key in keys}
+
@@ -1,54 +1,40 @@
-import json
-import random
-from itertools import product, islice
 from datetime import datetime, timedelta
 from typing import Dict, List, Iterator
 from seed.core.path_utils import resource_path
 
-from pricing import generate_prices
+from pricing import generate_prices_batch
+from .product_catalog import ProductCatalog
+from ..core.column_batch import ColumnBatch, rebatch
+from ..core.random_streams import CHUNK_ROWS, RandomStreams, chunk_spans
 # from ..config.seed_settings import CURRENT_PROFILE
 from ..config.seed_settings import load_settings
 
+PRODUCT_COLUMNS = ["name", "description", "cost_price", "sale_price", "date_added", "active", "category_id"]
+
 class ProductGenerator:
     def __init__(
         self,
         base_file: str | None = None,
-        max_variations_per_product: int = 40
+        max_variations_per_product: int = 40,
+        streams: RandomStreams | None = None
     ):
+        # Sorteios por bloco de índices do catálogo (ver RandomStreams)
+        self.streams = streams or RandomStreams.from_seed()
         if base_file is None:
             base_file = resource_path("products_base.json")
 
         self.base_file = base_file
         self.max_variations_per_product = max_variations_per_product
 
-        with open(base_file, encoding="utf-8") as f:
-            self.base_data = json.load(f)
+        # Índice -> produto em O(1): nomes únicos para qualquer volume
+        self.catalog = ProductCatalog.load(base_file, max_variations_per_product)
 
         # 🔑 Mapeia categoria → id baseado na ORDEM do JSON
         self.category_id_map = {
             category_name: idx + 1
-            for idx, category_name in enumerate(self.base_data.keys())
+            for idx, category_name in enumerate(self.catalog.categories)
         }
 
-    # =========================
-    # VARIAÇÕES
-    # =========================
-    def _generate_variation_combinations(
-        self,
-        variations: Dict[str, List[str]]
-    ) -> Iterator[Dict[str, str]]:
-        if not variations:
-            return iter([{}])
-
-        keys = list(variations.keys())
-        values = [variations[k] for k in keys]
-
-        combinations = product(*values)
-        limited = islice(combinations, self.max_variations_per_product)
-
-        for combo in limited:
-            yield dict(zip(keys, combo))
-
     # =========================
     # PRODUTO
     # =========================
@@ -61,71 +47,61 @@ class ProductGenerator:
             return base_name
         return f"{base_name} " + " ".join(attributes.values())
 
-    def _build_product(
-        self,
-        base_name: str,
-        attributes: Dict[str, str],
-        category: str
-    ) -> Dict:
-        cost_price, sale_price = generate_prices(category)
-        date_added = datetime.now() - timedelta(days=random.randint(0, 180))
-
-        name = self._format_product_name(base_name, attributes)
-
-        return {
-            "name": name,
-            "description": f"Produto {name}",
-            "cost_price": cost_price,
-            "sale_price": sale_price,
-            "date_added": date_added.date().isoformat(),
-            "active": False,
-            "category_id": self.category_id_map[category]
-        }
-
     # =========================
     # API PÚBLICA (SEED)
     # =========================
     def generate(self, count: int = None) -> List[Dict]:
         limit = count or load_settings()["CURRENT_PROFILE"].products_count
-        products: List[Dict] = []
-
-        categories = list(self.base_data.items())
-        per_category_limit = max(1, limit // len(categories))
-
-        for category, category_data in categories:
-            category_products: List[Dict] = []
-
-            for subcategory_data in category_data.values():
-
-                base_products = subcategory_data.get("base_products", [])
-                variations = subcategory_data.get("variations", {})
-
-                variation_combinations = list(
-                    self._generate_variation_combinations(variations)
-                )
-
-                for base_name in base_products:
-                    for attrs in variation_combinations:
-                        category_products.append(
-                            self._build_product(
-                                base_name=base_name,
-                                attributes=attrs,
-                                category=category
-                            )
-                        )
-
-                        if len(category_products) >= per_category_limit:
-                            break
-                    if len(category_products) >= per_category_limit:
-                        break
-                if len(category_products) >= per_category_limit:
-                    break
-
-            products.extend(category_products)
-
-            if len(products) >= limit:
-                # random.shuffle(products)
-                return products
-
-        random.shuffle(products)
-        return products[:limit]
+        return [product for batch in self.iter_batches(limit, limit) for product in batch]
+
+    def iter_batches(self, count: int = None, batch_size: int = 500, start: int = 0) -> Iterator[List[Dict]]:
+        """
+        Gera os produtos em lotes de `batch_size`, sem materializar o catálogo
+        inteiro. Cada bloco de CHUNK_ROWS índices é embaralhado individualmente.
+        `start` é o primeiro índice do catálogo (partições paralelas).
+        """
+        for batch in self.iter_column_batches(count, batch_size, start):
+            yield batch.to_dicts()
+
+    def iter_column_batches(self, count: int = None, batch_size: int = 500, start: int = 0) -> Iterator[ColumnBatch]:
+        """
+        Mesmo que iter_batches, mas cada lote é um ColumnBatch
+        (PRODUCT_COLUMNS), pronto para o bulk_insert via batch.rows().
+        """
+        limit = count or load_settings()["CURRENT_PROFILE"].products_count
+        pieces = (self._build_chunk(chunk, lo, hi) for chunk, lo, hi in chunk_spans(start, limit))
+        return rebatch(pieces, batch_size)
+
+    def _build_chunk(self, chunk: int, lo: int, hi: int) -> ColumnBatch:
+        """
+        Produtos das posições [lo, hi) do bloco `chunk` do catálogo, em ordem
+        embaralhada. Os sorteios cobrem sempre o bloco inteiro, então cada
+        produto recebe os mesmos valores qualquer que seja a faixa pedida.
+        """
+        rng = self.streams.chunk(chunk)
+        first = chunk * CHUNK_ROWS
+        catalog = self.catalog
+
+        # Preços do bloco inteiro em uma passada vetorizada
+        cost_prices, sale_prices = generate_prices_batch(
+            [catalog.category(first + position) for position in range(CHUNK_ROWS)], rng
+        )
+        days = [rng.randint(0, 180) for _ in range(CHUNK_ROWS)]
+        order = list(range(CHUNK_ROWS))
+        rng.shuffle(order)
+        positions = [position for position in order if lo <= position < hi]
+
+        specs = [catalog[first + position] for position in positions]
+        names = [self._format_product_name(base_name, attrs) for base_name, attrs, _ in specs]
+        today = datetime.now()
+        dates = [(today - timedelta(days=d)).date().isoformat() for d in range(181)]
+
+        return ColumnBatch(PRODUCT_COLUMNS, {
+            "name": names,
+            "description": [f"Produto {name}" for name in names],
+            "cost_price": [cost_prices[position] for position in positions],
+            "sale_price": [sale_prices[position] for position in positions],
+            "date_added": [dates[days[position]] for position in positions],
+            "active": [False] * len(specs),
+            "category_id": [self.category_id_map[category] for _, _, category in specs],
+        })
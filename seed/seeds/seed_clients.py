@@ -1,20 +1,55 @@
 from ..core.base_seed import BaseSeed
-from ..core.db_utils import fast_insert
-from ..generators.client_generator import ClientGenerator
+from ..core.async_base_seed import AsyncBaseSeed
+from ..core.db_utils import bulk_insert, select_ids
+from ..core.column_batch import iter_rows
+from ..core.async_db_utils import async_fast_insert
+from ..generators.client_generator import ClientGenerator, CLIENT_COLUMNS
 
 class SeedClients(BaseSeed):
+    partitionable = True
+
     def execute(self, cur):
-        generator = ClientGenerator()
-        clients = generator.generate(self.profile.clients_count)
-        
-        columns = ["name", "cpf_cnpj", "email", "phone", "address"]
-        values = [
-            (c["name"], c["cpf_cnpj"], c["email"], c["phone"], c["address"])
-            for c in clients
-        ]
+        generator = ClientGenerator(streams=self.streams)
+        clients_count = self.partition_share(self.profile.clients_count)
+        batches = generator.iter_column_batches(
+            clients_count,
+            self.profile.batch_size,
+            start=self.partition_offset(self.profile.clients_count)
+        )
         
-        # Usamos ON CONFLICT (cpf_cnpj) DO NOTHING para garantir idempotência
-        fast_insert(cur, "clients", columns, values, on_conflict="(cpf_cnpj) DO NOTHING")
+        columns = CLIENT_COLUMNS
+        with self.pipeline(batches) as stream:
+            # Lotes colunares: as linhas saem do zip das colunas
+            values = iter_rows(stream, columns)
+
+            # Usamos ON CONFLICT (cpf_cnpj) DO NOTHING para garantir idempotência
+            bulk_insert(
+                cur, "clients", columns, values,
+                on_conflict="(cpf_cnpj) DO NOTHING",
+                fmt=self.settings["COPY_FORMAT"],
+                row_count=clients_count,
+                page_size=self.batch_sizer
+            )
         
-        cur.execute("SELECT id FROM clients")
-        return [row[0] for row in cur.fetchall()]
+        return select_ids(cur, "clients")
+
+class AsyncSeedClients(AsyncBaseSeed):
+    """
+    SeedClients no backend assíncrono (psycopg 3, pipeline mode)
+    """
+
+    async def execute(self, cur):
+        generator = ClientGenerator(streams=self.streams)
+        batches = generator.iter_column_batches(self.profile.clients_count, self.profile.batch_size)
+
+        columns = CLIENT_COLUMNS
+        values = iter_rows(batches, columns)
+
+        await async_fast_insert(
+            cur, "clients", columns, values,
+            on_conflict="(cpf_cnpj) DO NOTHING",
+            page_size=self.profile.batch_size
+        )
+
+        await cur.execute("SELECT id FROM clients")
+        return [row[0] for row in await cur.fetchall()]
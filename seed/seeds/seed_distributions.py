@@ -1,43 +1,66 @@
-import random
-import requests
 from datetime import datetime, timedelta
 from ..core.base_seed import BaseSeed
-from ..core.db_utils import fast_insert
+from ..core.db_utils import fast_insert, insert_parent_children, select_ids
+from ..core.stock_ledger import StockLedger
 
-API_URL = "https://systock-api.onrender.com/internal-distributions"
-STOCK_API_URL = "https://systock-api.onrender.com/stock"
+DISTRIBUTIONS_PATH = "/internal-distributions"
+STOCK_PATH = "/stock/all"
+
+DISTRIBUTION_COLUMNS = ["from_store_id", "to_store_id", "distribution_date", "status"]
+DISTRIBUTION_ITEM_COLUMNS = ["product_id", "quantity"]
 
 class SeedDistributions(BaseSeed):
+    partitionable = True
+
     def execute(self, cur):
-        cur.execute("SELECT id FROM products")
-        product_ids = [r[0] for r in cur.fetchall()]
+        product_ids = select_ids(cur, "products")
         
-        cur.execute("SELECT id FROM stores")
-        stores = [r[0] for r in cur.fetchall()]
+        stores = select_ids(cur, "stores")
         if len(stores) < 2:
             # Garantir pelo menos duas lojas para distribuição
             fast_insert(cur, "stores", ["name", "location"], [("Estoque Central", "Sede"), ("Loja Filial", "Shopping")])
-            cur.execute("SELECT id FROM stores")
-            stores = [r[0] for r in cur.fetchall()]
+            stores = select_ids(cur, "stores")
+
+        dist_count = self.partition_share(self.profile.distributions_count)
+        batches = self._generate_batches(product_ids, stores, dist_count)
+
+        with self.pipeline(batches) as stream:
+            for headers, children in stream:
+                insert_parent_children(
+                    cur,
+                    "internal_distributions",
+                    DISTRIBUTION_COLUMNS,
+                    headers,
+                    "internal_distribution_items",
+                    DISTRIBUTION_ITEM_COLUMNS,
+                    children,
+                    fk_column="internal_distribution_id",
+                    fmt=self.settings["COPY_FORMAT"],
+                    batch_sizer=self.batch_sizer
+                )
 
-        dist_count = self.profile.distributions_count
-        
-        for _ in range(dist_count):
-            from_store, to_store = random.sample(stores, 2)
-            cur.execute(
-                "INSERT INTO internal_distributions (from_store_id, to_store_id, distribution_date, status) VALUES (%s, %s, %s, 'completed') RETURNING id",
-                (from_store, to_store, datetime.now() - timedelta(days=random.randint(0, 30)))
-            )
-            dist_id = cur.fetchone()[0]
-            
-            num_items = random.randint(3, 10)
-            selected_products = random.sample(product_ids, min(num_items, len(product_ids)))
-            
-            items_values = [(dist_id, pid, random.randint(5, 20)) for pid in selected_products]
-            fast_insert(cur, "internal_distribution_items", ["internal_distribution_id", "product_id", "quantity"], items_values)
-            
         return True
 
+    def _generate_batches(self, product_ids, stores, dist_count):
+        for batch_size in self.batch_sizes(dist_count):
+            headers = []
+            children = []
+
+            for _ in range(batch_size):
+                from_store, to_store = self.rng.sample(stores, 2)
+                headers.append((
+                    from_store,
+                    to_store,
+                    datetime.now() - timedelta(days=self.rng.randint(0, 30)),
+                    "completed"
+                ))
+
+                num_items = self.rng.randint(3, 10)
+                selected_products = self.rng.sample(product_ids, min(num_items, len(product_ids)))
+                children.append([(pid, self.rng.randint(5, 20)) for pid in selected_products])
+
+            yield headers, children
+
 class SeedDistributionsAPI(BaseSeed):
     """
     Seed de distribuições internas via API
@@ -45,86 +68,83 @@ class SeedDistributionsAPI(BaseSeed):
     """
 
     def execute(self, cur):
-        # =============================
-        # Buscar Stock
-        # =============================
-        stock = requests.get(
-            f"{STOCK_API_URL}/all",
-            timeout=30
-        ).json()
-
-        if not stock:
-            raise RuntimeError("Nenhum dado de estoque retornado pela API")
-
-        quantity_map = {item['product_id']: item['quantity'] for item in stock if item['quantity'] > 0}
-
-        # =============================
-        # Buscar lojas
-        # =============================
-        cur.execute("SELECT id FROM stores ORDER BY id")
-        store_ids = [r[0] for r in cur.fetchall()]
-
-        if len(store_ids) < 2:
-            raise RuntimeError("São necessárias ao menos 2 lojas para distribuição")
-
-        FROM_STORE_ID = 1
-        target_stores = [sid for sid in store_ids if sid != FROM_STORE_ID]
-
-        # # =============================
-        # # Buscar produtos
-        # # =============================
-        # cur.execute("SELECT id FROM products")
-        # product_ids = [r[0] for r in cur.fetchall()]
-        #
-        # if not product_ids:
-        #     raise RuntimeError("Nenhum produto encontrado para seed de distribuições")
-
-
-        distributions_count = self.profile.distributions_count
-
-        for _ in range(distributions_count):
-            to_store_id = random.choice(target_stores)
-
-            distribution_date = datetime.utcnow() - timedelta(
-                days=random.randint(0, 180)
-            )
-
-            num_items = random.randint(3, 8)
-            selected_products = random.sample(
-                list(quantity_map.items()), min(num_items, len(quantity_map))
-            )
-
-            items = []
-            for itens in selected_products:
-                product_id = itens[0]
-                if quantity_map[product_id] <= 1:
-                    continue
-
-                quantity = random.randint(1, itens[1])
-
-                items.append({
-                    "product_id": product_id,
-                    "quantity": quantity,
-                    "registered_at": distribution_date.isoformat(),
-                })
-
-                # Diminuir a quantidade disponível para evitar overbooking
-                quantity_map[product_id] -= quantity
-
-            payload = {
-                "from_store_id": FROM_STORE_ID,
-                "to_store_id": to_store_id,
-                "distribution_date": distribution_date.isoformat(),
-                "status": "completed",
-                "items": items,
-            }
-
-            response = requests.post(API_URL, json=payload, timeout=30)
-
-            if response.status_code not in (200, 201):
-                raise RuntimeError(
-                    f"Erro ao criar distribuição via API: "
-                    f"{response.status_code} - {response.text}"
+        with self.http_client() as client:
+            # =============================
+            # Buscar Stock
+            # =============================
+            stock = client.get_json(self.api_url(STOCK_PATH))
+
+            if not stock:
+                raise RuntimeError("Nenhum dado de estoque retornado pela API")
+
+            # =============================
+            # Buscar lojas
+            # =============================
+            store_ids = select_ids(cur, "stores")
+
+            if len(store_ids) < 2:
+                raise RuntimeError("São necessárias ao menos 2 lojas para distribuição")
+
+            FROM_STORE_ID = 1
+            ledger = StockLedger()
+            for item in stock:
+                if item["store_id"] == FROM_STORE_ID:
+                    ledger.add(FROM_STORE_ID, item["product_id"], item["quantity"])
+            target_stores = [sid for sid in store_ids if sid != FROM_STORE_ID]
+
+            # # =============================
+            # # Buscar produtos
+            # # =============================
+            # cur.execute("SELECT id FROM products")
+            # product_ids = [r[0] for r in cur.fetchall()]
+            #
+            # if not product_ids:
+            #     raise RuntimeError("Nenhum produto encontrado para seed de distribuições")
+
+
+            distributions_count = self.profile.distributions_count
+
+            for _ in range(distributions_count):
+                to_store_id = self.rng.choice(target_stores)
+
+                distribution_date = datetime.utcnow() - timedelta(
+                    days=self.rng.randint(0, 180)
+                )
+
+                num_items = self.rng.randint(3, 8)
+                selected_products = ledger.sample(FROM_STORE_ID, num_items, self.rng)
+
+                items = []
+                for product_id, available_qty in selected_products:
+                    if available_qty <= 1:
+                        continue
+
+                    quantity = self.rng.randint(1, available_qty)
+
+                    items.append({
+                        "product_id": product_id,
+                        "quantity": quantity,
+                        "registered_at": distribution_date.isoformat(),
+                    })
+
+                    # Diminuir a quantidade disponível para evitar overbooking
+                    ledger.remove(FROM_STORE_ID, product_id, quantity)
+
+                payload = {
+                    "from_store_id": FROM_STORE_ID,
+                    "to_store_id": to_store_id,
+                    "distribution_date": distribution_date.isoformat(),
+                    "status": "completed",
+                    "items": items,
+                }
+
+                # Saídas da loja de origem do mesmo produto seguem em ordem
+                client.submit(
+                    self.api_url(DISTRIBUTIONS_PATH),
+                    payload,
+                    order_keys=[(FROM_STORE_ID, item["product_id"]) for item in items],
+                    error_prefix="Erro ao criar distribuição via API",
+                    table="internal_distributions"
                 )
 
         return True
\ No newline at end of file
@@ -0,0 +1,166 @@
+import logging
+from ..core.base_seed import BaseSeed
+from ..core.db_utils import insert_parent_children, select_ids
+from ..core.product_cache import ProductCache
+from ..generators.inventory_simulator import InventorySimulator, CENTRAL_STORE_ID
+from .seed_entries import ENTRIES_PATH, CATEGORIES_WITH_EXPIRATION, ENTRY_COLUMNS, ENTRY_ITEM_COLUMNS
+from .seed_distributions import DISTRIBUTIONS_PATH, DISTRIBUTION_COLUMNS, DISTRIBUTION_ITEM_COLUMNS
+from .seed_sales import SALES_PATH, SALE_COLUMNS, SALE_ITEM_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# kind -> (endpoint, tabela nas métricas, mensagem de erro)
+EVENT_ENDPOINTS = {
+    "entry": (ENTRIES_PATH, "product_entries", "Erro ao criar entrada via API"),
+    "distribution": (DISTRIBUTIONS_PATH, "internal_distributions", "Erro ao criar distribuição via API"),
+    "sale": (SALES_PATH, "sales", "Erro ao criar venda"),
+}
+
+# kind -> (tabela, colunas, tabela de itens, colunas dos itens, FK) no caminho
+# direto; as chaves dos payloads do simulador têm os nomes das colunas
+EVENT_TABLES = {
+    "entry": ("product_entries", ENTRY_COLUMNS, "product_entry_items", ENTRY_ITEM_COLUMNS, "product_entry_id"),
+    "distribution": (
+        "internal_distributions", DISTRIBUTION_COLUMNS,
+        "internal_distribution_items", DISTRIBUTION_ITEM_COLUMNS,
+        "internal_distribution_id",
+    ),
+    "sale": ("sales", SALE_COLUMNS, "sale_items", SALE_ITEM_COLUMNS, "sale_id"),
+}
+
+class _InventorySeed(BaseSeed):
+    """
+    Base dos estágios que geram entradas, distribuições e vendas pelo
+    InventorySimulator (estoque simulado em memória)
+    """
+
+    def simulate(self, cur):
+        """
+        Read the ids the simulator needs and return its (kind, payload) events.
+
+        The reads happen here, on the stage cursor; the events themselves are
+        generated lazily (e.g. inside the batch pipeline). Documents the
+        simulator could not supply are recorded as shortfall in the stage
+        metrics once the events are exhausted.
+        """
+        products = ProductCache.load(cur)
+        if not products:
+            raise RuntimeError("Nenhum produto encontrado para seed de estoque")
+
+        supplier_ids = select_ids(cur, "suppliers")
+        if not supplier_ids:
+            raise RuntimeError("Nenhum fornecedor encontrado para seed de entradas")
+
+        store_ids = select_ids(cur, "stores")
+        if len(store_ids) < 2:
+            raise RuntimeError("São necessárias ao menos 2 lojas para distribuição")
+
+        client_ids = select_ids(cur, "clients")
+        if not client_ids:
+            raise RuntimeError("Nenhum cliente encontrado para seed de vendas")
+
+        simulator = InventorySimulator(
+            products,
+            supplier_ids,
+            store_ids,
+            client_ids,
+            self.rng,
+            expiration_categories=CATEGORIES_WITH_EXPIRATION
+        )
+        return self._events(simulator)
+
+    def _events(self, simulator):
+        yield from simulator.events(
+            self.profile.entries_count,
+            self.profile.distributions_count,
+            self.profile.sales_count
+        )
+
+        # Documentos que nem o reabastecimento seguinte conseguiu suprir
+        for kind, missing in simulator.shortfall.items():
+            if missing:
+                self.metrics.record_shortfall(EVENT_TABLES[kind][0], missing)
+
+class SeedInventory(_InventorySeed):
+    """
+    Seed direto no banco de entradas, distribuições e vendas em um único
+    estágio: os itens seguem o estoque simulado, então nenhuma loja vende
+    ou transfere mais do que recebeu
+    """
+
+    def execute(self, cur):
+        batches = self._generate_batches(self.simulate(cur))
+
+        with self.pipeline(batches) as stream:
+            for kind, headers, children in stream:
+                table, columns, item_table, item_columns, fk_column = EVENT_TABLES[kind]
+                insert_parent_children(
+                    cur,
+                    table,
+                    columns,
+                    headers,
+                    item_table,
+                    item_columns,
+                    children,
+                    fk_column=fk_column,
+                    fmt=self.settings["COPY_FORMAT"],
+                    batch_sizer=self.batch_sizer
+                )
+
+        return True
+
+    def _generate_batches(self, events):
+        # Um lote por tipo de documento, emitido quando enche
+        pending = {kind: ([], []) for kind in EVENT_TABLES}
+        for kind, payload in events:
+            _, columns, _, item_columns, _ = EVENT_TABLES[kind]
+            headers, children = pending[kind]
+            headers.append(tuple(payload[column] for column in columns))
+            children.append([
+                tuple(item[column] for column in item_columns)
+                for item in payload["items"]
+            ])
+            if len(headers) >= self.batch_sizer.size:
+                yield kind, headers, children
+                pending[kind] = ([], [])
+
+        for kind, (headers, children) in pending.items():
+            if headers:
+                yield kind, headers, children
+
+class SeedInventoryAPI(_InventorySeed):
+    """
+    Seed de entradas, distribuições e vendas via API em um único estágio,
+    com o estoque simulado em memória (sem ler /stock/all)
+    """
+
+    def execute(self, cur):
+        events = self.simulate(cur)
+
+        with self.http_client() as client:
+            for kind, payload in events:
+                path, table, error_prefix = EVENT_ENDPOINTS[kind]
+                client.submit(
+                    self.api_url(path),
+                    payload,
+                    order_keys=self._order_keys(kind, payload),
+                    error_prefix=error_prefix,
+                    table=table
+                )
+
+        return True
+
+    @staticmethod
+    def _order_keys(kind, payload):
+        # Todo movimento de um (loja, produto) segue a ordem cronológica:
+        # a entrada precede a transferência, que precede a venda
+        product_ids = [item["product_id"] for item in payload["items"]]
+        if kind == "entry":
+            return [(CENTRAL_STORE_ID, pid) for pid in product_ids]
+        if kind == "distribution":
+            return [
+                (store_id, pid)
+                for pid in product_ids
+                for store_id in (payload["from_store_id"], payload["to_store_id"])
+            ]
+        return [(payload["store_id"], pid) for pid in product_ids]
@@ -1,22 +1,35 @@
 from ..core.base_seed import BaseSeed
-from ..core.db_utils import fast_insert
-from ..generators.product_generator import ProductGenerator
+from ..core.db_utils import bulk_insert, select_ids
+from ..core.column_batch import iter_rows
+from ..generators.product_generator import ProductGenerator, PRODUCT_COLUMNS
 
 
 class SeedProducts(BaseSeed):
+    partitionable = True
+
     def execute(self, cur):
-        generator = ProductGenerator()
-        products = generator.generate(self.profile.products_count)
-        
-        columns = ["name", "description", "cost_price", "sale_price", "date_added", "active", "category_id"]
-        values = [
-            (p["name"], p["description"], p["cost_price"], p["sale_price"], p["date_added"], p["active"], p["category_id"])
-            for p in products
-        ]
+        generator = ProductGenerator(streams=self.streams)
+        # Cada partição gera sua faixa de índices do catálogo: nomes disjuntos
+        products_count = self.partition_share(self.profile.products_count)
+        batches = generator.iter_column_batches(
+            products_count,
+            self.profile.batch_size,
+            start=self.partition_offset(self.profile.products_count)
+        )
         
-        # Usamos ON CONFLICT (name) DO NOTHING para garantir idempotência
-        fast_insert(cur, "products", columns, values, on_conflict="(name) DO NOTHING")
+        columns = PRODUCT_COLUMNS
+        with self.pipeline(batches) as stream:
+            # Lotes colunares: as linhas saem direto das colunas
+            values = iter_rows(stream, columns)
+
+            # Usamos ON CONFLICT (name) DO NOTHING para garantir idempotência
+            bulk_insert(
+                cur, "products", columns, values,
+                on_conflict="(name) DO NOTHING",
+                fmt=self.settings["COPY_FORMAT"],
+                row_count=products_count,
+                page_size=self.batch_sizer
+            )
         
         # Retornar IDs para os próximos estágios
-        cur.execute("SELECT id FROM products")
-        return [row[0] for row in cur.fetchall()]
+        return select_ids(cur, "products")
@@ -1,50 +1,75 @@
-import random
-import requests
 from datetime import datetime, timedelta
 from ..core.base_seed import BaseSeed
-from ..core.db_utils import fast_insert
+from ..core.db_utils import fast_insert, insert_parent_children, select_ids
+from ..core.product_cache import ProductCache
+from ..core.stock_ledger import StockLedger
 
-API_BASE = "https://systock-api.onrender.com"
+SALES_PATH = "/sales"
+STOCK_PATH = "/stock/all"
+
+SALE_COLUMNS = ["client_id", "store_id", "sale_date", "status"]
+SALE_ITEM_COLUMNS = ["product_id", "quantity", "unit_price", "total_price"]
 
 class SeedSales(BaseSeed):
+    partitionable = True
+
     def execute(self, cur):
-        cur.execute("SELECT id FROM products")
-        product_ids = [r[0] for r in cur.fetchall()]
+        products = ProductCache.load(cur)
         
-        cur.execute("SELECT id FROM stores")
-        store_ids = [r[0] for r in cur.fetchall()]
+        store_ids = select_ids(cur, "stores")
         
-        cur.execute("SELECT id FROM clients LIMIT 100")
-        client_ids = [r[0] for r in cur.fetchall()]
+        client_ids = select_ids(cur, "clients", limit=100)
         if not client_ids:
             # Criar alguns clientes se não existirem
             clients = [(f"Cliente {i}", f"cliente{i}@email.com") for i in range(10)]
             fast_insert(cur, "clients", ["name", "email"], clients)
-            cur.execute("SELECT id FROM clients")
-            client_ids = [r[0] for r in cur.fetchall()]
+            client_ids = select_ids(cur, "clients")
+
+        sales_count = self.partition_share(self.profile.sales_count)
+        batches = self._generate_batches(products, store_ids, client_ids, sales_count)
+
+        with self.pipeline(batches) as stream:
+            for headers, children in stream:
+                insert_parent_children(
+                    cur,
+                    "sales",
+                    SALE_COLUMNS,
+                    headers,
+                    "sale_items",
+                    SALE_ITEM_COLUMNS,
+                    children,
+                    fk_column="sale_id",
+                    fmt=self.settings["COPY_FORMAT"],
+                    batch_sizer=self.batch_sizer
+                )
 
-        sales_count = self.profile.sales_count
-        
-        for _ in range(sales_count):
-            cur.execute(
-                "INSERT INTO sales (client_id, store_id, sale_date, status) VALUES (%s, %s, %s, 'completed') RETURNING id",
-                (random.choice(client_ids), random.choice(store_ids), datetime.now() - timedelta(days=random.randint(0, 60)))
-            )
-            sale_id = cur.fetchone()[0]
-            
-            num_items = random.randint(1, 5)
-            selected_products = random.sample(product_ids, min(num_items, len(product_ids)))
-            
-            items_values = []
-            for pid in selected_products:
-                qty = random.randint(1, 3)
-                price = round(random.uniform(50, 500), 2)
-                items_values.append((sale_id, pid, qty, price, round(qty * price, 2)))
-            
-            fast_insert(cur, "sale_items", ["sale_id", "product_id", "quantity", "unit_price", "total_price"], items_values)
-            
         return True
 
+    def _generate_batches(self, products, store_ids, client_ids, sales_count):
+        for batch_size in self.batch_sizes(sales_count):
+            headers = []
+            children = []
+
+            for _ in range(batch_size):
+                headers.append((
+                    self.rng.choice(client_ids),
+                    self.rng.choice(store_ids),
+                    datetime.now() - timedelta(days=self.rng.randint(0, 60)),
+                    "completed"
+                ))
+
+                num_items = self.rng.randint(1, 5)
+                selected_products = self.rng.sample(products.ids, min(num_items, len(products)))
+
+                items_values = []
+                for pid in selected_products:
+                    qty = self.rng.randint(1, 3)
+                    price = products.sale_price[pid]
+                    items_values.append((pid, qty, price, round(qty * price, 2)))
+                children.append(items_values)
+
+            yield headers, children
+
 # class SeedSalesAPI(BaseSeed):
 #     def execute(self, cur):
 #         # =========================
@@ -167,123 +192,104 @@ class SeedSalesAPI(BaseSeed):
     """
 
     def execute(self, cur):
-        # =============================
-        # Buscar estoque via API
-        # =============================
-        stock_data = requests.get(f"{API_BASE}/stock/all", timeout=30).json()
-
-        if not stock_data:
-            raise RuntimeError("Nenhum estoque encontrado para seed de vendas")
-
-        # stock_map[store_id][product_id] = quantity
-        stock_map = {}
-        for item in stock_data:
-            if item["quantity"] > 0 and item["store_id"] != 1:
-                stock_map.setdefault(item["store_id"], {})[
-                    item["product_id"]
-                ] = item["quantity"]
-
-        if not stock_map:
-            raise RuntimeError("Nenhuma loja com estoque disponível para vendas")
-
-        # =============================
-        # Buscar clientes
-        # =============================
-        cur.execute("SELECT id FROM clients")
-        client_ids = [r[0] for r in cur.fetchall()]
+        with self.http_client() as client:
+            # =============================
+            # Buscar estoque via API
+            # =============================
+            stock_data = client.get_json(self.api_url(STOCK_PATH))
 
-        if not client_ids:
-            raise RuntimeError("Nenhum cliente encontrado para seed de vendas")
+            if not stock_data:
+                raise RuntimeError("Nenhum estoque encontrado para seed de vendas")
+
+            ledger = StockLedger()
+            for item in stock_data:
+                if item["store_id"] != 1:
+                    ledger.add(item["store_id"], item["product_id"], item["quantity"])
 
-        sales_count = self.profile.sales_count
+            if not ledger.stores:
+                raise RuntimeError("Nenhuma loja com estoque disponível para vendas")
 
-        for _ in range(sales_count):
             # =============================
-            # Escolher loja válida
+            # Buscar clientes
             # =============================
-            valid_stores = [
-                sid for sid, products in stock_map.items()
-                if any(qty > 0 for qty in products.values())
-            ]
+            client_ids = select_ids(cur, "clients")
 
-            if not valid_stores:
-                break  # estoque acabou
+            if not client_ids:
+                raise RuntimeError("Nenhum cliente encontrado para seed de vendas")
 
-            store_id = random.choice(valid_stores)
+            # Preços carregados uma vez, em vez de um SELECT por item
+            products = ProductCache.load(cur)
 
-            # Produtos disponíveis nessa loja
-            available_products = [
-                (pid, qty)
-                for pid, qty in stock_map[store_id].items()
-                if qty > 0
-            ]
+            sales_count = self.profile.sales_count
 
-            if not available_products:
-                continue
+            for _ in range(sales_count):
+                # =============================
+                # Escolher loja válida
+                # =============================
+                if not ledger.stores:
+                    break  # estoque acabou
 
-            num_items = random.randint(1, min(5, len(available_products)))
-            selected_products = random.sample(available_products, num_items)
+                store_id = self.rng.choice(ledger.stores)
 
-            items = []
-            total_value = 0.0
+                # Produtos disponíveis nessa loja
+                num_items = self.rng.randint(1, min(5, ledger.available(store_id)))
+                selected_products = ledger.sample(store_id, num_items, self.rng)
 
-            sale_date = datetime.utcnow() - timedelta(
-                days=random.randint(0, 180)
-            )
+                items = []
+                total_value = 0.0
 
-            for product_id, available_qty in selected_products:
-                if available_qty <= 1:
-                    continue
+                sale_date = datetime.utcnow() - timedelta(
+                    days=self.rng.randint(0, 180)
+                )
 
-                quantity = random.randint(1, available_qty)
+                for product_id, available_qty in selected_products:
+                    if available_qty <= 1:
+                        continue
 
-                # Buscar preço do produto
-                cur.execute(
-                    "SELECT sale_price FROM products WHERE id = %s",
-                    (product_id,)
-                )
-                row = cur.fetchone()
-                if not row:
+                    quantity = self.rng.randint(1, available_qty)
+
+                    if product_id not in products:
+                        continue
+
+                    unit_price = products.sale_price[product_id]
+                    total_price = round(unit_price * quantity, 2)
+
+                    items.append({
+                        "product_id": product_id,
+                        "quantity": quantity,
+                        "unit_price": unit_price,
+                        "total_price": total_price,
+                        "removed_at": sale_date.isoformat(),
+                    })
+
+                    total_value += total_price
+
+                    # Atualizar estoque local
+                    ledger.remove(store_id, product_id, quantity)
+
+                if not items:
                     continue
 
-                unit_price = float(row[0])
-                total_price = round(unit_price * quantity, 2)
-
-                items.append({
-                    "product_id": product_id,
-                    "quantity": quantity,
-                    "unit_price": unit_price,
-                    "total_price": total_price,
-                    "removed_at": sale_date.isoformat(),
-                })
-
-                total_value += total_price
-
-                # Atualizar estoque local
-                stock_map[store_id][product_id] -= quantity
-
-            if not items:
-                continue
-
-            payload = {
-                "client_id": random.choice(client_ids),
-                "store_id": store_id,
-                "sale_date": sale_date.isoformat(),
-                "delivery_type": random.choice(["pickup", "delivery"]),
-                "tracking_code": f"TRK-{random.randint(100000,999999)}",
-                "status": "completed",
-                "predicted_delivery": sale_date.isoformat(),
-                "delivered_at": sale_date.isoformat(),
-                "total_value": round(total_value, 2),
-                "items": items,
-            }
-
-            response = requests.post(f"{API_BASE}/sales", json=payload, timeout=30)
-
-            if response.status_code not in (200, 201):
-                raise RuntimeError(
-                    f"Erro ao criar venda: "
-                    f"{response.status_code} - {response.text}"
+                payload = {
+                    "client_id": self.rng.choice(client_ids),
+                    "store_id": store_id,
+                    "sale_date": sale_date.isoformat(),
+                    "delivery_type": self.rng.choice(["pickup", "delivery"]),
+                    "tracking_code": f"TRK-{self.rng.randint(100000,999999)}",
+                    "status": "completed",
+                    "predicted_delivery": sale_date.isoformat(),
+                    "delivered_at": sale_date.isoformat(),
+                    "total_value": round(total_value, 2),
+                    "items": items,
+                }
+
+                # Baixas de estoque do mesmo produto na mesma loja seguem em ordem
+                client.submit(
+                    self.api_url(SALES_PATH),
+                    payload,
+                    order_keys=[(store_id, item["product_id"]) for item in items],
+                    error_prefix="Erro ao criar venda",
+                    table="sales"
                 )
 
         return True
\ No newline at end of file
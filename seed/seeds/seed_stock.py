@@ -0,0 +1,96 @@
+import logging
+from ..core.base_seed import BaseSeed
+
+logger = logging.getLogger(__name__)
+
+# Esquema de estoque do systock (ajuste conforme seu banco)
+STOCK_TABLE = "stock"
+MOVEMENTS_TABLE = "stock_movements"
+CENTRAL_STORE_ID = 1  # entradas abastecem a loja central, como na API
+
+MOVEMENT_ENTRY = "entry"
+MOVEMENT_TRANSFER_OUT = "transfer_out"
+MOVEMENT_TRANSFER_IN = "transfer_in"
+MOVEMENT_SALE = "sale"
+INBOUND_MOVEMENTS = (MOVEMENT_ENTRY, MOVEMENT_TRANSFER_IN)
+
+# Uma consulta por tipo de movimento: (tipo, SELECT de product_id, store_id,
+# quantity, reference_id, created_at). reference_id aponta para o item de origem.
+MOVEMENT_SOURCES = [
+    (MOVEMENT_ENTRY, f"""
+        SELECT i.product_id, {CENTRAL_STORE_ID}, i.quantity, i.id,
+               COALESCE(i.received_at, e.entry_date)
+        FROM product_entry_items i
+        JOIN product_entries e ON e.id = i.product_entry_id
+    """),
+    (MOVEMENT_TRANSFER_OUT, """
+        SELECT i.product_id, d.from_store_id, i.quantity, i.id, d.distribution_date
+        FROM internal_distribution_items i
+        JOIN internal_distributions d ON d.id = i.internal_distribution_id
+    """),
+    (MOVEMENT_TRANSFER_IN, """
+        SELECT i.product_id, d.to_store_id, i.quantity, i.id, d.distribution_date
+        FROM internal_distribution_items i
+        JOIN internal_distributions d ON d.id = i.internal_distribution_id
+    """),
+    (MOVEMENT_SALE, """
+        SELECT i.product_id, s.store_id, i.quantity, i.id, s.sale_date
+        FROM sale_items i
+        JOIN sales s ON s.id = i.sale_id
+    """),
+]
+
+class SeedStock(BaseSeed):
+    """
+    Materializa estoque e movimentos a partir dos itens gravados pelo
+    SeedInventory (caminho direto com estoque simulado), em poucos
+    INSERT ... SELECT. Só roda com SEED_MATERIALIZE_STOCK=true.
+
+    Cada item gera um movimento (uma vez só: itens que já têm movimento
+    são ignorados) e o estoque de cada (loja, produto) é recalculado a
+    partir de todos os movimentos, então o estágio pode ser repetido.
+    """
+
+    def execute(self, cur):
+        if getattr(cur, "sink", None) is not None:
+            # INSERT ... SELECT no próprio banco: não há o que fazer fora do PostgreSQL
+            logger.info("Stock is materialized in PostgreSQL only; skipping for this sink")
+            return True
+
+        for movement_type, source in MOVEMENT_SOURCES:
+            cur.execute(
+                f"""
+                INSERT INTO {MOVEMENTS_TABLE}
+                    (product_id, store_id, quantity, reference_id, created_at, movement_type)
+                SELECT src.*, %(type)s
+                FROM ({source}) AS src (product_id, store_id, quantity, reference_id, created_at)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {MOVEMENTS_TABLE} m
+                    WHERE m.movement_type = %(type)s AND m.reference_id = src.reference_id
+                )
+                """,
+                {"type": movement_type}
+            )
+            self.metrics.record_rows(MOVEMENTS_TABLE, cur.rowcount, cur.rowcount)
+
+        cur.execute(
+            f"""
+            INSERT INTO {STOCK_TABLE} (store_id, product_id, quantity)
+            SELECT store_id, product_id,
+                   SUM(CASE WHEN movement_type IN %(inbound)s THEN quantity ELSE -quantity END)
+            FROM {MOVEMENTS_TABLE}
+            GROUP BY store_id, product_id
+            ON CONFLICT (store_id, product_id) DO UPDATE SET quantity = EXCLUDED.quantity
+            """,
+            {"inbound": INBOUND_MOVEMENTS}
+        )
+        self.metrics.record_rows(STOCK_TABLE, cur.rowcount, cur.rowcount)
+
+        # Os itens seguem o estoque simulado: saldo negativo indica itens
+        # gravados por fora dele (ex.: estágios diretos aleatórios)
+        cur.execute(f"SELECT count(*) FROM {STOCK_TABLE} WHERE quantity < 0")
+        negative = cur.fetchone()[0]
+        if negative:
+            raise RuntimeError(f"{negative} linhas de estoque ficaram negativas")
+
+        return True
@@ -1,19 +1,46 @@
 import sys
 import os
+import argparse
+import multiprocessing
 from pathlib import Path
 
 # Adicionar o diretório atual ao sys.path para permitir importações relativas
 sys.path.append(str(Path(__file__).resolve().parent))
 
-from db import get_connection
+from db import get_connection, get_connection_params
 from seed.core.seed_runner import SeedRunner
+from seed.core import dataset
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Professional Data Seeding System")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="Gera e grava os dados no banco (padrão)")
+    materialize = commands.add_parser(
+        "materialize", help="Gera o dataset em arquivos COPY compactados, sem banco"
+    )
+    materialize.add_argument("directory")
+    materialize.add_argument("--compression", choices=["zstd", "gzip"])
+    load = commands.add_parser("load", help="Carrega no banco um dataset materializado, via COPY")
+    load.add_argument("directory")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print("--- Professional Data Seeding System ---")
     try:
+        if args.command == "materialize":
+            # Só gera arquivos: não abre conexão com o banco
+            manifest = dataset.materialize(args.directory, compression=args.compression)
+            rows = sum(entry["rows"] for entry in manifest["tables"].values())
+            print(f"--- Dataset materialized in {args.directory} ({rows} rows) ---")
+            return
+
         conn = get_connection()
-        runner = SeedRunner(conn)
-        runner.run_all()
+        if args.command == "load":
+            dataset.load(conn, args.directory)
+        else:
+            runner = SeedRunner(conn, conn_params=get_connection_params())
+            runner.run_all()
         conn.close()
         print("--- Seeding Process Finished ---")
     except Exception as e:
@@ -21,4 +48,5 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
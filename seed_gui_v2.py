@@ -1,6 +1,7 @@
 import sys
 import os
 import logging
+import multiprocessing
 import psycopg2
 import importlib
 from dotenv import load_dotenv
@@ -20,9 +21,10 @@ sys.path.append(str(Path(__file__).resolve().parent))
 # Caminho absoluto para a raiz do projeto
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-from seed.core.seed_runner import SeedRunner
+from seed.core.seed_runner import SeedRunner, STAGE_DEPENDENCIES
 from seed.config.seed_profiles import SeedSize, PROFILES
 from seed.config.seed_settings import load_settings
+from seed.core.sinks import DEFAULT_SINK_PATHS, uses_database
 
 
 # Configuração de log para capturar na GUI
@@ -54,7 +56,7 @@ class DBWorker(QThread):
             logging.getLogger().setLevel(logging.INFO)
 
             conn_params = self.params.get('conn_params')
-            conn = psycopg2.connect(**conn_params)
+            conn = None
 
             if self.action == 'seed':
                 profile_size = self.params.get('profile_size')
@@ -78,10 +80,15 @@ class DBWorker(QThread):
                 os.environ["FORCE_SEED"] = (
                     "true" if self.params.get('force_seed', False) else "false"
                 )
+                os.environ["SEED_SINK"] = self.params.get('sink', 'postgres')
+                os.environ["SEED_SINK_PATH"] = self.params.get('sink_path', '')
 
                 settings = load_settings()
+                # Arquivos COPY e SQLite não precisam do PostgreSQL
+                if uses_database(settings):
+                    conn = psycopg2.connect(**conn_params)
 
-                runner = SeedRunner(conn, settings=settings)
+                runner = SeedRunner(conn, settings=settings, conn_params=conn_params)
 
                 # else:
                 #     settings.CURRENT_PROFILE = PROFILES[profile_size]
@@ -95,6 +102,7 @@ class DBWorker(QThread):
 
             elif self.action == 'clean':
                 tables = self.params.get('tables')
+                conn = psycopg2.connect(**conn_params)
                 with conn.cursor() as cur:
                     for table in tables:
                         logging.info(f"Limpando tabela: {table}")
@@ -102,7 +110,8 @@ class DBWorker(QThread):
                 conn.commit()
                 self.finished.emit(True, "Limpeza concluída com sucesso!")
 
-            conn.close()
+            if conn is not None:
+                conn.close()
         except Exception as e:
             self.finished.emit(False, f"Erro: {str(e)}")
         finally:
@@ -188,11 +197,7 @@ class MainWindow(QMainWindow):
 
     # =========================
     # TAB DE SEEDING - Cofigurações
-    SEED_DEPENDENCIES = {
-        "entries": ["products"],
-        "distributions": ["products"],
-        "sales": ["products", "clients"],
-    }
+    SEED_DEPENDENCIES = STAGE_DEPENDENCIES
 
     SEED_MAP = {
         "Produtos": "products",
@@ -204,6 +209,12 @@ class MainWindow(QMainWindow):
 
     SEED_MAP_REVERSE = {v: k for k, v in SEED_MAP.items()}
 
+    SINK_OPTIONS = [
+        ("PostgreSQL", "postgres"),
+        ("Arquivos COPY (.copy.gz)", "copy"),
+        ("SQLite", "sqlite"),
+    ]
+
     def create_seed_tab(self):
         tab = QWidget()
         layout = QVBoxLayout(tab)
@@ -252,6 +263,20 @@ class MainWindow(QMainWindow):
         seed_sel_layout.addWidget(self.seed_list)
         seed_sel_group.setLayout(seed_sel_layout)
         layout.addWidget(seed_sel_group)
+
+        # Destino dos dados (SEED_SINK)
+        sink_group = QGroupBox("Destino")
+        sink_form = QFormLayout()
+        self.sink_combo = QComboBox()
+        for label, kind in self.SINK_OPTIONS:
+            self.sink_combo.addItem(label, kind)
+        self.sink_combo.currentIndexChanged.connect(self.on_sink_changed)
+        self.sink_path = QLineEdit()
+        sink_form.addRow("Gravar em:", self.sink_combo)
+        sink_form.addRow("Caminho:", self.sink_path)
+        sink_group.setLayout(sink_form)
+        layout.addWidget(sink_group)
+        self.on_sink_changed(0)
         
         self.check_force = QCheckBox("Forçar execução (Produção)")
         layout.addWidget(self.check_force)
@@ -399,6 +424,11 @@ class MainWindow(QMainWindow):
             self.spin_dist.setValue(p.distributions_count)
             self.spin_sales.setValue(p.sales_count)
 
+    def on_sink_changed(self, index):
+        kind = self.sink_combo.currentData()
+        self.sink_path.setEnabled(kind in DEFAULT_SINK_PATHS)
+        self.sink_path.setText(DEFAULT_SINK_PATHS.get(kind, ""))
+
     def start_seeding(self):
         SEED_MAP = {
             "Produtos": "products",
@@ -418,7 +448,9 @@ class MainWindow(QMainWindow):
                 'distributions': self.spin_dist.value(),
                 'sales': self.spin_sales.value()
             },
-            'selected_seeds': [SEED_MAP[self.seed_list.item(i).text()] for i in range(self.seed_list.count()) if self.seed_list.item(i).checkState() == Qt.Checked]
+            'selected_seeds': [SEED_MAP[self.seed_list.item(i).text()] for i in range(self.seed_list.count()) if self.seed_list.item(i).checkState() == Qt.Checked],
+            'sink': self.sink_combo.currentData(),
+            'sink_path': self.sink_path.text() if self.sink_path.isEnabled() else ''
         }
         # settings.FORCE_SEED = self.check_force.isChecked()
         os.environ["FORCE_SEED"] = "true" if self.check_force.isChecked() else "false"
@@ -482,6 +514,8 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Erro", message)
 
 if __name__ == "__main__":
+    # Necessário para o ProcessPoolExecutor no executável do PyInstaller
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
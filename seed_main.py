@@ -1,5 +1,6 @@
 import sys
 import logging
+import multiprocessing
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -18,6 +19,7 @@ if env_path.exists():
 
 from seed.core.seed_runner import SeedRunner
 from seed.config.seed_settings import load_settings
+from seed.core.sinks import uses_database
 from seed.db import get_connection
 
 logging.basicConfig(
@@ -45,16 +47,23 @@ def main():
         )
         sys.exit(1)
 
-    conn = get_connection()
+    # DRY_RUN e os sinks locais (SEED_SINK) não precisam do banco
+    conn = get_connection() if uses_database(settings) else None
 
     runner = SeedRunner(
         conn=conn,
         settings=settings
     )
 
-    runner.run()
+    if uses_database(settings) or settings["DRY_RUN"]:
+        runner.run()
+    else:
+        # Sinks locais: os estágios via API gravariam no banco da API com
+        # ids do arquivo local
+        runner.run_all()
 
     logging.info("Seed executado com sucesso!")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,112 @@
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+# DSN de um PostgreSQL descartável; sem ele os testes de banco são pulados
+DATABASE_URL_ENV = "SEED_TEST_DATABASE_URL"
+
+# Esquema mínimo do systock usado pelos estágios diretos
+SCHEMA = """
+CREATE TABLE categories (id serial PRIMARY KEY, name text);
+INSERT INTO categories (name) SELECT 'Categoria ' || g FROM generate_series(1, 8) g;
+CREATE TABLE products (
+    id serial PRIMARY KEY, name varchar(255) UNIQUE NOT NULL, description text,
+    cost_price numeric(10,2), sale_price numeric(10,2), date_added date,
+    active boolean DEFAULT true, category_id int REFERENCES categories(id)
+);
+CREATE TABLE clients (
+    id serial PRIMARY KEY, name varchar(255), cpf_cnpj varchar(20) UNIQUE,
+    email varchar(255), phone varchar(30), address text
+);
+CREATE TABLE suppliers (id serial PRIMARY KEY, name text);
+INSERT INTO suppliers (name) SELECT 'Fornecedor ' || g FROM generate_series(1, 10) g;
+CREATE TABLE stores (id serial PRIMARY KEY, name text, location text);
+INSERT INTO stores (name, location) SELECT 'Loja ' || g, 'Local' FROM generate_series(1, 5) g;
+CREATE TABLE product_entries (
+    id serial PRIMARY KEY, supplier_id int REFERENCES suppliers(id), entry_date timestamp,
+    invoice_number varchar(50), total_value numeric(12,2), status varchar(20)
+);
+CREATE TABLE product_entry_items (
+    id serial PRIMARY KEY, product_entry_id int REFERENCES product_entries(id),
+    product_id int REFERENCES products(id), quantity int, unit_price numeric(10,2),
+    total_price numeric(12,2), lot_number varchar(50), expiration_date date, received_at timestamp
+);
+CREATE TABLE internal_distributions (
+    id serial PRIMARY KEY, from_store_id int REFERENCES stores(id),
+    to_store_id int REFERENCES stores(id), distribution_date timestamp, status varchar(20)
+);
+CREATE TABLE internal_distribution_items (
+    id serial PRIMARY KEY, internal_distribution_id int REFERENCES internal_distributions(id),
+    product_id int REFERENCES products(id), quantity int
+);
+CREATE TABLE sales (
+    id serial PRIMARY KEY, client_id int REFERENCES clients(id), store_id int REFERENCES stores(id),
+    sale_date timestamp, status varchar(20), total_value numeric(12,2)
+);
+CREATE TABLE sale_items (
+    id serial PRIMARY KEY, sale_id int REFERENCES sales(id), product_id int REFERENCES products(id),
+    quantity int, unit_price numeric(10,2), total_price numeric(12,2)
+);
+CREATE TABLE stock (
+    store_id int REFERENCES stores(id), product_id int REFERENCES products(id), quantity int,
+    PRIMARY KEY (store_id, product_id)
+);
+CREATE TABLE stock_movements (
+    id serial PRIMARY KEY, product_id int REFERENCES products(id), store_id int REFERENCES stores(id),
+    quantity int, reference_id int, movement_type varchar(20), created_at timestamp
+);
+"""
+
+
+@pytest.fixture(autouse=True)
+def seed_env(monkeypatch):
+    # Configuração previsível: sem relatório em disco, lote fixo, semente fixa
+    for name in list(os.environ):
+        if name.startswith("SEED_") and name != DATABASE_URL_ENV:
+            monkeypatch.delenv(name)
+    monkeypatch.delenv("DRY_RUN", raising=False)
+    monkeypatch.setenv("SEED_SIZE", "small")
+    monkeypatch.setenv("SEED_METRICS_REPORT", "")
+    monkeypatch.setenv("SEED_ADAPTIVE_BATCH", "false")
+    monkeypatch.setenv("SEED_RANDOM_SEED", "7")
+
+
+@pytest.fixture
+def pg_params():
+    """
+    Connection params of a fresh schema in the test database (psycopg2 style).
+    """
+    psycopg2 = pytest.importorskip("psycopg2")
+    dsn = os.getenv(DATABASE_URL_ENV)
+    if not dsn:
+        pytest.skip(f"{DATABASE_URL_ENV} não definido")
+
+    schema = f"seed_test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"CREATE SCHEMA {schema}")
+        cur.execute(f"SET search_path TO {schema}")
+        cur.execute(SCHEMA)
+    try:
+        yield {"dsn": dsn, "options": f"-c search_path={schema}"}
+    finally:
+        with admin.cursor() as cur:
+            cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        admin.close()
+
+
+@pytest.fixture
+def pg_conn(pg_params):
+    import psycopg2
+
+    conn = psycopg2.connect(**pg_params)
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from seed.core.async_db_utils import (
+    PG_MAX_PARAMS,
+    async_fast_insert,
+    async_get_connection,
+)
+from seed.core.metrics import AsyncMeteredCursor, StageMetrics
+from seed.core.seed_runner import SeedRunner
+
+pytest.importorskip("psycopg")
+
+COLUMNS = ["name", "cpf_cnpj", "email"]
+
+
+def _clients(start, stop):
+    return ((f"Cliente {i}", f"{i:011d}", f"c{i}@email.com") for i in range(start, stop))
+
+
+def _run(pg_params, work):
+    async def main():
+        conn = await async_get_connection(pg_params)
+        try:
+            metrics = StageMetrics("test")
+            async with conn.cursor() as cur:
+                result = await work(AsyncMeteredCursor(cur, metrics))
+            await conn.commit()
+            return result, metrics
+        finally:
+            await conn.close()
+
+    return asyncio.run(main())
+
+
+def test_async_fast_insert_counts_rows_inserted(pg_params):
+    async def work(cur):
+        first = await async_fast_insert(cur, "clients", COLUMNS, _clients(0, 25), page_size=10)
+        # 15 dos 30 já existem: ON CONFLICT DO NOTHING os descarta
+        second = await async_fast_insert(
+            cur, "clients", COLUMNS, _clients(10, 40),
+            on_conflict="(cpf_cnpj) DO NOTHING", page_size=10
+        )
+        return first, second
+
+    (first, second), metrics = _run(pg_params, work)
+    assert (first, second) == (25, 15)
+    assert metrics.rows_generated["clients"] == 55
+    assert metrics.rows_written["clients"] == 40
+    assert metrics.rows_rejected() == {"clients": 15}
+
+
+def test_async_pages_stay_under_the_parameter_limit(pg_params):
+    rows = PG_MAX_PARAMS // len(COLUMNS) + 500
+
+    async def work(cur):
+        # Uma página pedida com mais de 65.535 parâmetros é dividida
+        return await async_fast_insert(cur, "clients", COLUMNS, _clients(0, rows), page_size=rows)
+
+    inserted, metrics = _run(pg_params, work)
+    assert inserted == rows
+    assert metrics.sql_statements == 2
+
+
+def test_runner_uses_the_async_backend(pg_params, pg_conn, monkeypatch):
+    def clients():
+        with pg_conn.cursor() as cur:
+            cur.execute("SELECT name, cpf_cnpj, email, phone, address FROM clients ORDER BY cpf_cnpj")
+            rows = cur.fetchall()
+            cur.execute("TRUNCATE clients RESTART IDENTITY CASCADE")
+        pg_conn.commit()
+        return rows
+
+    SeedRunner(pg_conn, conn_params=pg_params).run_selected(["clients"])
+    sync_rows = clients()
+
+    monkeypatch.setenv("SEED_DB_BACKEND", "async")
+    runner = SeedRunner(pg_conn, conn_params=pg_params)
+    runner.run_selected(["clients"])
+
+    metrics = runner.last_run["metrics"]["clients"]
+    assert metrics["stage"] == "AsyncSeedClients"
+    assert metrics["rows_written"] == {"clients": 20}
+    assert clients() == sync_rows
+
+
+def test_runner_rejects_an_unknown_backend(monkeypatch):
+    monkeypatch.setenv("SEED_DB_BACKEND", "asyncpg")
+    with pytest.raises(ValueError, match="SEED_DB_BACKEND"):
+        SeedRunner(None)
@@ -0,0 +1,105 @@
+import pytest
+
+from seed.config.seed_settings import load_settings
+from seed.core import batch_sizer
+from seed.core.batch_sizer import MAX_STATEMENT_SECONDS, MIN_BATCH_SIZE, PROBE_INTERVAL, BatchSizer
+from seed.core.metrics import StageMetrics
+from seed.seeds.seed_products import SeedProducts
+
+
+def _record(sizer, seconds):
+    sizer.record(sizer.size, seconds)
+
+
+def test_fixed_size_never_changes():
+    sizer = BatchSizer(500)
+    for _ in range(10):
+        _record(sizer, 0.001)
+    _record(sizer, MAX_STATEMENT_SECONDS * 2)
+    assert sizer.size == 500
+
+
+def test_grows_while_throughput_improves():
+    sizer = BatchSizer(1000, adaptive=True, maximum=10000)
+    assert sizer.size == MIN_BATCH_SIZE
+    # Mesmo tempo por comando: dobrar o lote dobra a vazão
+    for expected in (200, 400, 800, 1600):
+        _record(sizer, 0.1)
+        assert sizer.size == expected
+
+
+def test_falls_back_to_the_best_size_when_growth_stops_paying():
+    sizer = BatchSizer(1000, adaptive=True, maximum=10000)
+    _record(sizer, 0.1)  # 100 linhas: 1000/s
+    _record(sizer, 0.1)  # 200 linhas: 2000/s
+    _record(sizer, 0.4)  # 400 linhas: 1000/s, pior
+    assert sizer.size == 200
+    # Estável no melhor tamanho até a próxima sondagem
+    for _ in range(PROBE_INTERVAL - 1):
+        _record(sizer, 0.1)
+        assert sizer.size == 200
+    _record(sizer, 0.1)
+    assert sizer.size == 400
+
+
+def test_is_clamped_to_the_maximum():
+    sizer = BatchSizer(200, adaptive=True, maximum=300)
+    for _ in range(10):
+        _record(sizer, 0.01)
+    assert sizer.size == 300
+
+
+def test_maximum_is_at_least_the_profile_size():
+    assert BatchSizer(1000, adaptive=True, maximum=10).maximum == 1000
+
+
+def test_slow_statements_halve_the_batch_down_to_the_minimum():
+    sizer = BatchSizer(1000, adaptive=True, maximum=10000)
+    for _ in range(4):
+        _record(sizer, 0.01)
+    assert sizer.size == 1600
+    _record(sizer, MAX_STATEMENT_SECONDS + 1)
+    assert sizer.size == 800
+    for _ in range(10):
+        _record(sizer, MAX_STATEMENT_SECONDS + 1)
+    assert sizer.size == MIN_BATCH_SIZE
+
+
+def test_memory_pressure_halves_and_caps_the_batch(monkeypatch):
+    sizer = BatchSizer(1000, adaptive=True, maximum=10000, memory_limit=100)
+    monkeypatch.setattr(batch_sizer, "current_rss", lambda: 50)
+    for _ in range(3):
+        _record(sizer, 0.01)
+    assert sizer.size == 800
+    monkeypatch.setattr(batch_sizer, "current_rss", lambda: 200)
+    _record(sizer, 0.01)
+    assert sizer.size == 400
+    assert sizer.maximum == 400
+    monkeypatch.setattr(batch_sizer, "current_rss", lambda: 50)
+    for _ in range(PROBE_INTERVAL * 2):
+        _record(sizer, 0.001)
+    assert sizer.size <= 400
+
+
+def test_partial_batches_do_not_change_the_size():
+    sizer = BatchSizer(1000, adaptive=True, maximum=10000)
+    sizer.record(10, MAX_STATEMENT_SECONDS * 2)
+    assert sizer.size == MIN_BATCH_SIZE
+
+
+def test_batch_sizes_are_counted_in_the_metrics():
+    metrics = StageMetrics("test")
+    sizer = BatchSizer(500, metrics=metrics)
+    sizer.record(500, 0.1)
+    sizer.record(500, 0.1)
+    sizer.record(20, 0.1)
+    assert dict(metrics.batch_sizes) == {500: 2, 20: 1}
+
+
+@pytest.mark.parametrize("dry_run, adaptive", [("false", True), ("true", False)])
+def test_dry_run_disables_adaptive_batches(monkeypatch, dry_run, adaptive):
+    monkeypatch.setenv("SEED_ADAPTIVE_BATCH", "true")
+    monkeypatch.setenv("DRY_RUN", dry_run)
+    settings = load_settings()
+    seed = SeedProducts(None, settings["CURRENT_PROFILE"], settings)
+    assert seed.batch_sizer.adaptive is adaptive
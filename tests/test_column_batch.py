@@ -0,0 +1,32 @@
+import pytest
+
+from seed.core.column_batch import ColumnBatch, iter_rows, rebatch
+from seed.core.random_streams import chunk_spans
+
+
+def _batch(start, stop):
+    return ColumnBatch(["a", "b"], {"a": list(range(start, stop)), "b": [str(i) for i in range(start, stop)]})
+
+
+def test_rows_and_dicts_follow_the_columns():
+    batch = _batch(0, 3)
+    assert list(batch.rows(["b", "a"])) == [("0", 0), ("1", 1), ("2", 2)]
+    assert batch.to_dicts()[1] == {"a": 1, "b": "1"}
+    with pytest.raises(ValueError):
+        ColumnBatch(["a", "b"], {"a": [1], "b": []})
+
+
+@pytest.mark.parametrize("size", [1, 3, 4, 10, 100])
+def test_rebatch_regroups_without_losing_rows(size):
+    pieces = [_batch(0, 4), _batch(4, 5), _batch(5, 5), _batch(5, 17)]
+    batches = list(rebatch(pieces, size))
+
+    assert all(len(batch) == size for batch in batches[:-1])
+    assert 0 < len(batches[-1]) <= size
+    assert [a for a, _ in iter_rows(batches)] == list(range(17))
+
+
+def test_chunk_spans_split_on_chunk_boundaries():
+    assert list(chunk_spans(0, 10, chunk_rows=4)) == [(0, 0, 4), (1, 0, 4), (2, 0, 2)]
+    assert list(chunk_spans(6, 5, chunk_rows=4)) == [(1, 2, 4), (2, 0, 3)]
+    assert list(chunk_spans(3, 0, chunk_rows=4)) == []
@@ -0,0 +1,45 @@
+import pytest
+
+from seed.core import dataset
+
+
+def test_materialize_refuses_an_existing_dataset(tmp_path):
+    dataset.materialize(tmp_path, compression="gzip")
+    with pytest.raises(FileExistsError):
+        dataset.materialize(tmp_path, compression="gzip")
+
+
+def test_load_replays_a_materialized_dataset(tmp_path, pg_conn):
+    manifest = dataset.materialize(tmp_path, compression="gzip")
+    assert manifest["seed"] == 7
+
+    loaded = dataset.load(pg_conn, tmp_path)
+    assert loaded == {table: entry["rows"] for table, entry in manifest["tables"].items()}
+
+    with pg_conn.cursor() as cur:
+        # As sequences seguem depois dos ids carregados
+        cur.execute("INSERT INTO products (name, category_id) VALUES ('Depois do load', 1) RETURNING id")
+        assert cur.fetchone()[0] == manifest["tables"]["products"]["rows"] + 1
+        cur.execute(
+            "SELECT count(*) FROM sale_items i LEFT JOIN sales s ON s.id = i.sale_id WHERE s.id IS NULL"
+        )
+        assert cur.fetchone()[0] == 0
+    pg_conn.rollback()
+
+
+def test_load_requires_empty_tables(tmp_path, pg_conn):
+    dataset.materialize(tmp_path, compression="gzip")
+    with pg_conn.cursor() as cur:
+        cur.execute("INSERT INTO clients (name) VALUES ('Já existe')")
+    pg_conn.commit()
+
+    with pytest.raises(ValueError, match="não está vazia"):
+        dataset.load(pg_conn, tmp_path)
+
+
+def test_load_checks_the_format_version(tmp_path, pg_conn):
+    dataset.materialize(tmp_path, compression="gzip")
+    manifest = tmp_path / dataset.MANIFEST_FILE
+    manifest.write_text(manifest.read_text().replace('"version": 1', '"version": 99'))
+    with pytest.raises(ValueError, match="versão 99"):
+        dataset.load(pg_conn, tmp_path)
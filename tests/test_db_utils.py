@@ -0,0 +1,124 @@
+from datetime import date, datetime
+
+import pytest
+
+from seed.core.db_utils import (
+    _text_row,
+    bulk_insert,
+    copy_insert,
+    fast_insert,
+    insert_parent_children,
+)
+
+COLUMNS = ["name", "cpf_cnpj", "email"]
+
+
+def _clients(start, stop):
+    return [(f"Cliente {i}", f"{i:011d}", f"cliente{i}@email.com") for i in range(start, stop)]
+
+
+def _count(conn, table):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT count(*) FROM {table}")
+        return cur.fetchone()[0]
+
+
+def test_text_row_escapes_copy_specials():
+    row = ("a\tb", "linha\nnova", "barra\\", None, True, date(2024, 1, 2), datetime(2024, 1, 2, 3, 4))
+    assert _text_row(row) == (
+        b"a\\tb\tlinha\\nnova\tbarra\\\\\t\\N\tt\t2024-01-02\t2024-01-02T03:04:00\n"
+    )
+
+
+@pytest.mark.parametrize("fmt", ["text", "binary"])
+def test_copy_insert_stages_on_conflict(pg_conn, fmt):
+    with pg_conn.cursor() as cur:
+        assert copy_insert(cur, "clients", COLUMNS, iter(_clients(0, 100)), fmt=fmt) == 100
+        # Metade já existe: o staging + ON CONFLICT só grava as novas
+        inserted = copy_insert(
+            cur, "clients", COLUMNS, iter(_clients(50, 150)),
+            on_conflict="(cpf_cnpj) DO NOTHING", fmt=fmt
+        )
+        assert inserted == 50
+        cur.execute("SELECT to_regclass('pg_temp._copy_stage_clients')")
+        assert cur.fetchone()[0] is None
+    pg_conn.commit()
+    assert _count(pg_conn, "clients") == 150
+
+
+def test_fast_insert_counts_rows_inserted(pg_conn):
+    with pg_conn.cursor() as cur:
+        assert fast_insert(cur, "clients", COLUMNS, iter(_clients(0, 30)), page_size=7) == 30
+        inserted = fast_insert(
+            cur, "clients", COLUMNS, iter(_clients(20, 40)),
+            on_conflict="(cpf_cnpj) DO NOTHING", page_size=7
+        )
+    assert inserted == 10
+
+
+def test_bulk_insert_switches_to_copy(pg_conn, monkeypatch):
+    monkeypatch.setattr("seed.core.db_utils.COPY_THRESHOLD", 10)
+    with pg_conn.cursor() as cur:
+        assert bulk_insert(cur, "clients", COLUMNS, _clients(0, 9)) == 9
+        assert bulk_insert(cur, "clients", COLUMNS, iter(_clients(9, 30)), row_count=21) == 21
+    assert _count(pg_conn, "clients") == 30
+
+
+def test_insert_parent_children_keeps_input_order(pg_conn):
+    headers = [(store, store % 5 + 1, datetime(2024, 1, store), "completed") for store in range(1, 6)]
+    children = [[(1, quantity)] * quantity for quantity in range(1, 6)]
+    with pg_conn.cursor() as cur:
+        cur.execute("INSERT INTO products (name, category_id) VALUES ('Produto', 1)")
+        ids = insert_parent_children(
+            cur,
+            "internal_distributions",
+            ["from_store_id", "to_store_id", "distribution_date", "status"],
+            headers,
+            "internal_distribution_items",
+            ["product_id", "quantity"],
+            children,
+            fk_column="internal_distribution_id",
+        )
+        cur.execute(
+            "SELECT d.id, d.from_store_id, count(i.id), min(i.quantity) "
+            "FROM internal_distributions d JOIN internal_distribution_items i "
+            "ON i.internal_distribution_id = d.id GROUP BY d.id ORDER BY d.id"
+        )
+        rows = cur.fetchall()
+
+    assert list(ids) == [row[0] for row in rows]
+    # O cabeçalho i recebeu exatamente os itens children[i]
+    assert [(from_store, count, quantity) for _, from_store, count, quantity in rows] == [
+        (i, i, i) for i in range(1, 6)
+    ]
+
+
+def test_insert_parent_children_does_not_rely_on_ascending_ids(pg_conn):
+    headers = [(1, 2, datetime(2024, 1, day), "completed") for day in range(1, 6)]
+    children = [[(1, quantity)] for quantity in range(1, 6)]
+    with pg_conn.cursor() as cur:
+        cur.execute("INSERT INTO products (name, category_id) VALUES ('Produto', 1)")
+        # Ids decrescentes: ordenar o RETURNING trocaria os itens de cabeçalho
+        cur.execute(
+            "ALTER SEQUENCE internal_distributions_id_seq "
+            "INCREMENT BY -1 MINVALUE 1 MAXVALUE 1000 RESTART WITH 1000"
+        )
+        ids = insert_parent_children(
+            cur,
+            "internal_distributions",
+            ["from_store_id", "to_store_id", "distribution_date", "status"],
+            headers,
+            "internal_distribution_items",
+            ["product_id", "quantity"],
+            children,
+            fk_column="internal_distribution_id",
+        )
+        cur.execute(
+            "SELECT d.id, extract(day FROM d.distribution_date)::int, i.quantity "
+            "FROM internal_distributions d JOIN internal_distribution_items i "
+            "ON i.internal_distribution_id = d.id"
+        )
+        rows = {row[0]: row[1:] for row in cur.fetchall()}
+
+    assert ids == [1000, 999, 998, 997, 996]
+    assert [rows[i] for i in ids] == [(day, day) for day in range(1, 6)]
@@ -0,0 +1,78 @@
+import threading
+import time
+
+import pytest
+
+from seed.core.fake_api import CENTRAL_STORE_ID, FakeSystockAPI
+from seed.core.http_client import RateLimiter, SeedHttpClient
+from seed.core.metrics import StageMetrics
+
+
+def _entry(product_id, quantity):
+    return {"items": [{"product_id": product_id, "quantity": quantity}]}
+
+
+def _sale(product_id, quantity=1):
+    return {"store_id": CENTRAL_STORE_ID, "items": [{"product_id": product_id, "quantity": quantity}]}
+
+
+def test_requests_sharing_a_key_keep_their_order():
+    # Com jitter, uma venda enviada antes da entrada seria recusada (400)
+    with FakeSystockAPI(latency=0.001, jitter=0.01) as api:
+        with SeedHttpClient(max_workers=8) as client:
+            for product_id in range(1, 6):
+                key = [(CENTRAL_STORE_ID, product_id)]
+                client.submit(api.url + "/entries", _entry(product_id, 4), order_keys=key)
+                for _ in range(4):
+                    client.submit(api.url + "/sales", _sale(product_id), order_keys=key)
+
+        assert api.counts["/sales"] == 20
+        assert all(row["quantity"] == 0 for row in api.stock_rows())
+
+
+def test_server_errors_are_retried():
+    metrics = StageMetrics("test")
+    with FakeSystockAPI(error_rate=0.3) as api:
+        with SeedHttpClient(max_workers=4, retries=12, backoff=0.001, metrics=metrics) as client:
+            for product_id in range(1, 31):
+                client.submit(api.url + "/entries", _entry(product_id, 1), table="product_entries")
+
+        assert api.counts["/entries"] == 30
+    assert metrics.rows_written["product_entries"] == 30
+    # Cada 503 custou uma requisição a mais
+    assert metrics.http_requests >= 30
+
+
+def test_a_rejected_request_fails_the_block():
+    with FakeSystockAPI() as api:
+        with pytest.raises(RuntimeError, match="Erro ao vender: 400"):
+            with SeedHttpClient(max_workers=2, backoff=0.001) as client:
+                client.submit(api.url + "/sales", _sale(1), error_prefix="Erro ao vender")
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(rate=50, burst=1)
+    started = time.monotonic()
+    for _ in range(11):
+        limiter.acquire()
+    # O primeiro sai do balde cheio; os outros 10 esperam 1/50 s cada
+    assert time.monotonic() - started >= 0.19
+
+
+def test_submit_blocks_when_too_many_requests_are_pending():
+    peak = 0
+    lock = threading.Lock()
+    with FakeSystockAPI(latency=0.01) as api:
+        with SeedHttpClient(max_workers=2, max_pending=4) as client:
+            for product_id in range(1, 41):
+                client.submit(
+                    api.url + "/entries", _entry(product_id, 1),
+                    order_keys=[(CENTRAL_STORE_ID, product_id % 3)]
+                )
+                with lock:
+                    peak = max(peak, len(client._pending))
+
+        assert api.counts["/entries"] == 40
+    # Nada concluído continua retido
+    assert client._pending == {} and client._last_by_key == {}
+    assert peak <= 4
@@ -0,0 +1,88 @@
+import random
+from collections import Counter
+
+from seed.core.product_cache import ProductCache
+from seed.generators.inventory_simulator import CENTRAL_STORE_ID, InventorySimulator
+
+
+def _products(count):
+    cache = ProductCache()
+    cache._add((pid, 10.0 + pid, 8.0, pid % 4 + 1) for pid in range(1, count + 1))
+    return cache
+
+
+def _simulator(seed=7, products=50):
+    return InventorySimulator(
+        _products(products),
+        supplier_ids=[1, 2, 3],
+        store_ids=[1, 2, 3, 4],
+        client_ids=list(range(1, 21)),
+        rng=random.Random(seed),
+    )
+
+
+def _replay(events):
+    """Apply the documents in order; returns the final stock per (store, product)."""
+    stock = Counter()
+    for kind, payload in events:
+        for item in payload["items"]:
+            key = item["product_id"]
+            quantity = item["quantity"]
+            assert quantity > 0
+            if kind == "entry":
+                stock[CENTRAL_STORE_ID, key] += quantity
+            elif kind == "distribution":
+                assert payload["from_store_id"] == CENTRAL_STORE_ID
+                assert payload["to_store_id"] != CENTRAL_STORE_ID
+                stock[CENTRAL_STORE_ID, key] -= quantity
+                stock[payload["to_store_id"], key] += quantity
+            else:
+                assert payload["store_id"] != CENTRAL_STORE_ID
+                stock[payload["store_id"], key] -= quantity
+            assert min(stock.values(), default=0) >= 0, f"estoque negativo após {kind}"
+    return stock
+
+
+def test_documents_never_take_more_than_the_stock():
+    simulator = _simulator()
+    stock = _replay(simulator.events(200, 150, 300))
+
+    # O razão do simulador termina com o mesmo estoque do replay
+    for (store_id, product_id), quantity in stock.items():
+        ledger = simulator.central if store_id == CENTRAL_STORE_ID else simulator.stores
+        assert ledger.quantity(store_id, product_id) == quantity
+
+
+def test_documents_are_chronological():
+    dates = [
+        payload.get("entry_date") or payload.get("distribution_date") or payload["sale_date"]
+        for _, payload in _simulator().events(50, 40, 80)
+    ]
+    assert dates == sorted(dates)
+
+
+def test_same_seed_same_documents():
+    def documents(seed):
+        return [
+            (kind, [(i["product_id"], i["quantity"]) for i in payload["items"]])
+            for kind, payload in _simulator(seed).events(30, 20, 40)
+        ]
+
+    assert documents(3) == documents(3)
+    assert documents(3) != documents(4)
+
+
+def test_deferred_documents_meet_the_profile_counts():
+    # Perfil SMALL: no início quase todas as vendas chegam antes do estoque
+    simulator = _simulator()
+    kinds = Counter(kind for kind, _ in simulator.events(20, 15, 30))
+
+    assert kinds == {"entry": 20, "distribution": 15, "sale": 30}
+    assert simulator.shortfall == {"distribution": 0, "sale": 0}
+
+
+def test_missing_stock_is_reported_as_shortfall():
+    # Sem entradas nada pode ser distribuído nem vendido
+    simulator = _simulator()
+    assert list(simulator.events(0, 5, 10)) == []
+    assert simulator.shortfall == {"distribution": 5, "sale": 10}
@@ -0,0 +1,42 @@
+import pytest
+
+from seed.generators.client_generator import ClientGenerator
+from seed.generators.permutation import FeistelPermutation
+
+
+@pytest.mark.parametrize("size", [2, 3, 10, 257, 1000, 4096])
+def test_permutation_is_a_bijection(size):
+    permutation = FeistelPermutation(size, key=42)
+    assert sorted(permutation(i) for i in range(size)) == list(range(size))
+
+
+def test_permutation_depends_on_the_key():
+    values = [FeistelPermutation(1000, key)(7) for key in range(20)]
+    assert len(set(values)) > 1
+    assert FeistelPermutation(1000, 3)(7) == FeistelPermutation(1000, 3)(7)
+
+
+def test_permutation_rejects_values_outside_the_domain():
+    permutation = FeistelPermutation(10, key=1)
+    with pytest.raises(ValueError):
+        permutation(10)
+    with pytest.raises(ValueError):
+        FeistelPermutation(1, key=1)
+
+
+def test_vectorized_permutation_matches_scalar():
+    np = pytest.importorskip("numpy")
+    permutation = FeistelPermutation(10 ** 9, key=0xC0FFEE)
+    values = np.arange(0, 10 ** 9, 9_999_991, dtype=np.uint64)
+    assert permutation.apply(values).tolist() == [permutation(int(v)) for v in values]
+
+
+def test_client_cpfs_are_unique_and_valid():
+    generator = ClientGenerator(vectorized=False)
+    cpfs = [generator.cpf_for_index(i) for i in range(20_000)]
+    assert len(set(cpfs)) == len(cpfs)
+    for cpf in cpfs[:500]:
+        digits = [int(c) for c in cpf if c.isdigit()]
+        for position in (9, 10):
+            total = sum((position + 1 - i) * d for i, d in enumerate(digits[:position])) % 11
+            assert digits[position] == (11 - total if total > 1 else 0)
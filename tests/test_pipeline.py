@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+from seed.core.pipeline import BatchPipeline
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_batches_arrive_in_order():
+    with BatchPipeline(iter(range(50)), max_pending=3) as stream:
+        assert list(stream) == list(range(50))
+
+
+def test_full_queue_blocks_the_producer():
+    produced = []
+
+    def batches():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    with BatchPipeline(batches(), max_pending=2) as stream:
+        consumed = iter(stream)
+        assert next(consumed) == 0
+        # Fila cheia: o produtor para com max_pending lotes prontos (+1 em mãos)
+        assert _wait_for(lambda: len(produced) >= 4)
+        time.sleep(0.2)
+        assert len(produced) == 4
+        assert list(consumed) == list(range(1, 20))
+    assert len(produced) == 20
+
+
+def test_producer_error_reaches_the_consumer():
+    def batches():
+        yield 1
+        yield 2
+        raise ValueError("gerador quebrou")
+
+    received = []
+    with pytest.raises(ValueError, match="gerador quebrou"):
+        with BatchPipeline(batches(), max_pending=4) as stream:
+            for batch in stream:
+                received.append(batch)
+    assert received == [1, 2]
+
+
+def test_leaving_early_stops_the_producer():
+    def batches():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    pipeline = BatchPipeline(batches(), max_pending=2)
+    with pipeline as stream:
+        for batch in stream:
+            if batch == 3:
+                break
+    assert not pipeline._thread.is_alive()
+
+
+def test_consumer_error_stops_the_producer():
+    pipeline = BatchPipeline(iter(range(1000)), max_pending=2)
+    with pytest.raises(RuntimeError):
+        with pipeline as stream:
+            for batch in stream:
+                raise RuntimeError("falha na escrita")
+    assert not pipeline._thread.is_alive()
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+import pricing
+from seed.core.random_streams import RandomStreams, draw_integers
+from seed.generators.client_generator import ClientGenerator
+from seed.generators.product_generator import ProductGenerator
+
+pytest.importorskip("numpy")
+
+
+def test_draw_integers_is_the_same_with_and_without_numpy():
+    vector = draw_integers(random.Random(5), 1000, 3, 17, vectorized=True)
+    plain = draw_integers(random.Random(5), 1000, 3, 17, vectorized=False)
+    assert vector.tolist() == plain
+    assert min(plain) == 3 and max(plain) == 16
+
+    lows, highs = list(range(100)), [low * 2 + 1 for low in range(100)]
+    vector = draw_integers(random.Random(5), 100, lows, highs, vectorized=True)
+    assert vector.tolist() == draw_integers(random.Random(5), 100, lows, highs, vectorized=False)
+    assert all(low <= value < high for value, low, high in zip(vector.tolist(), lows, highs))
+
+
+def test_prices_do_not_depend_on_numpy():
+    categories = list(pricing.PRICE_RANGES) * 50
+    vector = pricing.generate_prices_batch(categories, random.Random(9), vectorized=True)
+    assert vector == pricing.generate_prices_batch(categories, random.Random(9), vectorized=False)
+    for category, cost, sale in zip(categories, *vector):
+        low, high = pricing.PRICE_RANGES[category]
+        assert low <= sale <= high
+        assert 0.6 * sale - 0.01 <= cost <= 0.8 * sale
+
+
+def test_clients_do_not_depend_on_numpy():
+    def rows(vectorized):
+        generator = ClientGenerator(streams=RandomStreams(3), vectorized=vectorized)
+        return [row for batch in generator.iter_column_batches(1500, 400) for row in batch.rows()]
+
+    assert rows(True) == rows(False)
+
+
+def test_products_do_not_depend_on_numpy(monkeypatch):
+    def rows():
+        generator = ProductGenerator(streams=RandomStreams(3))
+        return [row for batch in generator.iter_column_batches(1500, 400) for row in batch.rows()]
+
+    with_numpy = rows()
+    monkeypatch.setattr(pricing, "np", None)
+    assert rows() == with_numpy
@@ -0,0 +1,161 @@
+import threading
+import time
+
+import pytest
+
+from seed.core.base_seed import BaseSeed
+from seed.core.fake_api import FakeSystockAPI
+from seed.core.seed_runner import SeedRunner
+from seed.core.sinks import NullSink
+from seed.config.seed_settings import load_settings
+
+DEPENDENCIES = {
+    "a": [],
+    "b": [],
+    "c": ["a"],
+    "d": ["b", "c"],
+}
+
+
+def _stages(log, delay=0.0, fail=()):
+    """Stage classes that record (name, start, end) in `log`."""
+    lock = threading.Lock()
+
+    def execute(self, cur):
+        started = time.perf_counter()
+        time.sleep(delay)
+        if self.stage_name in fail:
+            raise RuntimeError(f"falha em {self.stage_name}")
+        with lock:
+            log.append((self.stage_name, started, time.perf_counter()))
+        return True
+
+    return {
+        name: type(f"Stage_{name}", (BaseSeed,), {"stage_name": name, "execute": execute})
+        for name in DEPENDENCIES
+    }
+
+
+def _assert_dependencies_respected(log):
+    finished = {name: end for name, _, end in log}
+    for name, started, _ in log:
+        for dep in DEPENDENCIES[name]:
+            if dep in finished:
+                assert finished[dep] <= started, f"{name} começou antes de {dep} terminar"
+
+
+def test_sequential_dag_respects_dependencies():
+    log = []
+    runner = SeedRunner(None, sink=NullSink())
+    runner._run_dag(_stages(log), list(DEPENDENCIES), DEPENDENCIES)
+
+    assert sorted(name for name, _, _ in log) == sorted(DEPENDENCIES)
+    _assert_dependencies_respected(log)
+    assert set(runner.last_run["metrics"]) == set(DEPENDENCIES)
+
+
+def test_unselected_dependencies_are_satisfied():
+    log = []
+    runner = SeedRunner(None, sink=NullSink())
+    runner._run_dag(_stages(log), ["d"], DEPENDENCIES)
+    assert [name for name, _, _ in log] == ["d"]
+
+
+def test_critical_path_follows_longest_chain():
+    graph = {"a": [], "b": [], "c": ["a"], "d": ["b", "c"]}
+    durations = {"a": 1.0, "b": 5.0, "c": 1.0, "d": 2.0}
+    assert SeedRunner._critical_path(graph, durations) == (["b", "d"], 7.0)
+    durations["c"] = 10.0
+    assert SeedRunner._critical_path(graph, durations) == (["a", "c", "d"], 13.0)
+
+
+def test_parallel_dag_overlaps_independent_stages(pg_params, monkeypatch):
+    monkeypatch.setenv("SEED_PARALLEL_STAGES", "2")
+    log = []
+    runner = SeedRunner(None, conn_params=pg_params)
+    runner._run_dag(_stages(log, delay=0.2), list(DEPENDENCIES), DEPENDENCIES)
+
+    _assert_dependencies_respected(log)
+    spans = {name: (started, end) for name, started, end in log}
+    # a e b não dependem de nada: rodam ao mesmo tempo
+    assert spans["a"][0] < spans["b"][1] and spans["b"][0] < spans["a"][1]
+
+
+def test_parallel_dag_raises_first_error(pg_params, monkeypatch):
+    monkeypatch.setenv("SEED_PARALLEL_STAGES", "2")
+    log = []
+    runner = SeedRunner(None, conn_params=pg_params)
+    with pytest.raises(RuntimeError, match="falha em a"):
+        runner._run_dag(_stages(log, delay=0.05, fail={"a"}), list(DEPENDENCIES), DEPENDENCIES)
+    # Nada que dependa do estágio com erro é agendado
+    assert {name for name, _, _ in log} <= {"b"}
+
+
+def test_run_on_a_local_sink_uses_the_direct_stages(monkeypatch, tmp_path):
+    # Nenhuma requisição pode sair: a API aponta para uma porta fechada
+    monkeypatch.setenv("SEED_API_URL", "http://127.0.0.1:9")
+    monkeypatch.setenv("SEED_SINK", "sqlite")
+    monkeypatch.setenv("SEED_SINK_PATH", str(tmp_path / "seed.sqlite3"))
+
+    runner = SeedRunner(None)
+    runner.run()
+
+    metrics = runner.last_run["metrics"]
+    assert list(metrics) == ["products", "clients", "entries", "distributions", "sales"]
+    assert metrics["entries"]["stage"] == "SeedEntries"
+    assert all(m["http_requests"] == 0 for m in metrics.values())
+
+
+def test_dry_run_gives_the_api_stages_a_stock_view(monkeypatch):
+    monkeypatch.setenv("DRY_RUN", "true")
+    monkeypatch.setenv("SEED_API_URL", "http://127.0.0.1:9")
+    profile = load_settings()["CURRENT_PROFILE"]
+
+    runner = SeedRunner(None)
+    runner.run()
+
+    inventory = runner.last_run["metrics"]["inventory"]
+    assert inventory["stage"] == "SeedInventoryAPI"
+    assert inventory["shortfall"] == {}
+    assert inventory["http_requests"] == (
+        profile.entries_count + profile.distributions_count + profile.sales_count
+    )
+
+
+def test_selecting_a_simulated_stage_runs_inventory_in_its_place(monkeypatch, tmp_path, caplog):
+    monkeypatch.setenv("SEED_SIMULATE_STOCK", "true")
+    monkeypatch.setenv("SEED_SINK", "sqlite")
+    monkeypatch.setenv("SEED_SINK_PATH", str(tmp_path / "seed.sqlite3"))
+
+    runner = SeedRunner(None)
+    with caplog.at_level("WARNING"):
+        runner.run_selected(["products", "clients", "entries"])
+
+    assert "Unknown seed stage" not in caplog.text
+    assert list(runner.last_run["metrics"]) == ["products", "clients", "inventory"]
+
+
+@pytest.mark.parametrize("simulate", ["false", "true"])
+def test_api_stages_against_the_fake_api(pg_conn, monkeypatch, simulate):
+    profile = load_settings()["CURRENT_PROFILE"]
+    monkeypatch.setenv("SEED_SIMULATE_STOCK", simulate)
+    with FakeSystockAPI(jitter=0.002) as api:
+        monkeypatch.setenv("SEED_API_URL", api.url)
+        runner = SeedRunner(pg_conn)
+        runner.run()
+        stock = api.stock_rows()
+
+    metrics = runner.last_run["metrics"]
+    assert all(row["quantity"] >= 0 for row in stock)
+    assert api.counts["/entries"] == profile.entries_count
+    assert api.counts["/internal-distributions"] == profile.distributions_count
+    if simulate == "true":
+        assert list(metrics) == ["products", "clients", "inventory"]
+        assert metrics["inventory"]["shortfall"] == {}
+        assert api.counts["/sales"] == profile.sales_count
+    else:
+        assert list(metrics) == ["products", "clients", "entries", "distributions", "sales"]
+        # Vendas sem item disponível são puladas: confere com o que o estágio
+        # enviou (http_requests inclui o GET /stock/all)
+        assert 0 < api.counts["/sales"] == metrics["sales"]["http_requests"] - 1
+        assert metrics["sales"]["rows_written"] == {"sales": api.counts["/sales"]}
@@ -0,0 +1,57 @@
+import pytest
+
+from seed.core.seed_runner import SeedRunner
+from seed.seeds.seed_stock import SeedStock
+from seed.config.seed_settings import load_settings
+
+
+def _scalar(conn, query):
+    with conn.cursor() as cur:
+        cur.execute(query)
+        return cur.fetchone()[0]
+
+
+def test_stock_stage_is_opt_in(pg_conn):
+    runner = SeedRunner(pg_conn)
+    runner.run_all()
+    assert set(runner.last_run["metrics"]) == {"products", "clients", "entries", "distributions", "sales"}
+    assert _scalar(pg_conn, "SELECT count(*) FROM stock_movements") == 0
+
+
+def test_materialized_stock_follows_the_simulated_items(pg_conn, monkeypatch):
+    monkeypatch.setenv("SEED_MATERIALIZE_STOCK", "true")
+    profile = load_settings()["CURRENT_PROFILE"]
+
+    runner = SeedRunner(pg_conn)
+    runner.run_all()
+
+    metrics = runner.last_run["metrics"]
+    assert list(metrics) == ["products", "clients", "inventory", "stock"]
+    assert metrics["inventory"]["shortfall"] == {}
+    assert _scalar(pg_conn, "SELECT count(*) FROM product_entries") == profile.entries_count
+    assert _scalar(pg_conn, "SELECT count(*) FROM internal_distributions") == profile.distributions_count
+    assert _scalar(pg_conn, "SELECT count(*) FROM sales") == profile.sales_count
+    # Um movimento por item de entrada, dois por item de distribuição e um por item de venda
+    assert _scalar(pg_conn, "SELECT count(*) FROM stock_movements") == _scalar(
+        pg_conn,
+        """
+        SELECT (SELECT count(*) FROM product_entry_items)
+             + 2 * (SELECT count(*) FROM internal_distribution_items)
+             + (SELECT count(*) FROM sale_items)
+        """
+    )
+    assert _scalar(pg_conn, "SELECT min(quantity) FROM stock") >= 0
+
+
+def test_selecting_sales_runs_the_whole_simulated_chain(pg_conn, monkeypatch):
+    monkeypatch.setenv("SEED_SIMULATE_STOCK", "true")
+    runner = SeedRunner(pg_conn)
+    runner.run_selected(["products", "clients", "sales"])
+    assert list(runner.last_run["metrics"]) == ["products", "clients", "inventory"]
+
+
+def test_negative_stock_is_an_error(pg_conn):
+    # Os estágios diretos aleatórios vendem sem olhar o saldo
+    SeedRunner(pg_conn).run_all()
+    with pytest.raises(RuntimeError, match="negativas"):
+        SeedStock(pg_conn, load_settings()["CURRENT_PROFILE"]).run()
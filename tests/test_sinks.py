@@ -0,0 +1,112 @@
+import json
+
+import pytest
+
+from seed.core.db_utils import bulk_insert, count_rows, insert_parent_children, select_ids
+from seed.core.seed_runner import SeedRunner
+from seed.core.sinks import (
+    CopyFileSink,
+    NullSink,
+    SinkConnection,
+    SQLiteSink,
+    create_sink,
+    open_copy_file,
+)
+from seed.config.seed_settings import load_settings
+
+TABLES = [
+    "products", "clients",
+    "product_entries", "product_entry_items",
+    "internal_distributions", "internal_distribution_items",
+    "sales", "sale_items",
+]
+
+
+def _write_distributions(sink):
+    with SinkConnection(sink).cursor() as cur:
+        return insert_parent_children(
+            cur,
+            "internal_distributions",
+            ["from_store_id", "to_store_id", "status"],
+            [(1, 2, "completed"), (1, 3, "completed")],
+            "internal_distribution_items",
+            ["product_id", "quantity"],
+            [[(10, 1), (11, 2)], [(12, 3)]],
+            fk_column="internal_distribution_id",
+        )
+
+
+def test_null_sink_assigns_sequential_ids():
+    sink = NullSink()
+    assert list(_write_distributions(sink)) == [1, 2]
+    assert list(_write_distributions(sink)) == [3, 4]
+    assert sink.row_counts["internal_distribution_items"] == 6
+
+
+def test_sinks_refuse_reads_they_cannot_answer():
+    sink = NullSink()
+    with SinkConnection(sink).cursor() as cur:
+        assert select_ids(cur, "stores") == [1, 2, 3, 4, 5]
+        with pytest.raises(TypeError, match="não aceitam SQL"):
+            cur.execute("SELECT count(*) FROM stock WHERE quantity < 0")
+    with pytest.raises(ValueError, match="não guarda"):
+        sink.lookup("products", ["name"])
+
+
+def test_create_sink_follows_settings(monkeypatch, tmp_path):
+    assert create_sink(load_settings()) is None
+    monkeypatch.setenv("DRY_RUN", "true")
+    assert type(create_sink(load_settings())) is NullSink
+    monkeypatch.setenv("DRY_RUN", "false")
+    monkeypatch.setenv("SEED_SINK", "sqlite")
+    monkeypatch.setenv("SEED_SINK_PATH", str(tmp_path / "seed.sqlite3"))
+    assert isinstance(create_sink(load_settings()), SQLiteSink)
+    monkeypatch.setenv("SEED_SINK", "csv")
+    with pytest.raises(ValueError):
+        create_sink(load_settings())
+
+
+def test_copy_file_sink_writes_ids_and_manifest(tmp_path):
+    sink = CopyFileSink(tmp_path)
+    _write_distributions(sink)
+    sink.close()
+
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    entry = manifest["tables"]["internal_distribution_items"]
+    assert entry["columns"] == ["id", "internal_distribution_id", "product_id", "quantity"]
+    assert entry["rows"] == 3
+    with open_copy_file(tmp_path / entry["file"], "rb", manifest["compression"]) as f:
+        assert f.read() == b"1\t1\t10\t1\n2\t1\t11\t2\n3\t2\t12\t3\n"
+
+
+def test_sqlite_sink_keeps_on_conflict_semantics(tmp_path):
+    sink = SQLiteSink(tmp_path / "seed.sqlite3")
+    columns = ["name", "cpf_cnpj"]
+    rows = [(f"Cliente {i}", f"{i:011d}") for i in range(10)]
+    with SinkConnection(sink).cursor() as cur:
+        assert bulk_insert(cur, "clients", columns, rows, on_conflict="(cpf_cnpj) DO NOTHING") == 10
+        assert bulk_insert(cur, "clients", columns, rows[5:] + [("Novo", "x")],
+                           on_conflict="(cpf_cnpj) DO NOTHING") == 1
+        assert count_rows(cur, "clients") == 11
+        assert select_ids(cur, "clients", limit=3) == [1, 2, 3]
+    sink.close()
+
+
+@pytest.mark.parametrize("sink_kind", ["null", "copy", "sqlite"])
+def test_direct_stages_run_on_every_sink(monkeypatch, tmp_path, sink_kind):
+    monkeypatch.setenv("SEED_SINK", sink_kind)
+    monkeypatch.setenv("SEED_SINK_PATH", str(tmp_path / "out"))
+    profile = load_settings()["CURRENT_PROFILE"]
+
+    runner = SeedRunner(None, settings=load_settings())
+    runner.run_all()
+
+    written = {}
+    for metrics in runner.last_run["metrics"].values():
+        written.update(metrics["rows_written"])
+    assert written["products"] == profile.products_count
+    assert written["clients"] == profile.clients_count
+    assert written["product_entries"] == profile.entries_count
+    assert written["internal_distributions"] == profile.distributions_count
+    assert written["sales"] == profile.sales_count
+    assert set(written) >= set(TABLES)
@@ -0,0 +1,68 @@
+import random
+
+from seed.core.stock_ledger import StockLedger
+
+
+def test_products_leave_and_return_with_their_stock():
+    ledger = StockLedger()
+    ledger.add(1, 10, 5)
+    ledger.add(1, 11, 2)
+    ledger.add(2, 10, 1)
+    assert ledger.stores == [1, 2]
+    assert ledger.available(1) == 2
+    assert len(ledger) == 3
+
+    ledger.remove(1, 10, 5)
+    assert ledger.quantity(1, 10) == 0
+    assert ledger.available(1) == 1
+    ledger.remove(2, 10, 1)
+    assert ledger.stores == [1]
+
+    ledger.add(2, 10, 3)
+    assert sorted(ledger.stores) == [1, 2]
+    assert ledger.quantity(2, 10) == 3
+
+
+def test_add_ignores_non_positive_quantities():
+    ledger = StockLedger()
+    ledger.add(1, 10, 0)
+    ledger.add(1, 11, -3)
+    assert ledger.stores == []
+    assert ledger.available(1) == 0
+
+
+def test_sample_returns_distinct_in_stock_products():
+    rng = random.Random(5)
+    ledger = StockLedger()
+    for product_id in range(100):
+        ledger.add(1, product_id, product_id % 7 + 1)
+
+    for k in (1, 10, 60, 100, 150):
+        picked = ledger.sample(1, k, rng)
+        ids = [product_id for product_id, _ in picked]
+        assert len(ids) == len(set(ids)) == min(k, 100)
+        assert all(quantity == ledger.quantity(1, pid) for pid, quantity in picked)
+
+
+def test_random_operations_match_a_plain_dict():
+    rng = random.Random(9)
+    ledger = StockLedger()
+    expected = {}
+    for _ in range(5000):
+        store_id, product_id = rng.randint(1, 4), rng.randint(1, 30)
+        current = expected.get((store_id, product_id), 0)
+        if current and rng.random() < 0.5:
+            quantity = rng.randint(1, current)
+            ledger.remove(store_id, product_id, quantity)
+            expected[store_id, product_id] = current - quantity
+        else:
+            quantity = rng.randint(1, 10)
+            ledger.add(store_id, product_id, quantity)
+            expected[store_id, product_id] = current + quantity
+
+    for (store_id, product_id), quantity in expected.items():
+        assert ledger.quantity(store_id, product_id) == quantity
+    assert sorted(ledger.stores) == sorted({s for (s, _), q in expected.items() if q > 0})
+    for store_id in ledger.stores:
+        in_stock = {p for (s, p), q in expected.items() if s == store_id and q > 0}
+        assert ledger.available(store_id) == len(in_stock)
@@ -0,0 +1,68 @@
+"""
+O caminho de streaming (gerador em lotes -> fast_insert / copy_insert) mantém
+o pico de memória limitado pelo batch_size, independente do volume.
+"""
+import tracemalloc
+
+import pytest
+
+from seed.core.column_batch import iter_rows
+from seed.core.db_utils import copy_insert, fast_insert
+from seed.core.random_streams import RandomStreams
+from seed.generators.client_generator import ClientGenerator, CLIENT_COLUMNS
+from seed.generators.product_generator import ProductGenerator, PRODUCT_COLUMNS
+
+BATCH_SIZE = 500
+SMALL_COUNT = 2_000
+LARGE_COUNT = 20_000
+# O pico do volume grande pode variar um pouco, mas nunca crescer com o volume
+MAX_GROWTH = 1.5
+
+GENERATORS = {
+    "products": (ProductGenerator, PRODUCT_COLUMNS, "(name) DO NOTHING"),
+    "clients": (ClientGenerator, CLIENT_COLUMNS, "(cpf_cnpj) DO NOTHING"),
+}
+
+
+def _fast_insert(cur, table, columns, rows, on_conflict):
+    return fast_insert(cur, table, columns, rows, on_conflict=on_conflict, page_size=BATCH_SIZE)
+
+
+def _copy_insert(cur, table, columns, rows, on_conflict):
+    return copy_insert(cur, table, columns, rows, on_conflict=on_conflict)
+
+
+INSERTS = {"fast_insert": _fast_insert, "copy_insert": _copy_insert}
+
+
+def _peak_memory(conn, table, insert, start, count):
+    generator_class, columns, on_conflict = GENERATORS[table]
+    generator = generator_class(streams=RandomStreams(1))
+
+    with conn.cursor() as cur:
+        tracemalloc.start()
+        try:
+            batches = generator.iter_column_batches(count, BATCH_SIZE, start=start)
+            inserted = insert(cur, table, columns, iter_rows(batches, columns), on_conflict)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    conn.commit()
+    assert inserted == count
+    return peak
+
+
+@pytest.mark.parametrize("insert", INSERTS)
+@pytest.mark.parametrize("table", GENERATORS)
+def test_peak_memory_does_not_grow_with_volume(pg_conn, table, insert):
+    # Faixas de índices disjuntas: nenhuma linha é recusada pelo ON CONFLICT
+    small = _peak_memory(pg_conn, table, INSERTS[insert], 0, SMALL_COUNT)
+    large = _peak_memory(pg_conn, table, INSERTS[insert], SMALL_COUNT, LARGE_COUNT)
+
+    assert large <= small * MAX_GROWTH, (
+        f"Pico de memória cresceu com o volume: {small} -> {large} bytes"
+    )
+
+    with pg_conn.cursor() as cur:
+        cur.execute(f"SELECT count(*) FROM {table}")
+        assert cur.fetchone()[0] == SMALL_COUNT + LARGE_COUNT